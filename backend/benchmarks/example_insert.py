@@ -0,0 +1,147 @@
+"""
+Benchmark example ingestion: per row probe + insert vs bulk insert.
+
+Runs against a local SQLite file. `--latency-ms` adds a simulated network
+round-trip per statement to approximate a remote libsql database. The
+simulation counts an executemany as a single round-trip, which has not been
+measured against a remote libsql server, so treat the speedup as an upper
+bound.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import sqlalchemy
+from sqlalchemy import bindparam, create_engine, text
+
+from customer_engine_api.core import db
+
+_CREATE_TABLE = text(
+    """
+    CREATE TABLE automatic_response_examples (
+        org_code VARCHAR NOT NULL,
+        example_id CHAR(32) PRIMARY KEY,
+        automatic_response_id CHAR(32),
+        example VARCHAR NOT NULL
+    )
+    """
+)
+_SELECT = text(
+    """
+    SELECT example_id FROM automatic_response_examples
+    WHERE org_code = :org_code AND example_id = :example_id
+    """
+).bindparams(
+    bindparam(key="org_code", type_=sqlalchemy.String()),
+    bindparam(key="example_id", type_=sqlalchemy.UUID()),
+)
+_INSERT = text(
+    """
+    INSERT INTO automatic_response_examples (
+        org_code, automatic_response_id, example_id, example
+    ) VALUES (:org_code, :automatic_response_id, :example_id, :example)
+    """
+).bindparams(
+    bindparam(key="org_code", type_=sqlalchemy.String()),
+    bindparam(key="automatic_response_id", type_=sqlalchemy.UUID()),
+    bindparam(key="example_id", type_=sqlalchemy.UUID()),
+    bindparam(key="example", type_=sqlalchemy.String()),
+)
+
+
+async def _round_trip(
+    conn: db.AsyncConnection,
+    latency: float,
+    statement: sqlalchemy.TextClause,
+    parameters: list[dict[str, object]] | dict[str, object],
+) -> None:
+    await conn.execute(statement, parameters)
+    await asyncio.sleep(latency)
+
+
+async def probe_and_insert(
+    conn: db.AsyncConnection, examples: list[str], latency: float
+) -> None:
+    """Run one SELECT and one INSERT per example, the previous strategy."""
+    automatic_response_id = uuid4()
+    for example in examples:
+        example_id = uuid4()
+        await _round_trip(
+            conn, latency, _SELECT, {"org_code": "bench", "example_id": example_id}
+        )
+        await _round_trip(
+            conn,
+            latency,
+            _INSERT,
+            {
+                "org_code": "bench",
+                "automatic_response_id": automatic_response_id,
+                "example_id": example_id,
+                "example": example,
+            },
+        )
+
+
+async def bulk_insert(
+    conn: db.AsyncConnection, examples: list[str], latency: float
+) -> None:
+    """Insert all examples with one executemany."""
+    automatic_response_id = uuid4()
+    example_ids: list[UUID] = [uuid4() for _ in examples]
+    await _round_trip(
+        conn,
+        latency,
+        _INSERT,
+        [
+            {
+                "org_code": "bench",
+                "automatic_response_id": automatic_response_id,
+                "example_id": example_id,
+                "example": example,
+            }
+            for example_id, example in zip(example_ids, examples, strict=True)
+        ],
+    )
+
+
+async def _run(sizes: list[int], latency: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = db.AsyncEngine(
+            sync_engine=create_engine(f"sqlite:///{Path(tmp_dir) / 'bench.db'}"),
+            max_workers=4,
+        )
+        async with engine.begin() as conn:
+            await conn.execute(_CREATE_TABLE)
+
+        print(f"{'examples':>10} {'probe+insert':>14} {'bulk':>10} {'speedup':>8}")  # noqa: T201
+        for size in sizes:
+            examples = [f"example {i}" for i in range(size)]
+            timings: list[float] = []
+            for strategy in (probe_and_insert, bulk_insert):
+                async with engine.begin() as conn:
+                    start = time.perf_counter()
+                    await strategy(conn, examples, latency)
+                    timings.append(time.perf_counter() - start)
+            print(  # noqa: T201
+                f"{size:>10} {timings[0]:>13.3f}s {timings[1]:>9.3f}s "
+                f"{timings[0] / timings[1]:>7.1f}x"
+            )
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(_run(sizes=args.sizes, latency=args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Benchmark the prompt matching hot path end to end with local stand-ins.
+
+Drives `get_auto_res_owns_example` and `react_to_webhook_event` against a
+local SQLite file, an in-memory Qdrant (or the local vector index), a
+deterministic fake Cohere embedder and a mocked Graph API. Reports latency
+percentiles and throughput per tenant size and concurrency. `--output` saves
+the results and `--baseline` compares them with a previous run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import numpy as np
+import orjson
+from cryptography.fernet import Fernet
+
+# Resources read the environment on import, none of these are contacted.
+for _name, _value in {
+    "LOG_LEVEL": "WARNING",
+    "ENVIRONMENT": "staging",
+    "DB_URL": "libsql://localhost",
+    "DB_AUTH_TOKEN": "bench",
+    "QDRANT_URL": "http://localhost",
+    "QDRANT_API_KEY": "bench",
+    "COHERE_API_KEY": "bench",
+    "ENCRYPT_KEY": Fernet.generate_key().decode(),
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import lego_workflows  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from lego_workflows.components import DomainError  # noqa: E402
+from qdrant_client import AsyncQdrantClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from customer_engine_api import handlers  # noqa: E402
+from customer_engine_api.core import db, whatsapp  # noqa: E402
+from customer_engine_api.core.api_clients.whatsapp import AsyncWhatsappClient  # noqa: E402
+from customer_engine_api.core.automatic_responses import (  # noqa: E402
+    imports,
+    vector_index,
+)
+from customer_engine_api.core.config import resources  # noqa: E402
+from customer_engine_api.core.time import now  # noqa: E402
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+    import cohere
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+_DIMENSIONS = 384
+_EXAMPLES_PER_RESPONSE = 10
+_SEED_BATCH_SIZE = 1_000
+_PHONE_NUMBER_ID = "bench-phone-number"
+
+
+class FakeCohere:
+    """Embed text into a vector seeded by its hash, equal text equal vector."""
+
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+        self.calls = 0
+
+    async def embed(
+        self, model: str, input_type: str, texts: list[str]
+    ) -> SimpleNamespace:
+        _ = model, input_type
+        self.calls += 1
+        await asyncio.sleep(self._latency)
+        return SimpleNamespace(embeddings=[_vector(text) for text in texts])
+
+
+def _vector(text: str) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    return (
+        np.random.default_rng(seed)
+        .standard_normal(_DIMENSIONS, dtype=np.float32)
+        .tolist()
+    )
+
+
+def _graph_api(request: httpx.Request) -> httpx.Response:
+    _ = request
+    return httpx.Response(200, json={"messages": [{"id": "wamid.bench"}]})
+
+
+def _webhook_payload(text: str, wa_id: str) -> dict[str, Any]:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "bench",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "metadata": {
+                                "display_phone_number": "15550000000",
+                                "phone_number_id": _PHONE_NUMBER_ID,
+                            },
+                            "contacts": [
+                                {"profile": {"name": "bench"}, "wa_id": wa_id}
+                            ],
+                            "messages": [
+                                {
+                                    "from": wa_id,
+                                    "id": "wamid.bench",
+                                    "timestamp": "1700000000",
+                                    "type": "text",
+                                    "text": {"body": text},
+                                }
+                            ],
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+
+
+@dataclass(frozen=True)
+class Clients:
+    """Stand-in clients passed to commands."""
+
+    qdrant: AsyncQdrantClient
+    cohere: cohere.AsyncClient
+    whatsapp: AsyncWhatsappClient
+
+
+@dataclass(frozen=True)
+class Result:
+    """Latency and throughput of one scenario."""
+
+    scenario: str
+    examples: int
+    concurrency: int
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput: float
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        """Scenario identity used to compare runs."""
+        return (self.scenario, self.examples, self.concurrency)
+
+
+def _migrate(db_path: Path) -> None:
+    config = Config(str(_BACKEND_DIR / "alembic.ini"))
+    config.set_main_option(
+        "script_location", str(_BACKEND_DIR / "src/customer_engine_api/migrations")
+    )
+    resources.db_engine = db.AsyncEngine(
+        sync_engine=create_engine(f"sqlite:///{db_path}"), max_workers=16
+    )
+    command.upgrade(config, "head")
+
+
+async def _seed(org_code: str, examples: int, clients: Clients) -> list[str]:
+    texts = [
+        f"consulta {i} sobre el pedido {i % 97} y la factura {i % 89}"
+        for i in range(examples)
+    ]
+    rows = [
+        imports.ImportRow(
+            name=f"respuesta {i // _EXAMPLES_PER_RESPONSE}",
+            response=f"respuesta automatica {i // _EXAMPLES_PER_RESPONSE}",
+            example=text,
+        )
+        for i, text in enumerate(texts)
+    ]
+    for start in range(0, len(rows), _SEED_BATCH_SIZE):
+        async with resources.db_engine.begin() as conn:
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.automatic_responses.import_rows.Command(
+                    org_code=org_code,
+                    rows=rows[start : start + _SEED_BATCH_SIZE],
+                    qdrant_client=clients.qdrant,
+                    cohere_client=clients.cohere,
+                    sql_conn=conn,
+                    embedding_concurrency=4,
+                )
+            )
+
+    async with resources.db_engine.begin() as conn:
+        await lego_workflows.run_and_collect_events(
+            cmd=handlers.whatsapp.register_tokens.Command(
+                org_code=org_code,
+                access_token="bench-access-token",  # noqa: S106
+                user_token="bench-user-token",  # noqa: S106
+                sql_conn=conn,
+            )
+        )
+    return texts
+
+
+def _prompts(
+    examples: list[str], requests: int, match_ratio: float, seed: int
+) -> list[str]:
+    rng = np.random.default_rng(seed)
+    return [
+        examples[int(rng.integers(len(examples)))]
+        if rng.random() < match_ratio
+        else f"mensaje sin respuesta {seed}-{i}"
+        for i in range(requests)
+    ]
+
+
+async def _owns_example(org_code: str, prompt: str, clients: Clients) -> None:
+    async with resources.db_engine.begin() as conn:
+        with contextlib.suppress(DomainError):
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.automatic_responses.get_auto_res_owns_example.Command(
+                    org_code=org_code,
+                    example_id_or_prompt=prompt,
+                    qdrant_client=clients.qdrant,
+                    cohere_client=clients.cohere,
+                    sql_conn=conn,
+                    current_time=now(),
+                )
+            )
+
+
+async def _webhook(org_code: str, prompt: str, clients: Clients) -> None:
+    delivery = whatsapp.payloads.read_delivery(
+        payload=_webhook_payload(text=prompt, wa_id="5491100000000")
+    )
+    async with resources.db_engine.begin() as conn:
+        await lego_workflows.run_and_collect_events(
+            cmd=handlers.whatsapp.react_to_webhook_event.Command(
+                message=delivery.messages[0],
+                org_code=org_code,
+                qdrant_client=clients.qdrant,
+                cohere_client=clients.cohere,
+                whatsapp_client=clients.whatsapp,
+                sql_conn=conn,
+                current_time=now(),
+            )
+        )
+
+
+_SCENARIOS: dict[str, Callable[[str, str, Clients], Awaitable[None]]] = {
+    "owns_example": _owns_example,
+    "webhook": _webhook,
+}
+
+
+async def _measure(  # noqa: PLR0913
+    scenario: str,
+    org_code: str,
+    examples: int,
+    prompts: list[str],
+    concurrency: int,
+    clients: Clients,
+) -> Result:
+    run = _SCENARIOS[scenario]
+    pending: Iterator[str] = iter(prompts)
+    latencies: list[float] = []
+
+    async def _worker() -> None:
+        for prompt in pending:
+            start = time.perf_counter()
+            await run(org_code, prompt, clients)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return Result(
+        scenario=scenario,
+        examples=examples,
+        concurrency=concurrency,
+        requests=len(latencies),
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        throughput=len(latencies) / elapsed,
+    )
+
+
+def _print(result: Result, baseline: dict[tuple[str, int, int], Result]) -> None:
+    line = (
+        f"{result.scenario:>13} {result.examples:>8} {result.concurrency:>5} "
+        f"{result.p50_ms:>9.2f} {result.p95_ms:>9.2f} {result.p99_ms:>9.2f} "
+        f"{result.throughput:>9.1f}"
+    )
+    previous = baseline.get(result.key)
+    if previous is not None:
+        line += (
+            f" {result.p95_ms / previous.p95_ms:>8.2f}x"
+            f" {result.throughput / previous.throughput:>8.2f}x"
+        )
+    print(line)  # noqa: T201
+
+
+async def _run(args: argparse.Namespace) -> list[Result]:
+    baseline: dict[tuple[str, int, int], Result] = {}
+    if args.baseline is not None:
+        raw_baseline = await asyncio.to_thread(Path(args.baseline).read_bytes)
+        for raw in orjson.loads(raw_baseline)["results"]:
+            previous = Result(**raw)
+            baseline[previous.key] = previous
+
+    clients = Clients(
+        qdrant=AsyncQdrantClient(location=":memory:"),
+        cohere=FakeCohere(latency=args.cohere_latency_ms / 1000),  # type: ignore[arg-type]
+        whatsapp=AsyncWhatsappClient(transport=httpx.MockTransport(_graph_api)),
+    )
+
+    print(  # noqa: T201
+        f"{'scenario':>13} {'examples':>8} {'conc':>5} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}"
+        + (f" {'p95 vs':>9} {'req/s vs':>9}" if baseline else "")
+    )
+    results: list[Result] = []
+    for examples in args.sizes:
+        org_code = f"bench_{examples}"
+        seed_start = time.perf_counter()
+        texts = await _seed(org_code=org_code, examples=examples, clients=clients)
+        print(  # noqa: T201
+            f"# seeded {examples} examples in {time.perf_counter() - seed_start:.1f}s"
+        )
+        for scenario, concurrency in itertools.product(
+            args.scenarios, args.concurrency
+        ):
+            result = await _measure(
+                scenario=scenario,
+                org_code=org_code,
+                examples=examples,
+                prompts=_prompts(
+                    examples=texts,
+                    requests=args.requests,
+                    match_ratio=args.match_ratio,
+                    seed=concurrency,
+                ),
+                concurrency=concurrency,
+                clients=clients,
+            )
+            _print(result=result, baseline=baseline)
+            results.append(result)
+
+    await clients.whatsapp.aclose()
+    await resources.db_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(_SCENARIOS), default=list(_SCENARIOS)
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--match-ratio", type=float, default=0.8)
+    parser.add_argument("--cohere-latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--index",
+        choices=["qdrant", "local"],
+        default="qdrant",
+        help="Search Qdrant in memory or the local numpy index.",
+    )
+    parser.add_argument("--output", help="Save results as JSON.")
+    parser.add_argument("--baseline", help="Results of a previous run to compare.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _migrate(db_path=Path(tmp_dir) / "bench.db")
+        if args.index == "local":
+            resources.local_vector_index = vector_index.LocalVectorIndex(
+                directory=str(Path(tmp_dir) / "vectors")
+            )
+        else:
+            resources.local_vector_index = None
+        results = asyncio.run(_run(args))
+
+    if args.output is not None:
+        Path(args.output).write_bytes(
+            orjson.dumps(
+                {"results": [asdict(result) for result in results]},
+                option=orjson.OPT_INDENT_2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
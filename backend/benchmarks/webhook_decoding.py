@@ -0,0 +1,202 @@
+"""
+Benchmark decoding Whatsapp webhook request bodies.
+
+Compares, per captured payload shape, the original route (`json.loads` of the
+body, then indexing the first message inside a try/except), the stdlib parser
+followed by `read_delivery`, and `decode_delivery` on the raw bytes. Reports
+nanoseconds per body. `--output` saves the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from customer_engine_api.core import whatsapp
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _value(
+    messages: list[dict[str, Any]] | None = None,
+    statuses: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    value: dict[str, Any] = {
+        "messaging_product": "whatsapp",
+        "metadata": {
+            "display_phone_number": "15550000000",
+            "phone_number_id": "106540352242922",
+        },
+    }
+    if messages is not None:
+        value["contacts"] = [{"profile": {"name": "Ana"}, "wa_id": "5491100000000"}]
+        value["messages"] = messages
+    if statuses is not None:
+        value["statuses"] = statuses
+    return value
+
+
+def _body(*values: dict[str, Any]) -> bytes:
+    return orjson.dumps(
+        {
+            "object": "whatsapp_business_account",
+            "entry": [
+                {
+                    "id": "102290129340398",
+                    "changes": [
+                        {"field": "messages", "value": value} for value in values
+                    ],
+                }
+            ],
+        }
+    )
+
+
+def _message(message_type: str, content: dict[str, Any], n: int = 0) -> dict[str, Any]:
+    return {
+        "from": "5491100000000",
+        "id": f"wamid.HBgNNTQ5MTEwMDAwMDAwMBUCABIYFDNBMEJGQ0M{n:04d}",
+        "timestamp": "1700000000",
+        "type": message_type,
+        message_type: content,
+    }
+
+
+def _status(status: str, n: int = 0) -> dict[str, Any]:
+    return {
+        "id": f"wamid.HBgNNTQ5MTEwMDAwMDAwMBUCABEYEjI0QjE{n:04d}",
+        "status": status,
+        "timestamp": "1700000001",
+        "recipient_id": "5491100000000",
+        "conversation": {
+            "id": "b5a5b5c0c0c0c0c0c0c0c0c0c0c0c0c0",
+            "origin": {"type": "service"},
+        },
+        "pricing": {"billable": True, "pricing_model": "CBP", "category": "service"},
+    }
+
+
+_PAYLOADS: dict[str, bytes] = {
+    "text": _body(
+        _value(messages=[_message("text", {"body": "¿Cuál es el horario?"})])
+    ),
+    "batched_text": _body(
+        _value(
+            messages=[
+                _message("text", {"body": f"mensaje número {n}"}, n=n)
+                for n in range(10)
+            ]
+        )
+    ),
+    "statuses": _body(
+        _value(statuses=[_status(s, n=n) for n, s in enumerate(("sent", "read"))])
+    ),
+    "media": _body(
+        _value(
+            messages=[
+                _message(
+                    "image",
+                    {
+                        "id": "1479537139650973",
+                        "mime_type": "image/jpeg",
+                        "sha256": "HgNNTQ5MTEwMDAwMDAwMBUCABIYFDNBMEJGQ0M=",
+                        "caption": "mi factura",
+                    },
+                )
+            ]
+        )
+    ),
+    "interactive": _body(
+        _value(
+            messages=[
+                _message(
+                    "interactive",
+                    {
+                        "type": "list_reply",
+                        "list_reply": {
+                            "id": "horarios",
+                            "title": "Horarios",
+                            "description": "Horarios de atención",
+                        },
+                    },
+                )
+            ]
+        )
+    ),
+}
+
+
+def _legacy(body: bytes) -> whatsapp.payloads.TextMessage | None:
+    payload = json.loads(body)
+    try:
+        value = payload["entry"][0]["changes"][0].pop("value")
+        value.pop("messaging_product")
+        metadata = value.pop("metadata")
+        return whatsapp.payloads.TextMessage(
+            text=value["messages"][0]["text"]["body"],
+            wa_id=value["contacts"][0]["wa_id"],
+            phone_number_id=metadata["phone_number_id"],
+        )
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _stdlib(body: bytes) -> whatsapp.payloads.Delivery:
+    return whatsapp.payloads.read_delivery(payload=json.loads(body))
+
+
+def _orjson(body: bytes) -> whatsapp.payloads.Delivery | None:
+    return whatsapp.payloads.decode_delivery(body=body)
+
+
+_DECODERS: dict[str, Callable[[bytes], object]] = {
+    "legacy": _legacy,
+    "stdlib": _stdlib,
+    "orjson": _orjson,
+}
+
+
+def _ns_per_op(decoder: Callable[[bytes], object], body: bytes, runs: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for _ in range(runs):
+            decoder(body)
+        best = min(best, (time.perf_counter_ns() - start) / runs)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--payloads", nargs="+", choices=list(_PAYLOADS), default=list(_PAYLOADS)
+    )
+    parser.add_argument("--runs", type=int, default=20000)
+    parser.add_argument("--output", help="Save results as JSON.")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'payload':<14}{'bytes':>7}" + "".join(f"{d:>10}" for d in _DECODERS))  # noqa: T201
+    for name in args.payloads:
+        body = _PAYLOADS[name]
+        results[name] = {
+            decoder_name: _ns_per_op(decoder=decoder, body=body, runs=args.runs)
+            for decoder_name, decoder in _DECODERS.items()
+        }
+        print(  # noqa: T201
+            f"{name:<14}{len(body):>7}"
+            + "".join(f"{ns:>8.0f}ns" for ns in results[name].values())
+        )
+
+    if args.output is not None:
+        Path(args.output).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main()
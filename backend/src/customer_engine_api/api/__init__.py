@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import contextlib
+import time
+from typing import TYPE_CHECKING
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware import Middleware
 from fastapi.responses import ORJSONResponse
@@ -9,9 +13,50 @@ from lego_workflows.components import DomainError
 from starlette.middleware.cors import CORSMiddleware
 
 from customer_engine_api import handlers
-from customer_engine_api.api import health, ui, webhooks
+from customer_engine_api.api import health, metrics, ui, webhooks
+from customer_engine_api.core import metrics as core_metrics, tracing
+from customer_engine_api.core.config import resources
+from customer_engine_api.core.logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from fastapi import Response
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background workers and release shared resources on shutdown."""
+    _ = app
+    if resources.span_exporter is not None:
+        tracing.instrument_commands()
+        tracing.tracer.start(
+            exporter=resources.span_exporter, service_name=resources.service_name
+        )
+    resources.event_bus.start()
+    if resources.jwks is not None:
+        resources.jwks.start()
+    try:
+        await resources.collections.load(
+            index=resources.get_vector_index(qdrant_client=resources.clients.qdrant)
+        )
+    except Exception:
+        logger.exception("Unable to load known vector collections")
+    if resources.webhooks.mode == "queue":
+        webhooks.whatsapp_workers.start()
+    yield
+    await webhooks.whatsapp_workers.stop(timeout=10)
+    await resources.event_bus.stop(timeout=10)
+    if resources.jwks is not None:
+        await resources.jwks.stop()
+    await resources.clients.whatsapp.aclose()
+    await resources.db_engine.dispose()
+    await tracing.tracer.stop()
+    await logger.complete()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     middleware=[
         Middleware(
             CORSMiddleware,
@@ -23,10 +68,36 @@ app = FastAPI(
             allow_methods=["*"],
             allow_headers=["*"],
         )
-    ]
+    ],
 )
 
 
+@app.middleware("http")
+async def observe_requests(
+    req: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Track requests in flight, their latency per route and a server span."""
+    start = time.perf_counter()
+    with (
+        core_metrics.http_requests_in_flight.labels().track_in_progress(),
+        tracing.span(name=req.method, kind="server") as span,
+    ):
+        try:
+            response = await call_next(req)
+        finally:
+            route = req.scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            core_metrics.http_request_seconds.labels(
+                method=req.method, route=route_path
+            ).observe(time.perf_counter() - start)
+            if span is not None:
+                span.name = f"{req.method} {route_path}"
+                span.attributes["http.route"] = route_path
+        if span is not None:
+            span.attributes["http.status_code"] = response.status_code
+        return response
+
+
 @app.exception_handler(DomainError)
 def handle_domain_error(req: Request, exc: DomainError) -> ORJSONResponse:
     """Handle domain error."""
@@ -40,5 +111,6 @@ def handle_domain_error(req: Request, exc: DomainError) -> ORJSONResponse:
 
 
 app.include_router(router=health.router)
+app.include_router(router=metrics.router)
 app.include_router(router=ui.router)
 app.include_router(router=webhooks.router)
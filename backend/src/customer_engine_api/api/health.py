@@ -8,7 +8,10 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from customer_engine_api.api import webhooks
+from customer_engine_api.core.cache import CacheStats
 from customer_engine_api.core.config import resources
+from customer_engine_api.core.jobs import JobMetrics
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -22,6 +25,33 @@ class HealthCheckResponse(BaseModel):
 @router.get(path="/check")
 async def check() -> HealthCheckResponse:
     """Check application is ready."""
-    with resources.db_engine.begin() as conn:
-        conn.execute(text("SELECT 1")).fetchone()
+    async with resources.db_engine.begin() as conn:
+        (await conn.execute(text("SELECT 1"))).fetchone()
     return HealthCheckResponse(status="healthy")
+
+
+class WebhooksQueueResponse(BaseModel):
+    """Webhooks queue response."""
+
+    whatsapp: JobMetrics
+
+
+@router.get(path="/webhooks-queue")
+async def webhooks_queue() -> WebhooksQueueResponse:
+    """Check webhooks queue backpressure."""
+    return WebhooksQueueResponse(whatsapp=webhooks.whatsapp_workers.metrics)
+
+
+class VectorCollectionsResponse(BaseModel):
+    """Vector collections response."""
+
+    known: int
+    lookups: CacheStats
+
+
+@router.get(path="/vector-collections")
+async def vector_collections() -> VectorCollectionsResponse:
+    """Check known vector collections registry."""
+    return VectorCollectionsResponse(
+        known=len(resources.collections), lookups=resources.collections.stats
+    )
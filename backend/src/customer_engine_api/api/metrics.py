@@ -0,0 +1,108 @@
+"""Metrics router."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from customer_engine_api.api import webhooks
+from customer_engine_api.core import metrics
+from customer_engine_api.core.config import resources
+
+router = APIRouter(tags=["metrics"])
+
+
+def _cache_lookups() -> dict[tuple[str, ...], float]:
+    lookups: dict[tuple[str, ...], float] = {}
+    for cache, stats in (
+        ("org_settings", resources.caches.org_settings.stats),
+        ("whatsapp_tokens", resources.caches.whatsapp_tokens.stats),
+        ("auth_tokens", resources.caches.tokens.stats),
+        ("embeddings", resources.embedding_cache.stats),
+        ("vector_collections", resources.collections.stats),
+        ("exact_match", resources.exact_match.stats),
+        ("keyword_rules", resources.keyword_rules.stats),
+        ("lexical_index", resources.lexical_index.stats),
+    ):
+        lookups[(cache, "hit")] = stats.hits
+        lookups[(cache, "miss")] = stats.misses
+    return lookups
+
+
+def _webhook_jobs_total() -> dict[tuple[str, ...], float]:
+    job_metrics = webhooks.whatsapp_workers.metrics
+    return {
+        ("enqueued",): job_metrics.enqueued,
+        ("rejected",): job_metrics.rejected,
+        ("processed",): job_metrics.processed,
+        ("failed",): job_metrics.failed,
+    }
+
+
+def _webhook_jobs() -> dict[tuple[str, ...], float]:
+    job_metrics = webhooks.whatsapp_workers.metrics
+    return {
+        ("queued",): job_metrics.queued,
+        ("waiting_for_org_slot",): job_metrics.waiting_for_org_slot,
+        ("in_flight",): job_metrics.in_flight,
+    }
+
+
+def _events_total() -> dict[tuple[str, ...], float]:
+    bus_metrics = resources.event_bus.metrics
+    return {
+        ("published",): bus_metrics.published,
+        ("dropped",): bus_metrics.dropped,
+    }
+
+
+def _events_queued() -> dict[tuple[str, ...], float]:
+    return {(): resources.event_bus.metrics.queued}
+
+
+for _metric in (
+    metrics.CallbackMetric(
+        name="customer_engine_cache_lookups_total",
+        documentation="Cache lookups, by whether they were served from cache.",
+        type_="counter",
+        callback=_cache_lookups,
+        label_names=("cache", "result"),
+    ),
+    metrics.CallbackMetric(
+        name="customer_engine_webhook_jobs_total",
+        documentation="Webhook jobs, by outcome.",
+        type_="counter",
+        callback=_webhook_jobs_total,
+        label_names=("outcome",),
+    ),
+    metrics.CallbackMetric(
+        name="customer_engine_domain_events_total",
+        documentation="Domain events handed to the event bus, by outcome.",
+        type_="counter",
+        callback=_events_total,
+        label_names=("outcome",),
+    ),
+    metrics.CallbackMetric(
+        name="customer_engine_domain_events_queued",
+        documentation="Domain events waiting to be published.",
+        type_="gauge",
+        callback=_events_queued,
+    ),
+    metrics.CallbackMetric(
+        name="customer_engine_webhook_jobs",
+        documentation="Webhook jobs currently in each state.",
+        type_="gauge",
+        callback=_webhook_jobs,
+        label_names=("state",),
+    ),
+):
+    metrics.registry.register(_metric)
+
+
+@router.get(path="/metrics", response_class=PlainTextResponse)
+async def expose() -> PlainTextResponse:
+    """Expose metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        content=metrics.registry.expose(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Literal
+import functools
+import io
+from typing import Annotated, Literal
 from uuid import UUID
 
 import lego_workflows
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse
+from lego_workflows.components import DomainError
 from pydantic import BaseModel
 
 from customer_engine_api import handlers
 from customer_engine_api.api.ui.deps import BearerToken  # noqa: TCH001
 from customer_engine_api.api.ui.utils import process_token
 from customer_engine_api.core import time
-from customer_engine_api.core.automatic_responses import AutomaticResponse, Example
+from customer_engine_api.core.automatic_responses import (
+    AutomaticResponse,
+    Example,
+    imports,
+)
 from customer_engine_api.core.config import resources
+from customer_engine_api.core.typing import ImportFormats  # noqa: TCH001
 
 router = APIRouter(prefix="/automatic-responses", tags=["automatic-responses"])
 
@@ -36,7 +45,7 @@ async def update_example(
 ) -> ResponseUpdateExample:
     """Update example."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.update_example.Command(
                 org_code=auth_response.org_code,
@@ -49,7 +58,7 @@ async def update_example(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseUpdateExample(example=response.example)
 
 
@@ -63,7 +72,7 @@ async def get_example(
 ) -> ResponseGetExample:
     """Get example."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.get_example.Command(
                 org_code=auth_response.org_code,
@@ -73,7 +82,7 @@ async def get_example(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseGetExample(example=response.example)
 
 
@@ -87,7 +96,7 @@ async def delete_example(
 ) -> ResponseDeleteExample:
     """Delete example."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.delete_example.Command(
                 org_code=auth_response.org_code,
@@ -98,7 +107,7 @@ async def delete_example(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseDeleteExample(status="deleted")
 
 
@@ -116,7 +125,7 @@ async def delete_examples(
 ) -> ResponseDeleteExamples:
     """Bulk delele examples."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, events = await lego_workflows.run_and_collect_events(
             handlers.automatic_responses.delete_bulk_examples.Command(
                 org_code=auth_response.org_code,
@@ -126,32 +135,44 @@ async def delete_examples(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseDeleteExamples(status="deleted")
 
 
 class ResponseListExample(BaseModel):
     examples: list[Example]
+    next_cursor: str | None
 
 
 @router.get(path="/{automatic_response_id}/example")
 async def list_examples(
-    auth_token: BearerToken, automatic_response_id: UUID
+    auth_token: BearerToken,
+    automatic_response_id: UUID,
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: str | None = None,
 ) -> ResponseListExample:
-    """List examples."""
+    """
+    List examples, all of them unless `limit` is given.
+
+    Pass `next_cursor` as `cursor` to get the next page.
+    """
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.list_examples.Command(
                 org_code=auth_response.org_code,
                 automatic_response_id=automatic_response_id,
                 sql_conn=conn,
+                limit=limit,
+                cursor=cursor,
             )
         )
 
-    await lego_workflows.publish_events(events=events)
-    return ResponseListExample(examples=response.examples)
+    resources.event_bus.publish(events=events)
+    return ResponseListExample(
+        examples=response.examples, next_cursor=response.next_cursor
+    )
 
 
 class CreateExamples(BaseModel):
@@ -169,7 +190,7 @@ async def create_example(
     """Create examples."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.create_example.Command(
                 org_code=auth_response.org_code,
@@ -181,14 +202,60 @@ async def create_example(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseCreateExamples(example_ids=response.example_ids)
 
 
+class Keywords(BaseModel):
+    keywords: list[str]
+
+
+@router.put(path="/{automatic_response_id}/keywords")
+async def set_keywords(
+    auth_token: BearerToken, automatic_response_id: UUID, req: Keywords
+) -> Keywords:
+    """Replace keywords, a prompt containing one of them gets this response."""
+    auth_response = await process_token(token=auth_token, current_time=time.now())
+
+    async with resources.db_engine.begin() as conn:
+        response, events = await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.set_keywords.Command(
+                org_code=auth_response.org_code,
+                automatic_response_id=automatic_response_id,
+                keywords=req.keywords,
+                sql_conn=conn,
+            )
+        )
+
+    resources.event_bus.publish(events=events)
+    return Keywords(keywords=response.keywords)
+
+
+@router.get(path="/{automatic_response_id}/keywords")
+async def list_keywords(
+    auth_token: BearerToken, automatic_response_id: UUID
+) -> Keywords:
+    """List keywords."""
+    auth_response = await process_token(token=auth_token, current_time=time.now())
+
+    async with resources.db_engine.begin() as conn:
+        response, events = await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.list_keywords.Command(
+                org_code=auth_response.org_code,
+                automatic_response_id=automatic_response_id,
+                sql_conn=conn,
+            )
+        )
+
+    resources.event_bus.publish(events=events)
+    return Keywords(keywords=response.keywords)
+
+
 class CreateAutomaticResponse(BaseModel):
     name: str
     response: str
     examples: list[str] | None = None
+    keywords: list[str] | None = None
 
 
 class ResponseCreateAutomaticResponse(BaseModel):
@@ -203,7 +270,7 @@ async def create_automatic_response(
     """Create a new automatic response."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         created_response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.create_auto_resp.Command(
                 org_code=auth_response.org_code,
@@ -213,10 +280,11 @@ async def create_automatic_response(
                 examples=req.examples,
                 qdrant_client=resources.clients.qdrant,
                 cohere_client=resources.clients.cohere,
+                keywords=req.keywords,
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseCreateAutomaticResponse(
         automatic_response_id=created_response.automatic_response_id
     )
@@ -234,7 +302,7 @@ async def get_automatic_response(
     """Get automatic response."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         (
             existing_automatic_response,
             events,
@@ -246,7 +314,7 @@ async def get_automatic_response(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
 
     return ResponseGetAutomaticResponse(
         automatic_response=existing_automatic_response.automatic_response
@@ -270,7 +338,7 @@ async def patch_automatic_response(
 ) -> ResponsePatchAutomaticResponse:
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         updated_response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.update_auto_res.Command(
                 org_code=auth_response.org_code,
@@ -281,7 +349,7 @@ async def patch_automatic_response(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponsePatchAutomaticResponse(
         updated_automatic_response=updated_response.updated_automatic_response
     )
@@ -289,15 +357,18 @@ async def patch_automatic_response(
 
 class ResponseListAutomaticResponse(BaseModel):
     automatic_response: list[AutomaticResponse]
+    next_cursor: str | None
 
 
 @router.get("")
 async def list_automatic_responses(
     auth_token: BearerToken,
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: str | None = None,
 ) -> ResponseListAutomaticResponse:
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         (
             listed_automatic_responses,
             events,
@@ -305,12 +376,15 @@ async def list_automatic_responses(
             cmd=handlers.automatic_responses.list_auto_res.Command(
                 org_code=auth_response.org_code,
                 sql_conn=conn,
+                limit=limit,
+                cursor=cursor,
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseListAutomaticResponse(
-        automatic_response=listed_automatic_responses.automatic_responses
+        automatic_response=listed_automatic_responses.automatic_responses,
+        next_cursor=listed_automatic_responses.next_cursor,
     )
 
 
@@ -325,7 +399,7 @@ async def delete_automatic_response(
 ) -> ResponseDeleteAutomaticResponse:
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.delete_auto_res.Command(
                 org_code=auth_response.org_code,
@@ -335,7 +409,7 @@ async def delete_automatic_response(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseDeleteAutomaticResponse(status="deleted")
 
 
@@ -354,7 +428,7 @@ async def search_automatic_response_by_prompt(
     """Search automatic response by prompt."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.get_auto_res_owns_example.Command(
                 org_code=auth_response.org_code,
@@ -366,5 +440,63 @@ async def search_automatic_response_by_prompt(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseSearchByPrompt(automatic_response=response.automatic_response)
+
+
+class ResponseImport(BaseModel):
+    rows_committed: int
+    automatic_responses_created: int
+    examples_created: int
+
+
+@router.post("/import", response_model=ResponseImport)
+async def import_automatic_responses(  # noqa: PLR0913
+    auth_token: BearerToken,
+    file: UploadFile,
+    file_format: ImportFormats | None = None,
+    skip_rows: Annotated[int, Query(ge=0)] = 0,
+    batch_size: Annotated[int, Query(ge=1, le=1000)] = 500,
+    embedding_concurrency: Annotated[int, Query(ge=1, le=16)] = 4,
+) -> ResponseImport | ORJSONResponse:
+    """
+    Import automatic responses and examples from a CSV or JSONL file.
+
+    Each row has `name`, `example` and optionally `response`. Rows are
+    committed in batches, if the import stops the error tells how many rows
+    to skip to resume it.
+    """
+    auth_response = await process_token(token=auth_token, current_time=time.now())
+    if file_format is None:
+        file_format = "jsonl" if (file.filename or "").endswith(".jsonl") else "csv"
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        progress = await imports.run_import(
+            rows=imports.read_rows(stream=stream, file_format=file_format),
+            process_batch=functools.partial(
+                handlers.automatic_responses.import_rows.import_batch,
+                auth_response.org_code,
+                embedding_concurrency=embedding_concurrency,
+            ),
+            batch_size=batch_size,
+            skip_rows=skip_rows,
+        )
+    except imports.ImportInterruptedError as e:
+        return ORJSONResponse(
+            content={
+                "error": str(e.__cause__),
+                "rows_committed": e.progress.rows_committed,
+            },
+            status_code=status.HTTP_400_BAD_REQUEST
+            if isinstance(e.__cause__, DomainError | imports.InvalidImportRowError)
+            else status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    finally:
+        stream.detach()
+
+    return ResponseImport(
+        rows_committed=progress.rows_committed,
+        automatic_responses_created=progress.automatic_responses_created,
+        examples_created=progress.examples_created,
+    )
@@ -26,14 +26,14 @@ class ResponseGetOrgSettings(BaseModel):
 async def get_org_settings(auth_token: BearerToken) -> ResponseGetOrgSettings:
     """Get org settings."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         get_response, get_events = await lego_workflows.run_and_collect_events(
             handlers.org_settings.get_or_default.Command(
                 org_code=auth_response.org_code,
                 sql_conn=conn,
             )
         )
-    await lego_workflows.publish_events(events=get_events)
+    resources.event_bus.publish(events=get_events)
     return ResponseGetOrgSettings(settings=get_response.settings)
 
 
@@ -44,14 +44,14 @@ class ResponseDeleteOrgSettings(BaseModel):
 @router.delete("")
 async def delete_org_settings(auth_token: BearerToken) -> ResponseDeleteOrgSettings:
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, delete_events = await lego_workflows.run_and_collect_events(
             handlers.org_settings.delete.Command(
                 org_code=auth_response.org_code,
                 sql_conn=conn,
             )
         )
-    await lego_workflows.publish_events(events=delete_events)
+    resources.event_bus.publish(events=delete_events)
     return ResponseDeleteOrgSettings(status="deleted")
 
 
@@ -69,7 +69,7 @@ async def upsert_org_settings(
     req: UpsertOrgSettings,
 ) -> ResponseUpsertOrgSettings:
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         upsert_response, upsert_events = await lego_workflows.run_and_collect_events(
             handlers.org_settings.upsert.Command(
                 org_code=auth_response.org_code,
@@ -77,5 +77,5 @@ async def upsert_org_settings(
                 default_response=req.default_response,
             )
         )
-    await lego_workflows.publish_events(events=upsert_events)
+    resources.event_bus.publish(events=upsert_events)
     return ResponseUpsertOrgSettings(settings=upsert_response.settings)
@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Annotated, Literal
 from uuid import UUID
 
 import lego_workflows
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from pydantic import BaseModel
 
 from customer_engine_api import handlers
 from customer_engine_api.api.ui.deps import BearerToken  # noqa: TCH001
 from customer_engine_api.api.ui.utils import process_token
-from customer_engine_api.core.automatic_responses import UnmatchedPrompt
+from customer_engine_api.core.automatic_responses import (
+    UnmatchedPrompt,
+    UnmatchedPromptCluster,
+)
 from customer_engine_api.core.config import resources
 from customer_engine_api.core.time import now
 
@@ -35,7 +38,7 @@ async def create_unmatched_prompt(
     current_time = now()
     auth_response = await process_token(token=auth_token, current_time=current_time)
 
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.unmatched_prompts.register_unmatched_prompt.Command(
                 org_code=auth_response.org_code,
@@ -44,7 +47,7 @@ async def create_unmatched_prompt(
                 sql_conn=conn,
             )
         )
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseCreateUnmatchedPrompt(
         unmatched_prompt_id=response.umatched_prompt_id
     )
@@ -52,22 +55,52 @@ async def create_unmatched_prompt(
 
 class ResponseListUnmatchedPrompts(BaseModel):
     unmatched_prompts: list[UnmatchedPrompt]
+    next_cursor: str | None
 
 
 @router.get(path="")
 async def list_unmatched_prompts(
     auth_token: BearerToken,
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: str | None = None,
 ) -> ResponseListUnmatchedPrompts:
     auth_response = await process_token(token=auth_token, current_time=now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             handlers.unmatched_prompts.list_unmatched_prompts.Command(
-                org_code=auth_response.org_code, sql_conn=conn
+                org_code=auth_response.org_code,
+                sql_conn=conn,
+                limit=limit,
+                cursor=cursor,
+            )
+        )
+
+    resources.event_bus.publish(events=events)
+    return ResponseListUnmatchedPrompts(
+        unmatched_prompts=response.unmatched_prompts, next_cursor=response.next_cursor
+    )
+
+
+class ResponseListUnmatchedPromptClusters(BaseModel):
+    clusters: list[UnmatchedPromptCluster]
+
+
+@router.get(path="/clusters")
+async def list_unmatched_prompt_clusters(
+    auth_token: BearerToken,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+) -> ResponseListUnmatchedPromptClusters:
+    """Near duplicate prompts grouped, the most frequent first."""
+    auth_response = await process_token(token=auth_token, current_time=now())
+    async with resources.db_engine.begin() as conn:
+        response, events = await lego_workflows.run_and_collect_events(
+            handlers.unmatched_prompts.list_clusters.Command(
+                org_code=auth_response.org_code, sql_conn=conn, limit=limit
             )
         )
 
-    await lego_workflows.publish_events(events=events)
-    return ResponseListUnmatchedPrompts(unmatched_prompts=response.unmatched_prompts)
+    resources.event_bus.publish(events=events)
+    return ResponseListUnmatchedPromptClusters(clusters=response.clusters)
 
 
 class AddToAutomaticResponseAsExample(BaseModel):
@@ -85,7 +118,7 @@ async def add_to_automatic_response_as_example(
     auth_token: BearerToken,
 ) -> ResponseAddToAutomaticResponseAsExample:
     auth_response = await process_token(token=auth_token, current_time=now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             handlers.unmatched_prompts.bulk_add_to_auto_res_as_example.Command(
                 org_code=auth_response.org_code,
@@ -97,7 +130,7 @@ async def add_to_automatic_response_as_example(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseAddToAutomaticResponseAsExample(example_ids=response.example_ids)
 
 
@@ -115,7 +148,7 @@ async def delete_unmatched_prompt(
     auth_token: BearerToken,
 ) -> ResponseDeleteUnmatchedPrompts:
     auth_response = await process_token(token=auth_token, current_time=now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, events = await lego_workflows.run_and_collect_events(
             handlers.unmatched_prompts.bulk_delete_unmatched_prompts.Command(
                 org_code=auth_response.org_code,
@@ -124,7 +157,7 @@ async def delete_unmatched_prompt(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseDeleteUnmatchedPrompts(status="deleted")
 
 
@@ -137,7 +170,7 @@ async def delete_all_unmatched_prompt(
     auth_token: BearerToken,
 ) -> ResponseDeleteAllUnmatchedPrompts:
     auth_response = await process_token(token=auth_token, current_time=now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, events = await lego_workflows.run_and_collect_events(
             handlers.unmatched_prompts.delete_all.Command(
                 org_code=auth_response.org_code,
@@ -145,5 +178,5 @@ async def delete_all_unmatched_prompt(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseDeleteAllUnmatchedPrompts(status="deleted")
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 import lego_workflows
 
 from customer_engine_api import handlers
+from customer_engine_api.core.config import resources
 
 if TYPE_CHECKING:
     import datetime
@@ -22,6 +23,6 @@ async def process_token(
         cmd=handlers.auth.validate_token.Command(token=token, current_time=current_time)
     )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
 
     return response
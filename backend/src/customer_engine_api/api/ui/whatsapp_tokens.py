@@ -28,7 +28,7 @@ async def get_whatsapp_tokens(
 ) -> ResponseGetWhatsappTokens:
     """Get whatsapp tokens."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         whatsapp_token, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.whatsapp.get_tokens.Command(
                 org_code=auth_response.org_code,
@@ -36,7 +36,7 @@ async def get_whatsapp_tokens(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseGetWhatsappTokens(token=whatsapp_token.whatsapp_token)
 
 
@@ -56,7 +56,7 @@ async def create_whatsapp_tokens(
 ) -> ResponseCreateWhatsappTokens:
     """Create a whatsapp token."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         (
             response_register_token,
             events,
@@ -69,7 +69,7 @@ async def create_whatsapp_tokens(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseCreateWhatsappTokens(whatsapp_tokens=response_register_token.token)
 
 
@@ -82,7 +82,7 @@ async def delete_whatsapp_tokens(
     auth_token: BearerToken,
 ) -> ResponseDeleteWhatsappTokens:
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         _, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.whatsapp.delete_tokens.Command(
                 org_code=auth_response.org_code,
@@ -90,7 +90,7 @@ async def delete_whatsapp_tokens(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponseDeleteWhatsappTokens(status="deleted")
 
 
@@ -110,7 +110,7 @@ async def patch_whatsapp_tokens(
 ) -> ResponsePatchWhatsappTokens:
     """Patch whatsapp token."""
     auth_response = await process_token(token=auth_token, current_time=time.now())
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response_update_token, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.whatsapp.update_tokens.Command(
                 org_code=auth_response.org_code,
@@ -120,5 +120,5 @@ async def patch_whatsapp_tokens(
             )
         )
 
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     return ResponsePatchWhatsappTokens(token=response_update_token.token)
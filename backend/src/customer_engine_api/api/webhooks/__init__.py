@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, assert_never
 
 import lego_workflows
 from fastapi import APIRouter, Request, Response, status
@@ -11,24 +12,120 @@ from fastapi.exceptions import HTTPException
 from lego_workflows.components import DomainError
 
 from customer_engine_api import handlers
-from customer_engine_api.core import whatsapp
+from customer_engine_api.core import jobs, metrics, whatsapp
 from customer_engine_api.core.config import resources
+from customer_engine_api.core.logging import logger
 from customer_engine_api.core.time import now
 
 if TYPE_CHECKING:
-    from customer_engine_api.core.typing import JsonResponse
+    import datetime
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
+_delivery_kinds = {
+    kind: metrics.webhook_deliveries_total.labels(kind=kind)
+    for kind in ("messages", "unsupported", "statuses", "unknown")
+}
+_reply_results = {
+    result: metrics.webhook_replies_total.labels(result=result)
+    for result in ("replied", "failed")
+}
+
+
+def _count_delivery(delivery: whatsapp.payloads.Delivery) -> None:
+    if len(delivery.messages) > 0:
+        _delivery_kinds["messages"].inc()
+    elif len(delivery.media) > 0 or len(delivery.interactive) > 0:
+        _delivery_kinds["unsupported"].inc()
+    elif delivery.status_only:
+        _delivery_kinds["statuses"].inc()
+    else:
+        _delivery_kinds["unknown"].inc()
+
+
+async def _reply(
+    org_code: str,
+    message: whatsapp.payloads.TextMessage,
+    received_at: datetime.datetime,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    async with semaphore:
+        try:
+            async with resources.db_engine.begin() as conn:
+                with contextlib.suppress(DomainError):
+                    await lego_workflows.run_and_collect_events(
+                        cmd=handlers.whatsapp.react_to_webhook_event.Command(
+                            message=message,
+                            org_code=org_code,
+                            qdrant_client=resources.clients.qdrant,
+                            cohere_client=resources.clients.cohere,
+                            whatsapp_client=resources.clients.whatsapp,
+                            sql_conn=conn,
+                            current_time=received_at,
+                        )
+                    )
+        except Exception:
+            _reply_results["failed"].inc()
+            logger.exception(
+                "Reply to whatsapp message of org {org_code} failed",
+                org_code=org_code,
+            )
+        else:
+            _reply_results["replied"].inc()
+
+
+async def _reply_all(
+    org_code: str,
+    messages: list[whatsapp.payloads.TextMessage],
+    received_at: datetime.datetime,
+) -> None:
+    """
+    Reply to every message of a delivery, each in its own transaction.
+
+    Failures are logged and counted per message instead of raised: the
+    delivery is acknowledged either way, since Meta would redeliver the whole
+    batch and the messages already replied to would be answered twice.
+    """
+    semaphore = asyncio.Semaphore(resources.webhooks.max_messages_in_flight)
+    await asyncio.gather(
+        *(
+            _reply(
+                org_code=org_code,
+                message=message,
+                received_at=received_at,
+                semaphore=semaphore,
+            )
+            for message in messages
+        )
+    )
+
+
+async def _react_to_whatsapp_event(job: jobs.Job) -> None:
+    await _reply_all(
+        org_code=job.org_code,
+        messages=job.messages,
+        received_at=job.received_at,
+    )
+
+
+whatsapp_workers = jobs.WorkerPool(
+    backend=jobs.InMemoryJobBackend(max_size=resources.webhooks.max_queued),
+    handler=_react_to_whatsapp_event,
+    workers=resources.webhooks.workers,
+    max_in_flight_per_org=resources.webhooks.max_in_flight_per_org,
+    max_parked=resources.webhooks.max_queued,
+)
+
+
 @router.get("/whatsapp/{org_code}")
 async def suscribe_whatsapp_webhooks(org_code: str, req: Request) -> Response:
     verify_token = req.query_params["hub.verify_token"]
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response, events = await lego_workflows.run_and_collect_events(
             cmd=handlers.whatsapp.get_tokens.Command(org_code=org_code, sql_conn=conn)
         )
-    await lego_workflows.publish_events(events=events)
+    resources.event_bus.publish(events=events)
     stored_tokens = response.whatsapp_token
     if not whatsapp.hashing.check_same_hashed(
         hashed=stored_tokens.user_token, string=verify_token, algo="sha256"
@@ -40,18 +137,25 @@ async def suscribe_whatsapp_webhooks(org_code: str, req: Request) -> Response:
 
 @router.post("/whatsapp/{org_code}")
 async def whatsapp_webhooks(org_code: str, req: Request) -> Response:
-    payload: JsonResponse = await req.json()
+    received_at = now()
+    delivery = whatsapp.payloads.decode_delivery(body=await req.body())
+    if delivery is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+    _count_delivery(delivery=delivery)
+    if len(delivery.messages) == 0:
+        return Response()
 
-    with resources.db_engine.begin() as conn, contextlib.suppress(DomainError):
-        await lego_workflows.run_and_collect_events(
-            cmd=handlers.whatsapp.react_to_webhook_event.Command(
-                payload=payload,
-                org_code=org_code,
-                qdrant_client=resources.clients.qdrant,
-                cohere_client=resources.clients.cohere,
-                sql_conn=conn,
-                current_time=now(),
-            )
+    if resources.webhooks.mode == "inline":
+        await _reply_all(
+            org_code=org_code, messages=delivery.messages, received_at=received_at
+        )
+    elif resources.webhooks.mode == "queue":
+        job = jobs.Job(
+            org_code=org_code, messages=delivery.messages, received_at=received_at
         )
+        if not await whatsapp_workers.enqueue(job=job):
+            return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    else:
+        assert_never(resources.webhooks.mode)
 
     return Response()
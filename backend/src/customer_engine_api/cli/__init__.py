@@ -2,6 +2,161 @@
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import functools
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, get_args
 
-def main() -> int:
+from customer_engine_api.core.typing import ImportFormats
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import IO
+
+    from customer_engine_api.core.automatic_responses import imports
+
+
+def _print_progress(progress: imports.ImportProgress) -> None:
+    print(  # noqa: T201
+        f"{progress.rows_committed} rows committed, "
+        f"{progress.automatic_responses_created} automatic responses and "
+        f"{progress.examples_created} examples created",
+        file=sys.stderr,
+    )
+
+
+async def _import_examples(
+    args: argparse.Namespace, stream: IO[str], file_format: ImportFormats
+) -> int:
+    # Resources read the environment on import, keep `--help` working without it.
+    from customer_engine_api.core.automatic_responses import imports
+    from customer_engine_api.core.config import resources
+    from customer_engine_api.handlers.automatic_responses import import_rows
+
+    resources.event_bus.start()
+    try:
+        await imports.run_import(
+            rows=imports.read_rows(stream=stream, file_format=file_format),
+            process_batch=functools.partial(
+                import_rows.import_batch,
+                args.org_code,
+                embedding_concurrency=args.embedding_concurrency,
+            ),
+            batch_size=args.batch_size,
+            skip_rows=args.skip_rows,
+            on_progress=_print_progress,
+        )
+    except imports.ImportInterruptedError as e:
+        print(f"{e.__cause__}\n{e}", file=sys.stderr)  # noqa: T201
+        return 1
+    finally:
+        await resources.event_bus.stop(timeout=30)
+        await resources.db_engine.dispose()
+    return 0
+
+
+async def _cluster_unmatched_prompts(args: argparse.Namespace) -> int:
+    import lego_workflows
+
+    from customer_engine_api import handlers
+    from customer_engine_api.core.config import resources
+
+    resources.event_bus.start()
+    try:
+        for org_code in args.org_codes:
+            async with resources.db_engine.begin() as conn:
+                response, events = await lego_workflows.run_and_collect_events(
+                    cmd=handlers.unmatched_prompts.cluster_unmatched_prompts.Command(
+                        org_code=org_code,
+                        cohere_client=resources.clients.cohere,
+                        sql_conn=conn,
+                        similarity_threshold=args.similarity_threshold,
+                    )
+                )
+            resources.event_bus.publish(events=events)
+            print(f"{org_code}: {response.clusters} clusters", file=sys.stderr)  # noqa: T201
+    finally:
+        await resources.event_bus.stop(timeout=30)
+        await resources.db_engine.dispose()
+    return 0
+
+
+async def _backfill_vector_index(args: argparse.Namespace) -> int:
+    import lego_workflows
+
+    from customer_engine_api import handlers
+    from customer_engine_api.core.config import resources
+
+    resources.event_bus.start()
+    try:
+        for org_code in args.org_codes:
+            async with resources.db_engine.begin() as conn:
+                response, events = await lego_workflows.run_and_collect_events(
+                    cmd=handlers.automatic_responses.backfill_vector_index.Command(
+                        org_code=org_code,
+                        qdrant_client=resources.clients.qdrant,
+                        cohere_client=resources.clients.cohere,
+                        sql_conn=conn,
+                        embedding_concurrency=args.embedding_concurrency,
+                    )
+                )
+            resources.event_bus.publish(events=events)
+            print(f"{org_code}: {response.examples} examples", file=sys.stderr)  # noqa: T201
+    finally:
+        await resources.event_bus.stop(timeout=30)
+        await resources.db_engine.dispose()
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="customer-engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_examples = commands.add_parser(
+        "import-examples",
+        help="Import automatic responses and examples from a CSV or JSONL file.",
+    )
+    import_examples.add_argument("org_code")
+    import_examples.add_argument("path")
+    import_examples.add_argument(
+        "--format",
+        choices=get_args(ImportFormats),
+        help="Defaults to jsonl for .jsonl files and csv otherwise.",
+    )
+    import_examples.add_argument("--batch-size", type=int, default=500)
+    import_examples.add_argument("--skip-rows", type=int, default=0)
+    import_examples.add_argument("--embedding-concurrency", type=int, default=4)
+
+    cluster_unmatched_prompts = commands.add_parser(
+        "cluster-unmatched-prompts",
+        help="Group near duplicate unmatched prompts by embedding similarity.",
+    )
+    cluster_unmatched_prompts.add_argument("org_codes", nargs="+")
+    cluster_unmatched_prompts.add_argument(
+        "--similarity-threshold", type=float, default=0.9
+    )
+
+    backfill_vector_index = commands.add_parser(
+        "backfill-vector-index",
+        help="Embed and index every example, e.g. after enabling the local index.",
+    )
+    backfill_vector_index.add_argument("org_codes", nargs="+")
+    backfill_vector_index.add_argument("--embedding-concurrency", type=int, default=4)
+
+    args = parser.parse_args(argv)
+    if args.command == "import-examples":
+        path = Path(args.path)
+        file_format: ImportFormats = args.format or (
+            "jsonl" if path.suffix == ".jsonl" else "csv"
+        )
+        with path.open(encoding="utf-8-sig", newline="") as stream:
+            return asyncio.run(
+                _import_examples(args=args, stream=stream, file_format=file_format)
+            )
+    if args.command == "cluster-unmatched-prompts":
+        return asyncio.run(_cluster_unmatched_prompts(args))
+    if args.command == "backfill-vector-index":
+        return asyncio.run(_backfill_vector_index(args))
     return 0
@@ -6,34 +6,48 @@ from typing import TYPE_CHECKING
 
 import httpx
 
-from customer_engine_api.core import http
+from customer_engine_api.core import http, tracing
 
 if TYPE_CHECKING:
     from customer_engine_api.core.typing import JsonResponse
 
 
 class AsyncWhatsappClient:
-    """Async whatsapp client to interact with API."""
+    """
+    Async whatsapp client to interact with API.
 
-    def __init__(self, bearer_token: str, phone_number_id: str) -> None:
+    One instance is shared by every organization so all messages reuse the
+    same HTTP/2 connection pool, credentials and phone number are per request.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
         """Initialize a new instance."""
         self._client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {bearer_token}"},
-            base_url=f"https://graph.facebook.com/v18.0/{phone_number_id}",
-            transport=httpx.AsyncHTTPTransport(retries=3),
+            base_url="https://graph.facebook.com/v18.0",
+            http2=True,
+            transport=transport or httpx.AsyncHTTPTransport(retries=3, http2=True),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
         )
 
-    async def send_text_msg(self, text: str, to_wa_id: str) -> JsonResponse:
+    async def send_text_msg(
+        self, bearer_token: str, phone_number_id: str, text: str, to_wa_id: str
+    ) -> JsonResponse:
         """Send text msg."""
-        return http.safe_return(
-            await self._client.post(
-                url="/messages",
-                json={
-                    "messaging_product": "whatsapp",
-                    "recipient_type": "individual",
-                    "to": to_wa_id,
-                    "type": "text",
-                    "text": {"preview_url": False, "body": text},
-                },
+        with tracing.span(name="whatsapp.send_text_msg", kind="client"):
+            return http.safe_return(
+                await self._client.post(
+                    url=f"/{phone_number_id}/messages",
+                    headers={"Authorization": f"Bearer {bearer_token}"},
+                    json={
+                        "messaging_product": "whatsapp",
+                        "recipient_type": "individual",
+                        "to": to_wa_id,
+                        "type": "text",
+                        "text": {"preview_url": False, "body": text},
+                    },
+                )
             )
-        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
@@ -10,13 +10,31 @@ from uuid import UUID
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 from sqlalchemy import Row
 
-from customer_engine_api.core.automatic_responses import _embeddings as embeddings
+from customer_engine_api.core.automatic_responses import (
+    _clustering as clustering,
+    _embedding_cache as embedding_cache,
+    _embeddings as embeddings,
+    _exact_match as exact_match,
+    _imports as imports,
+    _keywords as keywords,
+    _lexical as lexical,
+    _vector_index as vector_index,
+)
 from customer_engine_api.core.interfaces import SqlQueriable
 
 if TYPE_CHECKING:
     from sqlalchemy import Row
 
-__all__ = ["embeddings"]
+__all__ = [
+    "clustering",
+    "embedding_cache",
+    "embeddings",
+    "exact_match",
+    "imports",
+    "keywords",
+    "lexical",
+    "vector_index",
+]
 
 
 @dataclass(frozen=True)
@@ -25,12 +43,27 @@ class UnmatchedPrompt(DataClassORJSONMixin, SqlQueriable):
     prompt_id: UUID
     prompt: str
     created_at: datetime.datetime
+    occurrences: int = 1
+    last_seen_at: datetime.datetime | None = None
+    cluster_id: UUID | None = None
 
     @classmethod
     def from_row(cls: type[Self], row: Row[Any]) -> Self:
         return cls.from_dict(row._asdict())
 
 
+@dataclass(frozen=True)
+class UnmatchedPromptCluster(DataClassORJSONMixin):
+    """Near duplicate unmatched prompts, represented by the most frequent one."""
+
+    cluster_id: UUID
+    prompt: str
+    prompts: int
+    occurrences: int
+    last_seen_at: datetime.datetime | None
+    prompt_ids: list[UUID]
+
+
 @dataclass(frozen=True)
 class Example(DataClassORJSONMixin, SqlQueriable):
     org_code: str
@@ -0,0 +1,40 @@
+"""Near duplicate clustering."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+
+def cluster(
+    vectors: list[list[float]], similarity_threshold: float
+) -> npt.NDArray[np.intp]:
+    """
+    Leader clustering by cosine similarity.
+
+    Rows are visited in order, each row not yet assigned leads a cluster with
+    every remaining row at least `similarity_threshold` similar to it. Returns
+    the index of the leader of every row.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    labels = np.arange(len(matrix), dtype=np.intp)
+    if len(matrix) == 0:
+        return labels
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+
+    assigned = np.zeros(len(matrix), dtype=np.bool_)
+    for leader in range(len(matrix)):
+        if assigned[leader]:
+            continue
+        similar = matrix @ matrix[leader] >= similarity_threshold
+        similar &= ~assigned
+        similar[leader] = True
+        labels[similar] = leader
+        assigned |= similar
+    return labels
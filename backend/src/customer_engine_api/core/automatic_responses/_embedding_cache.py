@@ -0,0 +1,260 @@
+"""Embedding cache."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, TypeVar
+
+from customer_engine_api.core import text
+from customer_engine_api.core.automatic_responses._embeddings import (
+    from_blob,
+    to_blob,
+)
+from customer_engine_api.core.cache import CacheStats, TTLCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from customer_engine_api.core.typing import EmbeddingInputTypes, EmbeddingModels
+
+_T = TypeVar("_T")
+
+_MAX_KEYS_PER_QUERY = 500
+_PRUNE_EVERY_ROWS = 1000
+
+
+def _cache_key(model: EmbeddingModels, input_type: EmbeddingInputTypes, t: str) -> str:
+    return f"{model}\x1f{input_type}\x1f{text.normalize(t)}"
+
+
+class EmbeddingCache(ABC):
+    """Embeddings store keyed by model, input type and normalized text."""
+
+    stats: CacheStats
+
+    @abstractmethod
+    async def get_many(
+        self, model: EmbeddingModels, input_type: EmbeddingInputTypes, texts: list[str]
+    ) -> list[list[float] | None]:
+        """Get cached embeddings, `None` for every miss."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_many(
+        self,
+        model: EmbeddingModels,
+        input_type: EmbeddingInputTypes,
+        texts: list[str],
+        embeddings: list[list[float]],
+    ) -> None:
+        """Store embeddings."""
+        raise NotImplementedError
+
+
+class MemoryEmbeddingCache(EmbeddingCache):
+    """In-process LRU tier with size and TTL limits."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._cache: TTLCache[str, list[float]] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self.stats = self._cache.stats
+
+    async def get_many(
+        self, model: EmbeddingModels, input_type: EmbeddingInputTypes, texts: list[str]
+    ) -> list[list[float] | None]:
+        return [self._cache.get(_cache_key(model, input_type, t)) for t in texts]
+
+    async def set_many(
+        self,
+        model: EmbeddingModels,
+        input_type: EmbeddingInputTypes,
+        texts: list[str],
+        embeddings: list[list[float]],
+    ) -> None:
+        for t, embedding in zip(texts, embeddings, strict=True):
+            self._cache.set(_cache_key(model, input_type, t), embedding)
+
+
+class SqliteEmbeddingCache(EmbeddingCache):
+    """
+    On-disk tier storing float32 vectors in a local SQLite file.
+
+    Queries run on a dedicated thread so they never block the event loop.
+    Rows older than `ttl` are dropped, and past `max_rows` the oldest rows
+    are dropped too, checked on open and every thousand written rows.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float | None = 30 * 24 * 3600,
+        max_rows: int = 500_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttl = ttl
+        self._max_rows = max_rows
+        self._clock = clock
+        self._rows_since_prune = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding-cache"
+        )
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key BLOB PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_created_at "
+            "ON embeddings (created_at)"
+        )
+        self._prune()
+        self.stats = CacheStats()
+
+    @staticmethod
+    def _digest(
+        model: EmbeddingModels, input_type: EmbeddingInputTypes, t: str
+    ) -> bytes:
+        return hashlib.sha256(_cache_key(model, input_type, t).encode()).digest()
+
+    async def _run(self, fn: Callable[..., _T], *args: object) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args)
+        )
+
+    def _min_created_at(self) -> float:
+        return self._clock() - self._ttl if self._ttl is not None else 0.0
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE created_at < ?", [self._min_created_at()]
+        )
+        (rows,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if rows > self._max_rows:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY created_at LIMIT ?)",
+                [rows - self._max_rows],
+            )
+        self._conn.commit()
+        self._rows_since_prune = 0
+
+    def _get_many(self, digests: list[bytes]) -> dict[bytes, list[float]]:
+        min_created_at = self._min_created_at()
+        found: dict[bytes, list[float]] = {}
+        for start in range(0, len(digests), _MAX_KEYS_PER_QUERY):
+            chunk = digests[start : start + _MAX_KEYS_PER_QUERY]
+            rows = self._conn.execute(
+                "SELECT key, vector FROM embeddings "  # noqa: S608
+                f"WHERE created_at >= ? AND key IN ({','.join('?' * len(chunk))})",
+                [min_created_at, *chunk],
+            ).fetchall()
+            found.update((key, from_blob(vector)) for key, vector in rows)
+        return found
+
+    def _set_many(self, rows: list[tuple[bytes, bytes]]) -> None:
+        created_at = self._clock()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, created_at) "
+            "VALUES (?, ?, ?)",
+            [(key, vector, created_at) for key, vector in rows],
+        )
+        self._conn.commit()
+        self._rows_since_prune += len(rows)
+        if self._rows_since_prune >= _PRUNE_EVERY_ROWS:
+            self._prune()
+
+    async def get_many(
+        self, model: EmbeddingModels, input_type: EmbeddingInputTypes, texts: list[str]
+    ) -> list[list[float] | None]:
+        digests = [self._digest(model, input_type, t) for t in texts]
+        found = await self._run(self._get_many, digests)
+        embeddings = [found.get(digest) for digest in digests]
+        hits = sum(embedding is not None for embedding in embeddings)
+        self.stats.hits += hits
+        self.stats.misses += len(embeddings) - hits
+        return embeddings
+
+    async def set_many(
+        self,
+        model: EmbeddingModels,
+        input_type: EmbeddingInputTypes,
+        texts: list[str],
+        embeddings: list[list[float]],
+    ) -> None:
+        await self._run(
+            self._set_many,
+            [
+                (self._digest(model, input_type, t), to_blob(embedding))
+                for t, embedding in zip(texts, embeddings, strict=True)
+            ],
+        )
+
+    def close(self) -> None:
+        """Wait for pending queries and close underlying database."""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+
+class TieredEmbeddingCache(EmbeddingCache):
+    """Chain of caches, faster tiers first; lower tier hits are promoted."""
+
+    def __init__(self, tiers: list[EmbeddingCache]) -> None:
+        self.tiers = tiers
+        self.stats = CacheStats()
+
+    async def get_many(
+        self, model: EmbeddingModels, input_type: EmbeddingInputTypes, texts: list[str]
+    ) -> list[list[float] | None]:
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        missing = list(range(len(texts)))
+        for depth, tier in enumerate(self.tiers):
+            if len(missing) == 0:
+                break
+
+            tier_embeddings = await tier.get_many(
+                model, input_type, [texts[i] for i in missing]
+            )
+            promote_texts: list[str] = []
+            promote_embeddings: list[list[float]] = []
+            still_missing: list[int] = []
+            for i, embedding in zip(missing, tier_embeddings, strict=True):
+                if embedding is None:
+                    still_missing.append(i)
+                    continue
+                embeddings[i] = embedding
+                promote_texts.append(texts[i])
+                promote_embeddings.append(embedding)
+
+            if len(promote_texts) > 0:
+                for upper_tier in self.tiers[:depth]:
+                    await upper_tier.set_many(
+                        model, input_type, promote_texts, promote_embeddings
+                    )
+            missing = still_missing
+
+        self.stats.hits += len(texts) - len(missing)
+        self.stats.misses += len(missing)
+        return embeddings
+
+    async def set_many(
+        self,
+        model: EmbeddingModels,
+        input_type: EmbeddingInputTypes,
+        texts: list[str],
+        embeddings: list[list[float]],
+    ) -> None:
+        for tier in self.tiers:
+            await tier.set_many(model, input_type, texts, embeddings)
@@ -2,23 +2,34 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, assert_never
+import asyncio
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TypeAlias, assert_never
 
 from cohere.responses.embeddings import EmbeddingsByType
-from qdrant_client.http.models import (
-    Batch,
-    Distance,
-    UpdateStatus,
-    VectorParams,
-)
+from qdrant_client.http.models import Distance, VectorParams
+
+from customer_engine_api.core import metrics, tracing
 
 if TYPE_CHECKING:
     from uuid import UUID
 
     import cohere
-    from qdrant_client import AsyncQdrantClient
 
-    from customer_engine_api.core.typing import EmbeddingModels
+    from customer_engine_api.core.automatic_responses._embedding_cache import (
+        EmbeddingCache,
+    )
+    from customer_engine_api.core.automatic_responses._vector_index import (
+        VectorIndex,
+    )
+    from customer_engine_api.core.typing import EmbeddingInputTypes, EmbeddingModels
+
+_BatchKey: TypeAlias = tuple[int, "EmbeddingModels", "EmbeddingInputTypes"]
+
+_cohere_embed_seconds = metrics.dependency_seconds.labels(
+    dependency="cohere", operation="embed"
+)
 
 
 def qdrant_vector_params_per_model(model: EmbeddingModels) -> VectorParams:
@@ -28,27 +39,38 @@ def qdrant_vector_params_per_model(model: EmbeddingModels) -> VectorParams:
     assert_never(model)
 
 
-async def embed_prompt_or_examples(
+def to_blob(embedding: list[float]) -> bytes:
+    """Pack embedding as float32 bytes."""
+    return array("f", embedding).tobytes()
+
+
+def from_blob(blob: bytes) -> list[float]:
+    """Unpack embedding packed with `to_blob`."""
+    return array("f", blob).tolist()
+
+
+async def _embed_with_cohere(
     client: cohere.AsyncClient,
     model: EmbeddingModels,
-    prompt_or_examples: str | list[str],
+    input_type: EmbeddingInputTypes,
+    texts: list[str],
 ) -> list[list[float]]:
-    """Embed examples and prompt using cohere."""
     provider, model_name = model.split(sep=":", maxsplit=1)
     if provider != "cohere":
         msg = "Model provided is not from cohere."
         raise RuntimeError(msg)
 
-    if isinstance(prompt_or_examples, str):
-        prompt_or_examples = [prompt_or_examples]
-
-    embeddings: list[list[float]] | EmbeddingsByType = (
-        await client.embed(
-            model=model_name,
-            input_type="search_document",
-            texts=prompt_or_examples,
-        )
-    ).embeddings
+    with (
+        tracing.span(
+            name="cohere.embed",
+            kind="client",
+            attributes={"model": model_name, "texts": len(texts)},
+        ),
+        _cohere_embed_seconds.time(),
+    ):
+        embeddings: list[list[float]] | EmbeddingsByType = (
+            await client.embed(model=model_name, input_type=input_type, texts=texts)
+        ).embeddings
 
     if isinstance(embeddings, EmbeddingsByType):
         msg = "Unexpected response type from cohere."
@@ -57,31 +79,167 @@ async def embed_prompt_or_examples(
     return embeddings
 
 
+@dataclass
+class _PendingBatch:
+    client: cohere.AsyncClient
+    timer: asyncio.TimerHandle
+    requests: list[tuple[list[str], asyncio.Future[list[list[float]]]]] = field(
+        default_factory=list
+    )
+    texts: dict[str, None] = field(default_factory=dict)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent embedding requests into fewer cohere calls.
+
+    Requests for the same client, model and input type are collected for up to
+    `max_wait` seconds or until `max_batch_size` distinct texts are pending.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait: float) -> None:
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._pending: dict[_BatchKey, _PendingBatch] = {}
+        self._in_flight: set[asyncio.Task[None]] = set()
+
+    async def embed(
+        self,
+        client: cohere.AsyncClient,
+        model: EmbeddingModels,
+        input_type: EmbeddingInputTypes,
+        texts: list[str],
+    ) -> list[list[float]]:
+        """Embed texts as part of the next batch."""
+        loop = asyncio.get_running_loop()
+        key: _BatchKey = (id(client), model, input_type)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(
+                client=client, timer=loop.call_later(self._max_wait, self._flush, key)
+            )
+            self._pending[key] = batch
+
+        future: asyncio.Future[list[list[float]]] = loop.create_future()
+        batch.requests.append((texts, future))
+        batch.texts.update(dict.fromkeys(texts))
+        if len(batch.texts) >= self._max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: _BatchKey) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+
+        batch.timer.cancel()
+        task = asyncio.create_task(self._send(key=key, batch=batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, key: _BatchKey, batch: _PendingBatch) -> None:
+        _, model, input_type = key
+        texts = list(batch.texts)
+        try:
+            embeddings: list[list[float]] = []
+            for start in range(0, len(texts), self._max_batch_size):
+                embeddings.extend(
+                    await _embed_with_cohere(
+                        client=batch.client,
+                        model=model,
+                        input_type=input_type,
+                        texts=texts[start : start + self._max_batch_size],
+                    )
+                )
+        except Exception as e:  # noqa: BLE001
+            for _, future in batch.requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        embedding_per_text = dict(zip(texts, embeddings, strict=True))
+        for request_texts, future in batch.requests:
+            if not future.done():
+                future.set_result([embedding_per_text[t] for t in request_texts])
+
+
+async def embed_prompt_or_examples(
+    client: cohere.AsyncClient,
+    model: EmbeddingModels,
+    prompt_or_examples: str | list[str],
+    cache: EmbeddingCache | None = None,
+    batcher: EmbeddingBatcher | None = None,
+) -> list[list[float]]:
+    """
+    Embed examples and prompt using cohere.
+
+    When `cache` is given only texts missing from it are sent to cohere, and
+    when `batcher` is given the request is coalesced with concurrent ones.
+    """
+    input_type: EmbeddingInputTypes = "search_document"
+    if isinstance(prompt_or_examples, str):
+        prompt_or_examples = [prompt_or_examples]
+
+    embed = batcher.embed if batcher is not None else _embed_with_cohere
+    if cache is None:
+        return await embed(
+            client=client, model=model, input_type=input_type, texts=prompt_or_examples
+        )
+
+    embeddings = await cache.get_many(model, input_type, prompt_or_examples)
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if len(missing) > 0:
+        missing_texts = [prompt_or_examples[i] for i in missing]
+        new_embeddings = await embed(
+            client=client, model=model, input_type=input_type, texts=missing_texts
+        )
+        await cache.set_many(model, input_type, missing_texts, new_embeddings)
+        for i, embedding in zip(missing, new_embeddings, strict=True):
+            embeddings[i] = embedding
+
+    return [embedding for embedding in embeddings if embedding is not None]
+
+
 async def upsert_examples(  # noqa: PLR0913
     *,
     embedding_model: EmbeddingModels,
-    qdrant_client: AsyncQdrantClient,
+    vector_index: VectorIndex,
     cohere_client: cohere.AsyncClient,
     example_ids: list[UUID],
     examples: list[str],
     org_code: str,
+    cache: EmbeddingCache | None = None,
+    batcher: EmbeddingBatcher | None = None,
+    chunk_size: int = 96,
+    max_concurrency: int = 1,
 ) -> None:
-    """Upsert example embeddings into qdrant database."""
+    """
+    Upsert example embeddings into the vector index, `chunk_size` at a time.
+
+    Up to `max_concurrency` chunks are embedded and upserted at once.
+    """
     if len(example_ids) != len(examples):
         msg = "Len of example ids and len of example must be equal"
         raise ValueError(msg)
 
-    example_embeddings = await embed_prompt_or_examples(
-        client=cohere_client, model=embedding_model, prompt_or_examples=examples
-    )
-    upsert_result = await qdrant_client.upsert(
-        collection_name=org_code,
-        points=Batch(
-            ids=[example_id.hex for example_id in example_ids],
-            vectors=example_embeddings,
-        ),
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def _upsert_chunk(start: int) -> None:
+        async with slots:
+            example_embeddings = await embed_prompt_or_examples(
+                client=cohere_client,
+                model=embedding_model,
+                prompt_or_examples=examples[start : start + chunk_size],
+                cache=cache,
+                batcher=batcher,
+            )
+            await vector_index.upsert(
+                org_code=org_code,
+                ids=example_ids[start : start + chunk_size],
+                vectors=example_embeddings,
+            )
+
+    await asyncio.gather(
+        *(_upsert_chunk(start) for start in range(0, len(examples), chunk_size))
     )
-
-    if upsert_result.status == UpdateStatus.ACKNOWLEDGED:
-        msg = "Upsert should have been complited."
-        raise TypeError(msg)
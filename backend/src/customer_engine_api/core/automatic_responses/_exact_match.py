@@ -0,0 +1,141 @@
+"""
+Exact match index.
+
+Maps the folded text of every example to its automatic response, so a prompt
+typed as one of the examples is answered without embedding it. Organizations
+are loaded from the database on first lookup and reloaded once their entry
+expires; committed writes through the example handlers keep loaded
+organizations in sync in between.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TypeAlias
+from uuid import UUID
+
+from customer_engine_api.core import text
+from customer_engine_api.core.cache import CacheStats, LoadingCache
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+ExampleRow: TypeAlias = tuple[UUID, str, UUID]
+
+
+@dataclass
+class _OrgIndex:
+    fingerprints: dict[UUID, str] = field(default_factory=dict)
+    by_fingerprint: dict[str, dict[UUID, UUID]] = field(default_factory=dict)
+
+    def add(self, example_id: UUID, example: str, automatic_response_id: UUID) -> None:
+        self.remove(example_id=example_id)
+        fingerprint = text.folded_fingerprint(example)
+        self.fingerprints[example_id] = fingerprint
+        self.by_fingerprint.setdefault(fingerprint, {})[example_id] = (
+            automatic_response_id
+        )
+
+    def remove(self, example_id: UUID) -> None:
+        fingerprint = self.fingerprints.pop(example_id, None)
+        if fingerprint is None:
+            return
+        examples = self.by_fingerprint[fingerprint]
+        del examples[example_id]
+        if len(examples) == 0:
+            del self.by_fingerprint[fingerprint]
+
+    def lookup(self, prompt: str) -> UUID | None:
+        examples = self.by_fingerprint.get(text.folded_fingerprint(prompt))
+        if examples is None:
+            return None
+        automatic_response_ids = set(examples.values())
+        if len(automatic_response_ids) > 1:
+            return None
+        return automatic_response_ids.pop()
+
+
+class ExactMatchIndex:
+    """
+    Per organization index from folded example text to automatic response.
+
+    A folded text shared by examples of different automatic responses is
+    ambiguous and never matches, the prompt goes through semantic search.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._orgs: LoadingCache[str, _OrgIndex] = LoadingCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._orgs)
+
+    async def lookup(
+        self,
+        org_code: str,
+        prompt: str,
+        loader: Callable[[], Awaitable[list[ExampleRow]]],
+    ) -> UUID | None:
+        """Automatic response owning an example equal to prompt once folded."""
+
+        async def _load() -> _OrgIndex:
+            org_index = _OrgIndex()
+            for example_id, example, automatic_response_id in await loader():
+                org_index.add(
+                    example_id=example_id,
+                    example=example,
+                    automatic_response_id=automatic_response_id,
+                )
+            return org_index
+
+        org_index = await self._orgs.get(org_code, loader=_load)
+        automatic_response_id = org_index.lookup(prompt=prompt)
+        if automatic_response_id is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return automatic_response_id
+
+    def add(
+        self,
+        org_code: str,
+        example_ids: list[UUID],
+        examples: list[str],
+        automatic_response_id: UUID,
+    ) -> None:
+        """
+        Index new or updated examples of a loaded organization.
+
+        Call it once the examples are committed, see `AsyncConnection.after_commit`.
+        """
+        org_index = self._orgs.peek(org_code)
+        if org_index is None:
+            self._orgs.invalidate(org_code)
+            return
+        for example_id, example in zip(example_ids, examples, strict=True):
+            org_index.add(
+                example_id=example_id,
+                example=example,
+                automatic_response_id=automatic_response_id,
+            )
+
+    def remove(self, org_code: str, example_ids: list[UUID]) -> None:
+        """Drop deleted examples of a loaded organization, once committed."""
+        org_index = self._orgs.peek(org_code)
+        if org_index is None:
+            self._orgs.invalidate(org_code)
+            return
+        for example_id in example_ids:
+            org_index.remove(example_id=example_id)
+
+    def forget(self, org_code: str) -> None:
+        """Drop organization, next lookup loads it again."""
+        self._orgs.invalidate(org_code)
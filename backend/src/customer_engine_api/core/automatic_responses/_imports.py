@@ -0,0 +1,151 @@
+"""Bulk import of automatic responses and examples."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import itertools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, assert_never
+
+import orjson
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+    from typing import IO
+
+    from customer_engine_api.core.typing import ImportFormats
+
+
+class InvalidImportRowError(ValueError):
+    """Raised when a row of the import file can't be read."""
+
+    def __init__(self, line: int, reason: str) -> None:
+        super().__init__(f"Invalid row at line {line}: {reason}")
+        self.line = line
+
+
+class ImportInterruptedError(RuntimeError):
+    """Raised when an import stops, committed rows can be skipped on retry."""
+
+    def __init__(self, progress: ImportProgress) -> None:
+        super().__init__(
+            f"Import stopped after {progress.rows_committed} rows, "
+            f"resume with skip_rows={progress.rows_committed}."
+        )
+        self.progress = progress
+
+
+@dataclass(frozen=True)
+class ImportRow:
+    """
+    Example for the automatic response called `name`.
+
+    `response` is only used when the automatic response has to be created.
+    """
+
+    name: str
+    response: str | None
+    example: str
+
+
+@dataclass
+class ImportProgress:
+    """Counters of committed work, `rows_committed` includes skipped rows."""
+
+    rows_committed: int = 0
+    automatic_responses_created: int = 0
+    examples_created: int = 0
+
+    def add(self, other: ImportProgress) -> None:
+        """Accumulate counters of a committed batch."""
+        self.rows_committed += other.rows_committed
+        self.automatic_responses_created += other.automatic_responses_created
+        self.examples_created += other.examples_created
+
+
+def _to_row(line: int, record: Any) -> ImportRow:  # noqa: ANN401
+    if not isinstance(record, dict):
+        raise InvalidImportRowError(line=line, reason="expected an object")
+
+    values: dict[str, str | None] = {}
+    for key in ("name", "response", "example"):
+        value = record.get(key)
+        if value is not None and not isinstance(value, str):
+            raise InvalidImportRowError(line=line, reason=f"{key} must be a string")
+        values[key] = value.strip() if value is not None else None
+
+    name, response, example = values["name"], values["response"], values["example"]
+    if not name:
+        raise InvalidImportRowError(line=line, reason="name is required")
+    if not example:
+        raise InvalidImportRowError(line=line, reason="example is required")
+    return ImportRow(name=name, response=response or None, example=example)
+
+
+def _read_csv(stream: IO[str]) -> Iterator[ImportRow]:
+    reader = csv.DictReader(stream)
+    missing_columns = {"name", "example"}.difference(reader.fieldnames or [])
+    if len(missing_columns) > 0:
+        raise InvalidImportRowError(
+            line=1, reason=f"missing columns {', '.join(sorted(missing_columns))}"
+        )
+    for record in reader:
+        yield _to_row(line=reader.line_num, record=record)
+
+
+def _read_jsonl(stream: IO[str]) -> Iterator[ImportRow]:
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            raise InvalidImportRowError(line=line_num, reason=str(e)) from e
+        yield _to_row(line=line_num, record=record)
+
+
+def read_rows(stream: IO[str], file_format: ImportFormats) -> Iterator[ImportRow]:
+    """Lazily parse rows from a text stream, one line is read at a time."""
+    if file_format == "csv":
+        return _read_csv(stream)
+    if file_format == "jsonl":
+        return _read_jsonl(stream)
+    assert_never(file_format)
+
+
+def _next_batch(rows: Iterator[ImportRow], size: int) -> list[ImportRow]:
+    return list(itertools.islice(rows, size))
+
+
+def _skip(rows: Iterator[ImportRow], count: int) -> int:
+    return sum(1 for _ in itertools.islice(rows, count))
+
+
+async def run_import(
+    rows: Iterator[ImportRow],
+    process_batch: Callable[[list[ImportRow]], Awaitable[ImportProgress]],
+    batch_size: int,
+    skip_rows: int = 0,
+    on_progress: Callable[[ImportProgress], None] | None = None,
+) -> ImportProgress:
+    """
+    Feed rows to `process_batch` in batches of `batch_size`.
+
+    `process_batch` commits the batch and returns its counters, so only one
+    batch is held in memory. The first `skip_rows` rows are skipped to resume
+    a previous import, on failure an `ImportInterruptedError` tells how many
+    rows to skip next time.
+    """
+    progress = ImportProgress()
+    try:
+        progress.rows_committed = await asyncio.to_thread(_skip, rows, skip_rows)
+
+        while batch := await asyncio.to_thread(_next_batch, rows, batch_size):
+            progress.add(await process_batch(batch))
+            if on_progress is not None:
+                on_progress(progress)
+    except Exception as e:
+        raise ImportInterruptedError(progress=progress) from e
+
+    return progress
@@ -0,0 +1,202 @@
+"""
+Keyword rules.
+
+Automatic responses may list keywords or phrases that answer a prompt
+containing them. The keywords of an organization are compiled into one
+Aho-Corasick automaton, so a prompt is scanned once whatever the number of
+rules. Keywords and prompts are compared after `text.fold`, and a keyword only
+matches whole words.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, TypeAlias, TypeVar
+from uuid import UUID
+
+from customer_engine_api.core import text
+from customer_engine_api.core.cache import CacheStats, LoadingCache
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+_V = TypeVar("_V")
+
+KeywordRow: TypeAlias = tuple[UUID, str]
+
+
+class Automaton(Generic[_V]):
+    """Aho-Corasick automaton finding every pattern occurrence in one pass."""
+
+    def __init__(self, patterns: dict[str, _V]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._outputs: list[list[int]] = [[]]
+        self._patterns = [
+            (pattern, value) for pattern, value in patterns.items() if pattern != ""
+        ]
+        for pattern_index, (pattern, _) in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(pattern_index)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while len(queue) > 0:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback != 0 and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+                queue.append(next_state)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def search(self, haystack: str) -> Iterator[tuple[int, int, _V]]:
+        """Start, end and value of every pattern occurrence in haystack."""
+        state = 0
+        for position, char in enumerate(haystack):
+            while state != 0 and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_index in self._outputs[state]:
+                pattern, value = self._patterns[pattern_index]
+                yield position + 1 - len(pattern), position + 1, value
+
+
+@dataclass
+class _OrgRules:
+    keywords: dict[UUID, frozenset[str]] = field(default_factory=dict)
+    automaton: Automaton[tuple[UUID, ...]] | None = None
+
+    def set(self, automatic_response_id: UUID, keywords: frozenset[str]) -> None:
+        if len(keywords) == 0:
+            self.keywords.pop(automatic_response_id, None)
+        else:
+            self.keywords[automatic_response_id] = keywords
+        self.automaton = None
+
+    def match(self, prompt: str) -> UUID | None:
+        if self.automaton is None:
+            owners: defaultdict[str, list[UUID]] = defaultdict(list)
+            for automatic_response_id, keywords in self.keywords.items():
+                for keyword in keywords:
+                    owners[keyword].append(automatic_response_id)
+            self.automaton = Automaton(
+                {keyword: tuple(ids) for keyword, ids in owners.items()}
+            )
+        if len(self.automaton) == 0:
+            return None
+
+        folded = text.fold(prompt)
+        matched: set[str] = set()
+        scores: defaultdict[UUID, int] = defaultdict(int)
+        for start, end, automatic_response_ids in self.automaton.search(folded):
+            if (start > 0 and folded[start - 1] != " ") or (
+                end < len(folded) and folded[end] != " "
+            ):
+                continue
+            keyword = folded[start:end]
+            if keyword in matched:
+                continue
+            matched.add(keyword)
+            for automatic_response_id in automatic_response_ids:
+                scores[automatic_response_id] += end - start
+
+        if len(scores) == 0:
+            return None
+        best = max(scores.values())
+        winners = [id_ for id_, score in scores.items() if score == best]
+        return winners[0] if len(winners) == 1 else None
+
+
+def normalize_keywords(keywords: list[str]) -> list[str]:
+    """Folded, deduplicated and non-empty keywords in input order."""
+    return list(dict.fromkeys(k for k in map(text.fold, keywords) if k != ""))
+
+
+class KeywordRules:
+    """
+    Per organization keyword automatons.
+
+    The automatic response matching the most keyword characters wins, a tie
+    between automatic responses matches none. Organizations are loaded on
+    first use and reloaded once their entry expires; a committed change of
+    keywords rebuilds the organization automaton on its next match.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._orgs: LoadingCache[str, _OrgRules] = LoadingCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._orgs)
+
+    async def match(
+        self,
+        org_code: str,
+        prompt: str,
+        loader: Callable[[], Awaitable[list[KeywordRow]]],
+    ) -> UUID | None:
+        """Automatic response whose keywords best match prompt."""
+
+        async def _load() -> _OrgRules:
+            keywords: defaultdict[UUID, list[str]] = defaultdict(list)
+            for automatic_response_id, keyword in await loader():
+                keywords[automatic_response_id].append(keyword)
+            org_rules = _OrgRules()
+            for automatic_response_id, owned in keywords.items():
+                org_rules.set(
+                    automatic_response_id=automatic_response_id,
+                    keywords=frozenset(normalize_keywords(owned)),
+                )
+            return org_rules
+
+        org_rules = await self._orgs.get(org_code, loader=_load)
+        automatic_response_id = org_rules.match(prompt=prompt)
+        if automatic_response_id is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return automatic_response_id
+
+    def set(
+        self, org_code: str, automatic_response_id: UUID, keywords: list[str]
+    ) -> None:
+        """
+        Replace the keywords of an automatic response of a loaded organization.
+
+        Call it once the keywords are committed, see `AsyncConnection.after_commit`.
+        """
+        org_rules = self._orgs.peek(org_code)
+        if org_rules is None:
+            self._orgs.invalidate(org_code)
+            return
+        org_rules.set(
+            automatic_response_id=automatic_response_id,
+            keywords=frozenset(normalize_keywords(keywords)),
+        )
+
+    def forget(self, org_code: str) -> None:
+        """Drop organization, next match loads it again."""
+        self._orgs.invalidate(org_code)
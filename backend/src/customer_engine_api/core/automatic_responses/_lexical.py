@@ -0,0 +1,267 @@
+"""
+Lexical search.
+
+BM25 over the folded words of every example, complementing embeddings for
+short prompts and product codes. Postings are kept in `array` buffers, one
+slot and one term frequency per example containing the term, and read as
+numpy views when scoring. Deleted examples leave a dead slot behind until
+they outnumber live ones and the organization index is compacted.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TypeAlias
+from uuid import UUID
+
+import numpy as np
+
+from customer_engine_api.core import text
+from customer_engine_api.core.cache import CacheStats, LoadingCache
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+ExampleRow: TypeAlias = tuple[UUID, str]
+
+_K1 = 1.2
+_B = 0.75
+_MAX_DOCUMENT_FREQUENCY = 0.5
+_MIN_DOCUMENTS_FOR_STOPWORDS = 10
+_MIN_DEAD_TO_COMPACT = 64
+
+
+def tokenize(t: str) -> list[str]:
+    """Folded words of text."""
+    return text.fold(t).split()
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[UUID]], k: int = 60
+) -> dict[UUID, float]:
+    """Fuse rankings, best first, into one score per id."""
+    scores: dict[UUID, float] = {}
+    for ranking in rankings:
+        for rank, id_ in enumerate(ranking, start=1):
+            scores[id_] = scores.get(id_, 0.0) + 1 / (k + rank)
+    return scores
+
+
+@dataclass
+class _Postings:
+    slots: array[int] = field(default_factory=lambda: array("I"))
+    frequencies: array[int] = field(default_factory=lambda: array("H"))
+
+
+@dataclass
+class _OrgIndex:
+    example_ids: list[UUID | None] = field(default_factory=list)
+    slot_by_example_id: dict[UUID, int] = field(default_factory=dict)
+    lengths: array[int] = field(default_factory=lambda: array("I"))
+    terms: list[tuple[str, ...]] = field(default_factory=list)
+    postings: dict[str, _Postings] = field(default_factory=dict)
+    document_frequencies: Counter[str] = field(default_factory=Counter)
+    total_length: int = 0
+    dead: int = 0
+
+    @property
+    def live(self) -> int:
+        return len(self.slot_by_example_id)
+
+    def add(self, example_id: UUID, example: str) -> None:
+        self.remove(example_id=example_id)
+        tokens = tokenize(example)
+        if len(tokens) == 0:
+            return
+
+        slot = len(self.example_ids)
+        frequencies = Counter(tokens)
+        self.example_ids.append(example_id)
+        self.slot_by_example_id[example_id] = slot
+        self.lengths.append(len(tokens))
+        self.terms.append(tuple(frequencies))
+        self.total_length += len(tokens)
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+            postings.slots.append(slot)
+            postings.frequencies.append(min(frequency, 0xFFFF))
+        self.document_frequencies.update(frequencies.keys())
+
+    def remove(self, example_id: UUID) -> None:
+        slot = self.slot_by_example_id.pop(example_id, None)
+        if slot is None:
+            return
+
+        self.example_ids[slot] = None
+        self.total_length -= self.lengths[slot]
+        self.lengths[slot] = 0
+        self.document_frequencies.subtract(self.terms[slot])
+        self.terms[slot] = ()
+        self.dead += 1
+        if self.dead >= _MIN_DEAD_TO_COMPACT and self.dead > self.live:
+            self._compact()
+
+    def _compact(self) -> None:
+        new_slots = array("I", [0]) * len(self.example_ids)
+        example_ids: list[UUID | None] = []
+        lengths: array[int] = array("I")
+        terms: list[tuple[str, ...]] = []
+        for slot, example_id in enumerate(self.example_ids):
+            if example_id is None:
+                continue
+            new_slots[slot] = len(example_ids)
+            example_ids.append(example_id)
+            lengths.append(self.lengths[slot])
+            terms.append(self.terms[slot])
+
+        postings: dict[str, _Postings] = {}
+        for term, old in self.postings.items():
+            new = _Postings()
+            for slot, frequency in zip(old.slots, old.frequencies, strict=True):
+                if self.example_ids[slot] is not None:
+                    new.slots.append(new_slots[slot])
+                    new.frequencies.append(frequency)
+            if len(new.slots) > 0:
+                postings[term] = new
+
+        self.example_ids = example_ids
+        self.slot_by_example_id = {
+            example_id: slot
+            for slot, example_id in enumerate(example_ids)
+            if example_id is not None
+        }
+        self.lengths = lengths
+        self.terms = terms
+        self.postings = postings
+        self.document_frequencies = +self.document_frequencies
+        self.dead = 0
+
+    def search(
+        self, prompt: str, limit: int, min_score: float
+    ) -> list[tuple[UUID, float]]:
+        query = set(tokenize(prompt))
+        if len(query) == 0 or self.live == 0:
+            return []
+
+        documents = self.live
+        max_frequency = (
+            documents * _MAX_DOCUMENT_FREQUENCY
+            if documents >= _MIN_DOCUMENTS_FOR_STOPWORDS
+            else documents
+        )
+        average_length = self.total_length / documents
+        lengths = np.frombuffer(self.lengths, dtype=np.uintc).astype(np.float64)
+        norms = _K1 * (1 - _B + _B * lengths / average_length)
+        scores = np.zeros(len(self.example_ids), dtype=np.float64)
+        query_weight = 0.0
+        for term in query:
+            frequency = self.document_frequencies[term]
+            if frequency > max_frequency:
+                continue
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+            query_weight += idf
+            postings = self.postings.get(term)
+            if postings is None or frequency == 0:
+                continue
+            slots = np.frombuffer(postings.slots, dtype=np.uintc)
+            frequencies = np.frombuffer(postings.frequencies, dtype=np.ushort).astype(
+                np.float64
+            )
+            np.add.at(
+                scores,
+                slots,
+                idf * frequencies * (_K1 + 1) / (frequencies + norms[slots]),
+            )
+
+        if query_weight == 0:
+            return []
+        scores = np.minimum(scores / query_weight, 1.0)
+        scores[lengths == 0] = 0.0
+        candidates = np.flatnonzero((scores > 0) & (scores >= min_score))
+        best = candidates[np.argsort(-scores[candidates], kind="stable")[:limit]]
+        return [
+            (example_id, float(scores[slot]))
+            for slot in best
+            if (example_id := self.example_ids[slot]) is not None
+        ]
+
+
+class LexicalIndex:
+    """
+    Per organization BM25 index of examples.
+
+    Scores are divided by the summed idf of the prompt words, capped at 1, so
+    they tell how much of the prompt an example covers and prompts made of
+    words no example uses score low. Once an organization has a few examples,
+    words in more than half of them are ignored.
+
+    Organizations are loaded on first use and reloaded once their entry
+    expires; committed writes through the example handlers keep loaded
+    organizations in sync in between.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._orgs: LoadingCache[str, _OrgIndex] = LoadingCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._orgs)
+
+    async def search(
+        self,
+        org_code: str,
+        prompt: str,
+        loader: Callable[[], Awaitable[list[ExampleRow]]],
+        limit: int,
+        min_score: float,
+    ) -> list[tuple[UUID, float]]:
+        """Best scoring examples for prompt, best first."""
+
+        async def _load() -> _OrgIndex:
+            org_index = _OrgIndex()
+            for example_id, example in await loader():
+                org_index.add(example_id=example_id, example=example)
+            return org_index
+
+        org_index = await self._orgs.get(org_code, loader=_load)
+        results = org_index.search(prompt=prompt, limit=limit, min_score=min_score)
+        if len(results) == 0:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return results
+
+    def add(self, org_code: str, example_ids: list[UUID], examples: list[str]) -> None:
+        """Index new or updated examples of a loaded organization, once committed."""
+        org_index = self._orgs.peek(org_code)
+        if org_index is None:
+            self._orgs.invalidate(org_code)
+            return
+        for example_id, example in zip(example_ids, examples, strict=True):
+            org_index.add(example_id=example_id, example=example)
+
+    def remove(self, org_code: str, example_ids: list[UUID]) -> None:
+        """Drop deleted examples of a loaded organization, once committed."""
+        org_index = self._orgs.peek(org_code)
+        if org_index is None:
+            self._orgs.invalidate(org_code)
+            return
+        for example_id in example_ids:
+            org_index.remove(example_id=example_id)
+
+    def forget(self, org_code: str) -> None:
+        """Drop organization, next search loads it again."""
+        self._orgs.invalidate(org_code)
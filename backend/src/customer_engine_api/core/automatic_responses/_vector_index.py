@@ -0,0 +1,559 @@
+"""Vector index."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import os
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import numpy as np
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.http.models import Batch, PointIdsList, UpdateStatus
+
+from customer_engine_api.core import tracing
+from customer_engine_api.core.automatic_responses._embeddings import (
+    qdrant_vector_params_per_model,
+)
+from customer_engine_api.core.cache import CacheStats
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+    from typing import IO
+
+    import numpy.typing as npt
+    from qdrant_client import AsyncQdrantClient
+
+    from customer_engine_api.core.typing import EmbeddingModels
+
+
+class CollectionNotFoundError(LookupError):
+    """Raised when organization collection does not exist."""
+
+    def __init__(self, org_code: str) -> None:
+        super().__init__(f"Collection for org {org_code} does not exist.")
+        self.org_code = org_code
+
+
+class DirectoryInUseError(RuntimeError):
+    """Raised when another process already uses the local index directory."""
+
+    def __init__(self, directory: str) -> None:
+        super().__init__(
+            f"Local vector index at {directory} is used by another process, "
+            "it only supports a single process (one worker)."
+        )
+
+
+def lock_directory(directory: str) -> IO[bytes]:
+    """
+    Hold the local index directory for this process until the file is closed.
+
+    Collections live in process memory, a second process over the same files
+    would serve stale vectors and interleave its journal appends.
+    """
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    lock_file = (path / ".lock").open("wb")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError as e:
+        lock_file.close()
+        raise DirectoryInUseError(directory=directory) from e
+    return lock_file
+
+
+@dataclass(frozen=True)
+class ScoredPoint:
+    """Search match."""
+
+    id: UUID
+    score: float
+
+
+class VectorIndex(ABC):
+    """
+    Per organization store of example embeddings.
+
+    Operations on a missing collection raise `CollectionNotFoundError`.
+    """
+
+    @abstractmethod
+    async def list_collections(self) -> list[str]:
+        """Organizations with a collection."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def collection_exists(self, org_code: str) -> bool:
+        """Check if organization has a collection."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_collection(self, org_code: str, model: EmbeddingModels) -> None:
+        """Create organization collection sized for model."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert(
+        self, org_code: str, ids: list[UUID], vectors: list[list[float]]
+    ) -> None:
+        """Insert or replace vectors."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, org_code: str, ids: list[UUID]) -> None:
+        """Delete vectors, unknown ids are ignored."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search(
+        self,
+        org_code: str,
+        vector: list[float],
+        limit: int,
+        score_threshold: float,
+    ) -> list[ScoredPoint]:
+        """Top `limit` points by cosine similarity, best first."""
+        raise NotImplementedError
+
+
+class QdrantVectorIndex(VectorIndex):
+    """Index backed by one qdrant collection per organization."""
+
+    def __init__(self, client: AsyncQdrantClient) -> None:
+        self._client = client
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _raise_not_found(org_code: str) -> Iterator[None]:
+        try:
+            yield
+        except UnexpectedResponse as e:
+            if e.status_code == HTTPStatus.NOT_FOUND:
+                raise CollectionNotFoundError(org_code=org_code) from e
+            raise
+
+    async def list_collections(self) -> list[str]:
+        return [
+            collection.name
+            for collection in (await self._client.get_collections()).collections
+        ]
+
+    async def collection_exists(self, org_code: str) -> bool:
+        return await self._client.collection_exists(collection_name=org_code)
+
+    async def create_collection(self, org_code: str, model: EmbeddingModels) -> None:
+        try:
+            await self._client.create_collection(
+                collection_name=org_code,
+                vectors_config=qdrant_vector_params_per_model(model=model),
+            )
+        except UnexpectedResponse as e:
+            if b"already exists" not in e.content:
+                raise
+
+    async def upsert(
+        self, org_code: str, ids: list[UUID], vectors: list[list[float]]
+    ) -> None:
+        with (
+            tracing.span(
+                name="qdrant.upsert", kind="client", attributes={"points": len(ids)}
+            ),
+            self._raise_not_found(org_code=org_code),
+        ):
+            upsert_result = await self._client.upsert(
+                collection_name=org_code,
+                points=Batch(ids=[point_id.hex for point_id in ids], vectors=vectors),
+            )
+        if upsert_result.status == UpdateStatus.ACKNOWLEDGED:
+            msg = "Upsert should have been complited."
+            raise TypeError(msg)
+
+    async def delete(self, org_code: str, ids: list[UUID]) -> None:
+        if len(ids) == 0:
+            return
+        with self._raise_not_found(org_code=org_code):
+            await self._client.delete(
+                collection_name=org_code,
+                points_selector=PointIdsList(points=[point_id.hex for point_id in ids]),
+            )
+
+    async def search(
+        self,
+        org_code: str,
+        vector: list[float],
+        limit: int,
+        score_threshold: float,
+    ) -> list[ScoredPoint]:
+        with (
+            tracing.span(name="qdrant.search", kind="client"),
+            self._raise_not_found(org_code=org_code),
+        ):
+            qdrant_points = await self._client.search(
+                collection_name=org_code,
+                query_vector=vector,
+                limit=limit,
+                score_threshold=score_threshold,
+            )
+
+        points: list[ScoredPoint] = []
+        for qdrant_point in qdrant_points:
+            if isinstance(qdrant_point.id, int):
+                msg = "Point ID type mismatch"
+                raise TypeError(msg)
+            points.append(
+                ScoredPoint(id=UUID(qdrant_point.id), score=qdrant_point.score)
+            )
+        return points
+
+
+_UPSERT, _DELETE = b"U", b"D"
+_RECORD_HEADER = struct.Struct("<cI")
+_ID_SIZE = 16
+
+
+@dataclass
+class _LocalCollection:
+    """Growable id and row buffers, the first `size` rows are live."""
+
+    ids: npt.NDArray[np.void]
+    matrix: npt.NDArray[np.float32]
+    size: int
+    positions: dict[bytes, int]
+    journal_rows: int = 0
+
+    @classmethod
+    def of(
+        cls, ids: npt.NDArray[np.void], matrix: npt.NDArray[np.float32]
+    ) -> _LocalCollection:
+        return cls(
+            ids=ids,
+            matrix=matrix,
+            size=len(ids),
+            positions={point_id.tobytes(): i for i, point_id in enumerate(ids)},
+        )
+
+    def _grow(self, needed: int) -> None:
+        if needed <= len(self.ids):
+            return
+        capacity = max(needed, 2 * len(self.ids), 64)
+        ids = np.empty(capacity, dtype=self.ids.dtype)
+        ids[: self.size] = self.ids[: self.size]
+        matrix = np.empty((capacity, self.matrix.shape[1]), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        self.ids, self.matrix = ids, matrix
+
+    def upsert(self, ids: npt.NDArray[np.void], rows: npt.NDArray[np.float32]) -> None:
+        self._grow(self.size + len(ids))
+        for point_id, row in zip(ids, rows, strict=True):
+            position = self.positions.setdefault(point_id.tobytes(), self.size)
+            if position == self.size:
+                self.ids[position] = point_id
+                self.size += 1
+            self.matrix[position] = row
+
+    def delete(self, ids: npt.NDArray[np.void]) -> None:
+        for point_id in ids:
+            position = self.positions.pop(point_id.tobytes(), None)
+            if position is None:
+                continue
+            self.size -= 1
+            if position != self.size:
+                self.ids[position] = self.ids[self.size]
+                self.matrix[position] = self.matrix[self.size]
+                self.positions[self.ids[position].tobytes()] = position
+
+
+@dataclass
+class _OrgLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    waiters: int = 0
+
+
+class LocalVectorIndex(VectorIndex):
+    """
+    In-process index holding a float32 matrix per organization.
+
+    Rows are kept L2 normalized in growable buffers, so search is an exact
+    cosine top-k computed with a single matrix-vector product. Each
+    organization is persisted under `directory` as a `.npz` snapshot plus an
+    append-only journal of upserts and deletes, so writes cost the changed
+    rows only. Once the journal outgrows the snapshot (and
+    `compact_min_rows`) it is folded into a new snapshot replaced atomically.
+    Replaying a journal over a snapshot that already contains it is harmless,
+    and a torn record at its end is dropped on load. Files are read and
+    written off the event loop. Only one process may use a directory, see
+    `lock_directory`.
+    """
+
+    def __init__(self, directory: str, compact_min_rows: int = 1024) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._compact_min_rows = compact_min_rows
+        self._collections: dict[str, _LocalCollection] = {}
+        self._locks: dict[str, _OrgLock] = {}
+
+    def _paths(self, org_code: str) -> tuple[Path, Path]:
+        return (
+            self._directory / f"{org_code}.npz",
+            self._directory / f"{org_code}.journal",
+        )
+
+    def _read(self, org_code: str) -> _LocalCollection | None:
+        snapshot_path, journal_path = self._paths(org_code)
+        if not snapshot_path.exists():
+            return None
+
+        with np.load(snapshot_path) as snapshot:
+            collection = _LocalCollection.of(
+                ids=snapshot["ids"], matrix=snapshot["matrix"]
+            )
+        if journal_path.exists():
+            self._replay(collection, journal_path)
+        return collection
+
+    @staticmethod
+    def _replay(collection: _LocalCollection, journal_path: Path) -> None:
+        journal = journal_path.read_bytes()
+        row_size = collection.matrix.shape[1] * np.dtype(np.float32).itemsize
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(journal):
+            op, count = _RECORD_HEADER.unpack_from(journal, offset)
+            ids_offset = offset + _RECORD_HEADER.size
+            rows_offset = ids_offset + count * _ID_SIZE
+            end = rows_offset + (count * row_size if op == _UPSERT else 0)
+            if op not in (_UPSERT, _DELETE) or end > len(journal):
+                break
+
+            ids = np.frombuffer(journal, dtype="V16", count=count, offset=ids_offset)
+            if op == _UPSERT:
+                collection.upsert(
+                    ids,
+                    np.frombuffer(
+                        journal,
+                        dtype=np.float32,
+                        count=count * collection.matrix.shape[1],
+                        offset=rows_offset,
+                    ).reshape(count, -1),
+                )
+            else:
+                collection.delete(ids)
+            collection.journal_rows += count
+            offset = end
+
+        if offset < len(journal):
+            with journal_path.open("r+b") as f:
+                f.truncate(offset)
+
+    def _append(
+        self,
+        org_code: str,
+        op: bytes,
+        ids: npt.NDArray[np.void],
+        rows: npt.NDArray[np.float32] | None = None,
+    ) -> None:
+        record = _RECORD_HEADER.pack(op, len(ids)) + ids.tobytes()
+        if rows is not None:
+            record += rows.tobytes()
+        with self._paths(org_code)[1].open("ab") as f:
+            f.write(record)
+
+    def _store(self, org_code: str, collection: _LocalCollection) -> None:
+        snapshot_path, journal_path = self._paths(org_code)
+        tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.tmp")
+        with tmp_path.open("wb") as f:
+            np.savez(
+                f,
+                ids=collection.ids[: collection.size],
+                matrix=collection.matrix[: collection.size],
+            )
+        os.replace(tmp_path, snapshot_path)
+        journal_path.unlink(missing_ok=True)
+        collection.journal_rows = 0
+
+    @contextlib.asynccontextmanager
+    async def _lock(self, org_code: str) -> AsyncIterator[None]:
+        org_lock = self._locks.get(org_code)
+        if org_lock is None:
+            org_lock = self._locks[org_code] = _OrgLock()
+        org_lock.waiters += 1
+        try:
+            async with org_lock.lock:
+                yield
+        finally:
+            org_lock.waiters -= 1
+            if org_lock.waiters == 0:
+                del self._locks[org_code]
+
+    async def _load_locked(self, org_code: str) -> _LocalCollection | None:
+        collection = self._collections.get(org_code)
+        if collection is None:
+            collection = await asyncio.to_thread(self._read, org_code)
+            if collection is not None:
+                self._collections[org_code] = collection
+        return collection
+
+    async def _load(self, org_code: str) -> _LocalCollection | None:
+        collection = self._collections.get(org_code)
+        if collection is not None:
+            return collection
+        async with self._lock(org_code):
+            return await self._load_locked(org_code)
+
+    async def _require_locked(self, org_code: str) -> _LocalCollection:
+        collection = await self._load_locked(org_code)
+        if collection is None:
+            raise CollectionNotFoundError(org_code=org_code)
+        return collection
+
+    async def _compact_if_needed(
+        self, org_code: str, collection: _LocalCollection
+    ) -> None:
+        if collection.journal_rows > max(collection.size, self._compact_min_rows):
+            await asyncio.to_thread(self._store, org_code, collection)
+
+    async def list_collections(self) -> list[str]:
+        return sorted(
+            path.name.removesuffix(".npz") for path in self._directory.glob("*.npz")
+        )
+
+    async def collection_exists(self, org_code: str) -> bool:
+        return await self._load(org_code) is not None
+
+    async def create_collection(self, org_code: str, model: EmbeddingModels) -> None:
+        async with self._lock(org_code):
+            if await self._load_locked(org_code) is not None:
+                return
+            collection = _LocalCollection.of(
+                ids=np.empty(0, dtype="V16"),
+                matrix=np.empty(
+                    (0, qdrant_vector_params_per_model(model=model).size),
+                    dtype=np.float32,
+                ),
+            )
+            await asyncio.to_thread(self._store, org_code, collection)
+            self._collections[org_code] = collection
+
+    async def upsert(
+        self, org_code: str, ids: list[UUID], vectors: list[list[float]]
+    ) -> None:
+        if len(ids) != len(vectors):
+            msg = "Len of ids and len of vectors must be equal"
+            raise ValueError(msg)
+
+        async with self._lock(org_code):
+            collection = await self._require_locked(org_code)
+            new_ids = np.array([point_id.bytes for point_id in ids], dtype="V16")
+            new_rows = np.asarray(vectors, dtype=np.float32).reshape(
+                len(ids), collection.matrix.shape[1]
+            )
+            norms = np.linalg.norm(new_rows, axis=1, keepdims=True)
+            new_rows /= np.where(norms == 0, 1, norms)
+
+            await asyncio.to_thread(self._append, org_code, _UPSERT, new_ids, new_rows)
+            collection.upsert(new_ids, new_rows)
+            collection.journal_rows += len(ids)
+            await self._compact_if_needed(org_code, collection)
+
+    async def delete(self, org_code: str, ids: list[UUID]) -> None:
+        if len(ids) == 0:
+            return
+
+        async with self._lock(org_code):
+            collection = await self._require_locked(org_code)
+            old_ids = np.array([point_id.bytes for point_id in ids], dtype="V16")
+            await asyncio.to_thread(self._append, org_code, _DELETE, old_ids)
+            collection.delete(old_ids)
+            collection.journal_rows += len(ids)
+            await self._compact_if_needed(org_code, collection)
+
+    async def search(
+        self,
+        org_code: str,
+        vector: list[float],
+        limit: int,
+        score_threshold: float,
+    ) -> list[ScoredPoint]:
+        collection = await self._load(org_code)
+        if collection is None:
+            raise CollectionNotFoundError(org_code=org_code)
+        query = np.asarray(vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0 or collection.size == 0:
+            return []
+
+        ids = collection.ids[: collection.size]
+        scores = collection.matrix[: collection.size] @ (query / query_norm)
+        candidates = np.flatnonzero(scores >= score_threshold)
+        top_n = min(limit, len(candidates))
+        if top_n == 0:
+            return []
+
+        top = candidates[np.argpartition(-scores[candidates], top_n - 1)[:top_n]]
+        ranked = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            ScoredPoint(id=UUID(bytes=ids[i].tobytes()), score=float(scores[i]))
+            for i in ranked
+        ]
+
+
+class CollectionRegistry:
+    """
+    Process level record of organizations known to have a collection.
+
+    Avoids asking the index whether a collection exists on every request and
+    serializes creation so concurrent first requests create it once.
+    """
+
+    def __init__(self) -> None:
+        self._known: set[str] = set()
+        self._locks: dict[str, _OrgLock] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    async def load(self, index: VectorIndex) -> None:
+        """Register every collection present in index."""
+        self._known.update(await index.list_collections())
+
+    def forget(self, org_code: str) -> None:
+        """Drop organization, next lookup asks the index again."""
+        self._known.discard(org_code)
+
+    async def exists(self, index: VectorIndex, org_code: str) -> bool:
+        """Check if organization has a collection."""
+        if org_code in self._known:
+            self.stats.hits += 1
+            return True
+
+        self.stats.misses += 1
+        if await index.collection_exists(org_code=org_code):
+            self._known.add(org_code)
+            return True
+        return False
+
+    async def ensure(
+        self, index: VectorIndex, org_code: str, model: EmbeddingModels
+    ) -> bool:
+        """Create organization collection if missing, `True` if created."""
+        if await self.exists(index=index, org_code=org_code):
+            return False
+
+        async with self._locks.setdefault(org_code, asyncio.Lock()):
+            if org_code in self._known:
+                return False
+            if await index.collection_exists(org_code=org_code):
+                self._known.add(org_code)
+                return False
+
+            await index.create_collection(org_code=org_code, model=model)
+            self._known.add(org_code)
+            return True
@@ -0,0 +1,198 @@
+"""Cache module."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+_K = TypeVar("_K", bound="Hashable")
+_V = TypeVar("_V")
+
+
+@dataclass
+class CacheStats:
+    """Cache usage counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class TTLCache(Generic[_K, _V]):
+    """
+    Bounded LRU cache whose entries expire after a time to live.
+
+    `generation` counts invalidations. Read it before loading a value and pass
+    it to `set`, so a value loaded before a concurrent invalidation is not
+    cached.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+        self._generation = 0
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Count cached keys, expired ones included until looked up."""
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Number of invalidations so far."""
+        return self._generation
+
+    def get(self, key: _K) -> _V | None:
+        """Get value if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(
+        self,
+        key: _K,
+        value: _V,
+        ttl: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """
+        Set value, `ttl` overrides the cache default for this entry.
+
+        Nothing is set when `generation` is older than the current one.
+        """
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = (
+            self._clock() + (ttl if ttl is not None else self._ttl),
+            value,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: _K) -> None:
+        """Remove key from cache."""
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+
+@dataclass
+class _Load:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    waiters: int = 0
+    stale: bool = False
+
+
+class LoadingCache(Generic[_K, _V]):
+    """
+    Bounded LRU cache filling missing or expired keys from a loader.
+
+    Concurrent lookups of a missing key wait for one load instead of each
+    running the loader. A key invalidated while it loads returns the loaded
+    value without keeping it, since the loader may have read older data.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+        self._loads: dict[_K, _Load] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Count loaded keys, expired ones included until looked up."""
+        return len(self._entries)
+
+    def peek(self, key: _K) -> _V | None:
+        """Get value if loaded and not expired, never loading it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get(self, key: _K, loader: Callable[[], Awaitable[_V]]) -> _V:
+        """Get value, loading it when missing or expired."""
+        value = self.peek(key)
+        if value is not None:
+            self.stats.hits += 1
+            return value
+
+        self.stats.misses += 1
+        load = self._loads.get(key)
+        if load is None:
+            load = self._loads[key] = _Load()
+        load.waiters += 1
+        try:
+            async with load.lock:
+                value = self.peek(key)
+                if value is None:
+                    load.stale = False
+                    value = await loader()
+                    if not load.stale:
+                        self._set(key, value)
+        finally:
+            load.waiters -= 1
+            if load.waiters == 0:
+                del self._loads[key]
+        return value
+
+    def _set(self, key: _K, value: _V) -> None:
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: _K) -> None:
+        """Remove key, next lookup loads it again."""
+        self._entries.pop(key, None)
+        load = self._loads.get(key)
+        if load is not None and load.lock.locked():
+            load.stale = True
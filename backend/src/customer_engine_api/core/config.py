@@ -4,20 +4,90 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import assert_never, cast
+from typing import TYPE_CHECKING, assert_never, cast
 
 import cohere
 from cryptography.fernet import Fernet
 from qdrant_client import AsyncQdrantClient
 from sqlalchemy import create_engine
 
-from customer_engine_api.core.typing import Environment
+from customer_engine_api.core import db, event_bus, jwt, time, tracing
+from customer_engine_api.core.api_clients.whatsapp import AsyncWhatsappClient
+from customer_engine_api.core.automatic_responses import (
+    embedding_cache,
+    embeddings,
+    exact_match,
+    keywords,
+    lexical,
+    vector_index,
+)
+from customer_engine_api.core.cache import TTLCache
+from customer_engine_api.core.typing import Environment, RetrievalModes, WebhookModes
+
+if TYPE_CHECKING:
+    from typing import IO
+
+    from customer_engine_api.core.org_settings import OrgSettings
+    from customer_engine_api.core.whatsapp import WhatsappTokens
 
 
 @dataclass(frozen=True)
 class _Clients:
     qdrant: AsyncQdrantClient
     cohere: cohere.AsyncClient
+    whatsapp: AsyncWhatsappClient
+
+
+@dataclass(frozen=True)
+class _Caches:
+    org_settings: TTLCache[str, tuple[OrgSettings, bool]]
+    whatsapp_tokens: TTLCache[str, WhatsappTokens]
+    tokens: jwt.TokenCache
+
+
+@dataclass(frozen=True)
+class _Retrieval:
+    mode: RetrievalModes
+    lexical_min_score: float
+    lexical_only_min_score: float
+    embed_timeout: float
+
+
+@dataclass(frozen=True)
+class _Webhooks:
+    mode: WebhookModes
+    workers: int
+    max_in_flight_per_org: int
+    max_queued: int
+    max_messages_in_flight: int
+
+
+def _span_exporter() -> tracing.SpanExporter | None:
+    if (traces_path := os.environ.get("TRACES_EXPORT_PATH")) is not None:
+        return tracing.FileSpanExporter(path=traces_path)
+    if (
+        traces_endpoint := os.environ.get("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+    ) is not None:
+        return tracing.OtlpHttpSpanExporter(endpoint=traces_endpoint)
+    return None
+
+
+def _event_sinks(engine: db.AsyncEngine) -> list[event_bus.EventSink]:
+    event_sinks: list[event_bus.EventSink] = []
+    for sink in os.environ.get("EVENT_SINKS", "log").split(","):
+        name = sink.strip()
+        if name == "log":
+            event_sinks.append(event_bus.LogSink())
+        elif name == "table":
+            event_sinks.append(event_bus.TableSink(engine=engine, clock=time.now))
+        elif name == "webhook":
+            event_sinks.append(
+                event_bus.WebhookSink(url=os.environ["EVENT_WEBHOOK_URL"])
+            )
+        else:
+            msg = f"Unknown event sink {name}"
+            raise ValueError(msg)
+    return event_sinks
 
 
 class _Resources:
@@ -35,10 +105,13 @@ class _Resources:
         else:
             assert_never(environment)
 
-        self.db_engine = create_engine(
-            url=f"sqlite+{db_url}/?authToken={db_auth_token}&timeout=60",
-            echo=echo_db,
-            pool_pre_ping=True,
+        self.db_engine = db.AsyncEngine(
+            sync_engine=create_engine(
+                url=f"sqlite+{db_url}/?authToken={db_auth_token}&timeout=60",
+                echo=echo_db,
+                pool_pre_ping=True,
+            ),
+            max_workers=int(os.environ.get("DB_MAX_WORKERS", "16")),
         )
 
         qdrant_url = os.environ["QDRANT_URL"]
@@ -47,8 +120,120 @@ class _Resources:
                 url=f"{qdrant_url}:6333", api_key=os.environ["QDRANT_API_KEY"]
             ),
             cohere=cohere.AsyncClient(api_key=os.environ["COHERE_API_KEY"]),
+            whatsapp=AsyncWhatsappClient(),
         )
         self.fernet: Fernet = Fernet(key=os.environ["ENCRYPT_KEY"])
+        self.webhooks = _Webhooks(
+            mode=cast(WebhookModes, os.environ.get("WEBHOOK_MODE", "queue")),
+            workers=int(os.environ.get("WEBHOOK_WORKERS", "8")),
+            max_in_flight_per_org=int(
+                os.environ.get("WEBHOOK_MAX_IN_FLIGHT_PER_ORG", "4")
+            ),
+            max_queued=int(os.environ.get("WEBHOOK_MAX_QUEUED", "1000")),
+            max_messages_in_flight=int(
+                os.environ.get("WEBHOOK_MAX_MESSAGES_IN_FLIGHT", "4")
+            ),
+        )
+
+        org_cache_max_size = int(os.environ.get("ORG_CACHE_MAX_SIZE", "10000"))
+        org_cache_ttl = float(os.environ.get("ORG_CACHE_TTL_SECONDS", "60"))
+        self.caches = _Caches(
+            org_settings=TTLCache(max_size=org_cache_max_size, ttl=org_cache_ttl),
+            whatsapp_tokens=TTLCache(max_size=org_cache_max_size, ttl=org_cache_ttl),
+            tokens=jwt.TokenCache(
+                max_size=int(os.environ.get("TOKEN_CACHE_MAX_SIZE", "10000"))
+            ),
+        )
+
+        self.jwks: jwt.JwksCache | None = None
+        if (jwks_url := os.environ.get("KINDE_JWKS_URL")) is not None:
+            self.jwks = jwt.JwksCache(
+                url=jwks_url,
+                refresh_interval=float(
+                    os.environ.get("JWKS_REFRESH_INTERVAL_SECONDS", "3600")
+                ),
+            )
+
+        memory_embedding_cache = embedding_cache.MemoryEmbeddingCache(
+            max_size=int(os.environ.get("EMBEDDING_CACHE_MAX_SIZE", "10000")),
+            ttl=float(os.environ.get("EMBEDDING_CACHE_TTL_SECONDS", "86400")),
+        )
+        self.embedding_cache: embedding_cache.EmbeddingCache
+        if (disk_cache_path := os.environ.get("EMBEDDING_CACHE_PATH")) is not None:
+            self.embedding_cache = embedding_cache.TieredEmbeddingCache(
+                tiers=[
+                    memory_embedding_cache,
+                    embedding_cache.SqliteEmbeddingCache(
+                        path=disk_cache_path,
+                        ttl=float(
+                            os.environ.get(
+                                "EMBEDDING_DISK_CACHE_TTL_SECONDS", str(30 * 24 * 3600)
+                            )
+                        ),
+                        max_rows=int(
+                            os.environ.get("EMBEDDING_DISK_CACHE_MAX_ROWS", "500000")
+                        ),
+                    ),
+                ]
+            )
+        else:
+            self.embedding_cache = memory_embedding_cache
+
+        self.embedding_batcher = embeddings.EmbeddingBatcher(
+            max_batch_size=int(os.environ.get("EMBEDDING_BATCH_MAX_SIZE", "96")),
+            max_wait=float(os.environ.get("EMBEDDING_BATCH_MAX_WAIT_MS", "5")) / 1000,
+        )
+
+        # The local index keeps collections in process memory, so it refuses to
+        # start when another process (e.g. a second uvicorn worker) holds
+        # LOCAL_VECTOR_INDEX_DIR. Run a single worker when setting it.
+        self.local_vector_index: vector_index.LocalVectorIndex | None = None
+        self.local_vector_index_lock: IO[bytes] | None = None
+        if (local_index_dir := os.environ.get("LOCAL_VECTOR_INDEX_DIR")) is not None:
+            self.local_vector_index_lock = vector_index.lock_directory(
+                directory=local_index_dir
+            )
+            self.local_vector_index = vector_index.LocalVectorIndex(
+                directory=local_index_dir
+            )
+        self.collections = vector_index.CollectionRegistry()
+        org_index_max_size = int(os.environ.get("ORG_INDEX_MAX_SIZE", "1000"))
+        self.exact_match = exact_match.ExactMatchIndex(
+            max_size=org_index_max_size,
+            ttl=float(os.environ.get("EXACT_MATCH_TTL_SECONDS", "300")),
+        )
+        self.keyword_rules = keywords.KeywordRules(
+            max_size=org_index_max_size,
+            ttl=float(os.environ.get("KEYWORD_RULES_TTL_SECONDS", "300")),
+        )
+        self.lexical_index = lexical.LexicalIndex(
+            max_size=org_index_max_size,
+            ttl=float(os.environ.get("LEXICAL_INDEX_TTL_SECONDS", "300")),
+        )
+        self.retrieval = _Retrieval(
+            mode=cast(RetrievalModes, os.environ.get("RETRIEVAL_MODE", "vector")),
+            lexical_min_score=float(os.environ.get("LEXICAL_MIN_SCORE", "0.5")),
+            lexical_only_min_score=float(
+                os.environ.get("LEXICAL_ONLY_MIN_SCORE", "0.9")
+            ),
+            embed_timeout=float(os.environ.get("EMBED_TIMEOUT_SECONDS", "2")),
+        )
+
+        self.span_exporter = _span_exporter()
+        self.service_name = os.environ.get("OTEL_SERVICE_NAME", "customer-engine-api")
+
+        self.event_bus = event_bus.EventBus(
+            sinks=_event_sinks(engine=self.db_engine),
+            max_queued=int(os.environ.get("EVENT_BUS_MAX_QUEUED", "10000")),
+        )
+
+    def get_vector_index(
+        self, qdrant_client: AsyncQdrantClient
+    ) -> vector_index.VectorIndex:
+        """Vector index to use, local one when configured."""
+        if self.local_vector_index is not None:
+            return self.local_vector_index
+        return vector_index.QdrantVectorIndex(client=qdrant_client)
 
 
 resources = _Resources()
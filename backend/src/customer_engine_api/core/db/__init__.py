@@ -0,0 +1,135 @@
+"""Database module."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from customer_engine_api.core import metrics, tracing
+from customer_engine_api.core.logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+
+    from sqlalchemy import URL, Connection, Engine, Executable, Result
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+_execute_seconds = metrics.dependency_seconds.labels(
+    dependency="libsql", operation="execute"
+)
+
+
+def _buffered(result: Result[Any]) -> Result[Any]:
+    """Fetch all rows so reading the result never touches the network again."""
+    if not result.returns_rows:
+        return result
+    return result.freeze()()
+
+
+class AsyncConnection:
+    """Async connection that offloads every call to the engine thread pool."""
+
+    def __init__(self, sync_connection: Connection, engine: AsyncEngine) -> None:
+        self.sync_connection = sync_connection
+        self._engine = engine
+        self._after_commit: list[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run callback once the transaction commits, never if it rolls back.
+
+        Use it to update in-process caches and indexes, so a rolled back
+        write never shows up in them.
+        """
+        self._after_commit.append(callback)
+
+    def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("After commit callback failed")
+
+    async def execute(
+        self,
+        statement: Executable,
+        parameters: Sequence[Mapping[str, Any]] | Mapping[str, Any] | None = None,
+    ) -> Result[Any]:
+        """Execute statement without blocking the event loop."""
+
+        def _execute() -> Result[Any]:
+            return _buffered(self.sync_connection.execute(statement, parameters))
+
+        with (
+            tracing.span(name="libsql.execute", kind="client") as span,
+            _execute_seconds.time(),
+        ):
+            if span is not None:
+                span.attributes["db.system"] = "sqlite"
+                span.attributes["db.statement"] = str(statement)
+            return await self._engine.run_sync(_execute)
+
+
+class AsyncEngine:
+    """
+    Async engine backed by a bounded thread pool.
+
+    The libsql dialect is synchronous, so blocking calls are run on a
+    dedicated pool to let concurrent requests overlap their database waits.
+    """
+
+    def __init__(self, sync_engine: Engine, max_workers: int) -> None:
+        self.sync_engine = sync_engine
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="db"
+        )
+
+    @property
+    def url(self) -> URL:
+        """Database URL."""
+        return self.sync_engine.url
+
+    async def run_sync(
+        self, fn: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        """Run blocking function on the database thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    @contextlib.asynccontextmanager
+    async def connect(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Open a connection, anything not committed is rolled back on close.
+
+        After commit callbacks registered on it never run, only `begin` commits.
+        """
+        sync_connection = await self.run_sync(self.sync_engine.connect)
+        try:
+            yield AsyncConnection(sync_connection=sync_connection, engine=self)
+        finally:
+            await self.run_sync(sync_connection.close)
+
+    @contextlib.asynccontextmanager
+    async def begin(self) -> AsyncIterator[AsyncConnection]:
+        """Open a connection with a transaction, committed on success."""
+        async with self.connect() as conn:
+            transaction = await self.run_sync(conn.sync_connection.begin)
+            try:
+                yield conn
+            except BaseException:
+                await self.run_sync(transaction.rollback)
+                raise
+            await self.run_sync(transaction.commit)
+            conn._run_after_commit()  # noqa: SLF001
+
+    async def dispose(self) -> None:
+        """Close pooled connections and stop the thread pool."""
+        await self.run_sync(self.sync_engine.dispose)
+        self._executor.shutdown(wait=True)
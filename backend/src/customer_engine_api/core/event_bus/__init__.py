@@ -0,0 +1,281 @@
+"""
+Event bus module.
+
+Routes hand their domain events to the bus, which queues them and publishes
+them from a background task so sinks never run on the request path. Events of
+a `BatchedEvent` type are coalesced per organization before reaching sinks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Self
+from uuid import uuid4
+
+import httpx
+import orjson
+import sqlalchemy
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.core.logging import logger
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Callable
+
+    from lego_workflows.components import DomainEvent
+
+    from customer_engine_api.core.db import AsyncEngine
+    from customer_engine_api.core.typing import Json
+
+
+class BatchedEvent(ABC):
+    """Event published once for every batch of its type and organization."""
+
+    org_code: str
+
+    @classmethod
+    @abstractmethod
+    async def publish_batch(cls, events: list[Self]) -> None:
+        """Publish coalesced events."""
+        raise NotImplementedError
+
+
+def event_type(event: DomainEvent) -> str:
+    """Event name qualified by the handler that emits it."""
+    module = type(event).__module__.removeprefix("customer_engine_api.handlers.")
+    return f"{module}.{type(event).__name__}"
+
+
+@dataclass(frozen=True)
+class EventGroup:
+    """Events of one type and organization published together."""
+
+    event_type: str
+    org_code: str | None
+    events: list[DomainEvent]
+
+    def to_json(self) -> Json:
+        """Group as a JSON document, orjson serializes the event dataclasses."""
+        return {
+            "type": self.event_type,
+            "org_code": self.org_code,
+            "count": len(self.events),
+            "events": self.events,
+        }
+
+
+def coalesce(events: list[DomainEvent]) -> list[EventGroup]:
+    """Group batched events by type and organization, keeping first seen order."""
+    groups: list[EventGroup] = []
+    batched: dict[tuple[str, str], EventGroup] = {}
+    for event in events:
+        org_code = getattr(event, "org_code", None)
+        if not isinstance(event, BatchedEvent):
+            groups.append(
+                EventGroup(
+                    event_type=event_type(event), org_code=org_code, events=[event]
+                )
+            )
+            continue
+
+        key = (event_type(event), event.org_code)
+        group = batched.get(key)
+        if group is None:
+            group = batched[key] = EventGroup(
+                event_type=key[0], org_code=key[1], events=[]
+            )
+            groups.append(group)
+        group.events.append(event)
+    return groups
+
+
+class EventSink(ABC):
+    """Destination for published events."""
+
+    @abstractmethod
+    async def publish(self, groups: list[EventGroup]) -> None:
+        """Publish coalesced events."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release sink resources."""
+
+
+class LogSink(EventSink):
+    """Run the `publish` of each event, of batched events once per group."""
+
+    async def publish(self, groups: list[EventGroup]) -> None:
+        for group in groups:
+            first = group.events[0]
+            if isinstance(first, BatchedEvent):
+                await type(first).publish_batch(group.events)
+            else:
+                await first.publish()
+
+
+class TableSink(EventSink):
+    """
+    Store one row per event group in the `domain_events_outbox` table.
+
+    Rows are written in their own transaction once the bus drains the events,
+    after the request committed. It is not a transactional outbox: events
+    dropped by a full bus or still queued when the process dies are lost.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, clock: Callable[[], datetime.datetime]
+    ) -> None:
+        self._engine = engine
+        self._clock = clock
+
+    async def publish(self, groups: list[EventGroup]) -> None:
+        stmt = text(
+            """
+            INSERT INTO domain_events_outbox (
+                event_id, org_code, event_type, payload, created_at
+            ) VALUES (
+                :event_id, :org_code, :event_type, :payload, :created_at
+            )
+            """
+        ).bindparams(
+            bindparam(key="event_id", type_=sqlalchemy.UUID()),
+            bindparam(key="org_code", type_=sqlalchemy.String()),
+            bindparam(key="event_type", type_=sqlalchemy.String()),
+            bindparam(key="payload", type_=sqlalchemy.String()),
+            bindparam(key="created_at", type_=sqlalchemy.DateTime()),
+        )
+        created_at = self._clock()
+        async with self._engine.begin() as conn:
+            await conn.execute(
+                stmt,
+                [
+                    {
+                        "event_id": uuid4(),
+                        "org_code": group.org_code,
+                        "event_type": group.event_type,
+                        "payload": orjson.dumps(group.events).decode(),
+                        "created_at": created_at,
+                    }
+                    for group in groups
+                ],
+            )
+
+
+class WebhookSink(EventSink):
+    """Post every batch of event groups as one JSON document."""
+
+    def __init__(
+        self, url: str, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        self._url = url
+        self._client = httpx.AsyncClient(transport=transport, timeout=10)
+
+    async def publish(self, groups: list[EventGroup]) -> None:
+        response = await self._client.post(
+            url=self._url,
+            content=orjson.dumps({"groups": [group.to_json() for group in groups]}),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+@dataclass
+class EventBusMetrics:
+    """Counters to observe the event bus."""
+
+    published: int = 0
+    dropped: int = 0
+    failed_batches: int = 0
+    queued: int = 0
+
+
+class EventBus:
+    """Bounded queue of domain events drained by a background task."""
+
+    def __init__(
+        self,
+        sinks: list[EventSink],
+        max_queued: int = 10_000,
+        max_batch_size: int = 1_000,
+    ) -> None:
+        self._sinks = sinks
+        self._max_queued = max_queued
+        self._max_batch_size = max_batch_size
+        self._queue: deque[DomainEvent] = deque()
+        self._pending = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task[None] | None = None
+        self._metrics = EventBusMetrics()
+
+    @property
+    def metrics(self) -> EventBusMetrics:
+        """Current event bus metrics."""
+        self._metrics.queued = len(self._queue)
+        return self._metrics
+
+    def publish(self, events: list[DomainEvent]) -> None:
+        """Queue events without waiting, those over capacity are dropped."""
+        room = self._max_queued - len(self._queue)
+        if len(events) > room:
+            self._metrics.dropped += len(events) - max(room, 0)
+            events = events[: max(room, 0)]
+        self._queue.extend(events)
+        if len(events) > 0:
+            self._idle.clear()
+            self._pending.set()
+
+    def start(self) -> None:
+        """Start publishing queued events in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain(), name="event-bus")
+
+    async def stop(self, timeout: float) -> None:  # noqa: ASYNC109
+        """Publish what is queued within `timeout` seconds and close sinks."""
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(timeout):
+                if self._task is None:
+                    await self.flush()
+                await self._idle.wait()
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for sink in self._sinks:
+            await sink.aclose()
+
+    async def flush(self) -> None:
+        """Publish every queued event."""
+        while len(self._queue) > 0:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self._max_batch_size, len(self._queue)))
+            ]
+            groups = coalesce(batch)
+            for sink in self._sinks:
+                try:
+                    await sink.publish(groups)
+                except Exception:
+                    self._metrics.failed_batches += 1
+                    logger.exception(
+                        "Unable to publish {count} events to {sink}",
+                        count=len(batch),
+                        sink=type(sink).__name__,
+                    )
+            self._metrics.published += len(batch)
+        self._idle.set()
+
+    async def _drain(self) -> None:
+        while True:
+            await self._pending.wait()
+            self._pending.clear()
+            await self.flush()
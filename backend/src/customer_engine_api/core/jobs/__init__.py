@@ -0,0 +1,224 @@
+"""Background jobs module."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from customer_engine_api.core.logging import logger
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Awaitable, Callable
+
+    from customer_engine_api.core import whatsapp
+
+
+@dataclass(frozen=True)
+class Job:
+    """Unit of work waiting to be processed for an organization."""
+
+    org_code: str
+    messages: list[whatsapp.payloads.TextMessage]
+    received_at: datetime.datetime
+
+
+@dataclass
+class JobMetrics:
+    """Counters to observe queue backpressure."""
+
+    enqueued: int = 0
+    rejected: int = 0
+    processed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    waiting_for_org_slot: int = 0
+    queued: int = 0
+
+
+class JobBackend(ABC):
+    """Storage for pending jobs, implement it to plug a durable queue."""
+
+    @abstractmethod
+    async def put(self, job: Job) -> bool:
+        """Store job, return `False` when there is no room for it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self) -> Job:
+        """Wait for the next job."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ack(self, job: Job) -> None:
+        """Mark job as done so it's not delivered again."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def size(self) -> int:
+        """Count jobs waiting to be processed."""
+        raise NotImplementedError
+
+
+class InMemoryJobBackend(JobBackend):
+    """Bounded in-process queue, pending jobs are lost on restart."""
+
+    def __init__(self, max_size: int) -> None:
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_size)
+
+    async def put(self, job: Job) -> bool:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def get(self) -> Job:
+        return await self._queue.get()
+
+    async def ack(self, job: Job) -> None:  # noqa: ARG002
+        self._queue.task_done()
+
+    def size(self) -> int:
+        return self._queue.qsize()
+
+
+class WorkerPool:
+    """
+    Pool of async workers draining a job backend.
+
+    Jobs from the same organization are limited to `max_in_flight_per_org`
+    concurrent executions so a noisy tenant cannot take every worker. A job
+    whose organization is at its limit is parked without taking a worker and
+    runs when one of that organization's jobs finishes. Up to `max_parked`
+    jobs are parked, past that no job is taken from the backend until one is
+    released.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        handler: Callable[[Job], Awaitable[None]],
+        workers: int,
+        max_in_flight_per_org: int,
+        max_parked: int,
+    ) -> None:
+        self._backend = backend
+        self._handler = handler
+        self._max_in_flight_per_org = max_in_flight_per_org
+        self._max_parked = max_parked
+        self._free_workers = asyncio.Semaphore(workers)
+        self._in_flight_per_org: dict[str, int] = {}
+        self._parked: dict[str, deque[Job]] = {}
+        self._unparked = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+        self._metrics = JobMetrics()
+
+    @property
+    def metrics(self) -> JobMetrics:
+        """Snapshot of current metrics."""
+        self._metrics.queued = self._backend.size()
+        return self._metrics
+
+    async def enqueue(self, job: Job) -> bool:
+        """Enqueue job, return `False` if backend is full."""
+        if not await self._backend.put(job):
+            self._metrics.rejected += 1
+            return False
+        self._metrics.enqueued += 1
+        self._drained.clear()
+        return True
+
+    def start(self) -> None:
+        """Start workers."""
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(
+                self._dispatch(), name="job-dispatcher"
+            )
+
+    async def stop(self, timeout: float) -> None:  # noqa: ASYNC109
+        """Wait up to `timeout` seconds for pending jobs, then stop workers."""
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(timeout):
+                await self._drained.wait()
+
+        tasks = [*self._running]
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+            self._dispatcher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dispatch(self) -> None:
+        while True:
+            while self._metrics.waiting_for_org_slot >= self._max_parked:
+                self._unparked.clear()
+                await self._unparked.wait()
+            await self._free_workers.acquire()
+            job = await self._backend.get()
+            if self._in_flight_per_org.get(job.org_code, 0) >= (
+                self._max_in_flight_per_org
+            ):
+                self._parked.setdefault(job.org_code, deque()).append(job)
+                self._metrics.waiting_for_org_slot += 1
+                self._free_workers.release()
+                continue
+            self._in_flight_per_org[job.org_code] = (
+                self._in_flight_per_org.get(job.org_code, 0) + 1
+            )
+            self._start(job=job)
+
+    def _start(self, job: Job) -> None:
+        # Counted before the task first runs, so a job finishing meanwhile
+        # can't report the pool drained.
+        self._metrics.in_flight += 1
+        self._drained.clear()
+        task = asyncio.create_task(self._run(job=job))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, job: Job) -> None:
+        try:
+            await self._handler(job)
+        except Exception:
+            self._metrics.failed += 1
+            logger.exception("Job for org {org_code} failed", org_code=job.org_code)
+        else:
+            self._metrics.processed += 1
+        finally:
+            self._metrics.in_flight -= 1
+            await self._backend.ack(job)
+            self._release(org_code=job.org_code)
+
+    def _release(self, org_code: str) -> None:
+        """Hand the worker to a parked job of the org, or free it."""
+        parked = self._parked.get(org_code)
+        if parked is not None and self._dispatcher is not None:
+            next_job = parked.popleft()
+            if len(parked) == 0:
+                del self._parked[org_code]
+            self._metrics.waiting_for_org_slot -= 1
+            self._unparked.set()
+            self._start(job=next_job)
+            return
+
+        in_flight = self._in_flight_per_org[org_code] - 1
+        if in_flight == 0:
+            del self._in_flight_per_org[org_code]
+        else:
+            self._in_flight_per_org[org_code] = in_flight
+        self._free_workers.release()
+        if (
+            self._metrics.in_flight == 0
+            and len(self._parked) == 0
+            and self._backend.size() == 0
+        ):
+            self._drained.set()
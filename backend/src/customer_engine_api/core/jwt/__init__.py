@@ -2,14 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime
+import hashlib
+import time
 from dataclasses import dataclass, field
-from typing import Self
+from typing import TYPE_CHECKING, Self
 
+import httpx
 import jwt
 from mashumaro import field_options
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 
+from customer_engine_api.core.cache import TTLCache
+from customer_engine_api.core.logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_SIGNING_ALGORITHMS = ["RS256"]
+
+
+class TokenVerificationError(ValueError):
+    """Raised when token signature or claims can't be verified."""
+
+
+class UnknownSigningKeyError(TokenVerificationError):
+    """Raised when no JWKS key matches the token key id."""
+
+    def __init__(self, key_id: str | None) -> None:
+        super().__init__(f"No signing key with id {key_id}.")
+        self.key_id = key_id
+
 
 @dataclass(frozen=True)
 class KindeToken(DataClassORJSONMixin):
@@ -37,3 +61,134 @@ class KindeToken(DataClassORJSONMixin):
                 algorithms=[jwt.get_unverified_header(encoded_token)["alg"]],
             )
         )
+
+    @classmethod
+    def from_verified_token(cls, encoded_token: str, key: jwt.PyJWK) -> Self:
+        """
+        Instantiate from encoded token, checking its signature against key.
+
+        Expiration is left to `is_expired` so callers decide the current time.
+        """
+        try:
+            claims = jwt.decode(
+                encoded_token,
+                key=key.key,
+                algorithms=_SIGNING_ALGORITHMS,
+                options={"verify_exp": False, "verify_aud": False},
+            )
+        except jwt.InvalidTokenError as e:
+            raise TokenVerificationError(str(e)) from e
+        return cls.from_dict(claims)
+
+
+class JwksCache:
+    """
+    Signing keys of a JWKS endpoint, refreshed in the background.
+
+    Lookups never wait on the network unless the token names a key id that is
+    not known yet, which triggers at most one refresh per `min_refresh_interval`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_interval: float = 3600,
+        min_refresh_interval: float = 60,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._url = url
+        self._refresh_interval = refresh_interval
+        self._min_refresh_interval = min_refresh_interval
+        self._client = httpx.AsyncClient(transport=transport, timeout=10)
+        self._clock = clock
+        self._keys: dict[str | None, jwt.PyJWK] = {}
+        self._refreshed_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    async def refresh(self) -> None:
+        """Fetch the key set again."""
+        async with self._lock:
+            response = await self._client.get(self._url)
+            response.raise_for_status()
+            key_set = jwt.PyJWKSet.from_dict(response.json())
+            self._keys = {key.key_id: key for key in key_set.keys}
+            self._refreshed_at = self._clock()
+
+    async def get(self, key_id: str | None) -> jwt.PyJWK:
+        """Signing key with `key_id`."""
+        key = self._keys.get(key_id)
+        if key is not None:
+            return key
+
+        if (
+            self._refreshed_at is None
+            or self._clock() - self._refreshed_at >= self._min_refresh_interval
+        ):
+            await self.refresh()
+            key = self._keys.get(key_id)
+        if key is None:
+            raise UnknownSigningKeyError(key_id=key_id)
+        return key
+
+    async def decode(self, encoded_token: str) -> KindeToken:
+        """Decode token verifying it was signed by one of the keys."""
+        try:
+            key_id = jwt.get_unverified_header(encoded_token).get("kid")
+        except jwt.InvalidTokenError as e:
+            raise TokenVerificationError(str(e)) from e
+        return KindeToken.from_verified_token(
+            encoded_token=encoded_token, key=await self.get(key_id=key_id)
+        )
+
+    def start(self) -> None:
+        """Refresh keys every `refresh_interval` seconds."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(), name="jwks-refresh")
+
+    async def stop(self) -> None:
+        """Stop refreshing and close connections."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._client.aclose()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Unable to refresh JWKS from {url}", url=self._url)
+                await asyncio.sleep(self._min_refresh_interval)
+            else:
+                await asyncio.sleep(self._refresh_interval)
+
+
+class TokenCache:
+    """Decoded tokens keyed by the token hash, evicted at their expiration."""
+
+    def __init__(self, max_size: int) -> None:
+        self._cache: TTLCache[bytes, KindeToken] = TTLCache(
+            max_size=max_size, ttl=0, clock=time.time
+        )
+        self.stats = self._cache.stats
+
+    def __len__(self) -> int:
+        """Count cached tokens, expired ones included until looked up."""
+        return len(self._cache)
+
+    @staticmethod
+    def _key(encoded_token: str) -> bytes:
+        return hashlib.sha256(encoded_token.encode()).digest()
+
+    def get(self, encoded_token: str) -> KindeToken | None:
+        """Get cached token, `None` if unknown or past its expiration."""
+        return self._cache.get(self._key(encoded_token))
+
+    def set(self, encoded_token: str, token: KindeToken) -> None:
+        """Cache token until its expiration."""
+        ttl = token.expiration_time - time.time()
+        if ttl > 0:
+            self._cache.set(self._key(encoded_token), token, ttl=ttl)
@@ -3,17 +3,150 @@
 from __future__ import annotations
 
 import os
+import random
 import sys
+import traceback
+from typing import TYPE_CHECKING, cast
 
 import loguru
+import orjson
 
+from customer_engine_api.core.typing import LogFormats
 
-def _configure_logger(logger: loguru.Logger, level: str) -> loguru.Logger:
-    """Configure logger for the system."""
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import TextIO
+
+_DEBUG_LEVEL_NO = 10
+
+
+def _parse_module_levels(module_levels: str) -> dict[str, str]:
+    """Parse `module=LEVEL` pairs separated by commas."""
+    levels: dict[str, str] = {}
+    for pair in module_levels.split(","):
+        if pair.strip() == "":
+            continue
+        module, level = pair.split("=", maxsplit=1)
+        levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+def _record_filter(
+    logger: loguru.Logger,
+    level: str,
+    module_levels: dict[str, str],
+    debug_sample_rate: float,
+) -> Callable[[loguru.Record], bool]:
+    """Apply the most specific module level, then sample debug records."""
+    default_no = logger.level(level).no
+    overrides = sorted(
+        (
+            (module, logger.level(module_level).no)
+            for module, module_level in module_levels.items()
+        ),
+        key=lambda override: len(override[0]),
+        reverse=True,
+    )
+    min_no_per_module: dict[str | None, int] = {}
+
+    def _filter(record: loguru.Record) -> bool:
+        module = record["name"]
+        min_no = min_no_per_module.get(module)
+        if min_no is None:
+            min_no = next(
+                (
+                    no
+                    for prefix, no in overrides
+                    if module is not None
+                    and (module == prefix or module.startswith(f"{prefix}."))
+                ),
+                default_no,
+            )
+            min_no_per_module[module] = min_no
+
+        level_no = record["level"].no
+        if level_no < min_no:
+            return False
+        if level_no <= _DEBUG_LEVEL_NO and debug_sample_rate < 1:
+            return random.random() < debug_sample_rate  # noqa: S311
+        return True
+
+    return _filter
+
+
+def _json_line(record: loguru.Record) -> bytes:
+    """Serialize record as one JSON line, extra fields at the top level."""
+    payload: dict[str, object] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    if (exception := record["exception"]) is not None:
+        payload["exception"] = "".join(
+            traceback.format_exception(
+                exception.type, exception.value, exception.traceback
+            )
+        )
+    return orjson.dumps(payload, default=str) + b"\n"
+
+
+def _json_sink(stream: TextIO) -> Callable[[loguru.Message], None]:
+    buffer = stream.buffer
+
+    def _write(message: loguru.Message) -> None:
+        buffer.write(_json_line(message.record))
+        buffer.flush()
+
+    return _write
+
+
+def _configure_logger(  # noqa: PLR0913
+    logger: loguru.Logger,
+    level: str,
+    log_format: LogFormats = "text",
+    module_levels: dict[str, str] | None = None,
+    debug_sample_rate: float = 1.0,
+    stream: TextIO = sys.stderr,
+) -> loguru.Logger:
+    """
+    Configure logger for the system.
+
+    `json` writes one orjson serialized record per line from a background
+    thread, so logging calls only enqueue the record.
+    """
+    module_levels = module_levels or {}
     logger.remove()
-    fmt = "{time:HH:mm:ss} <lvl>[{level}]</lvl> {message} <green>{name}:{function}:{line}</green>"
-    logger.add(sys.stderr, format=fmt, level=level)
+    record_filter = _record_filter(
+        logger=logger,
+        level=level,
+        module_levels=module_levels,
+        debug_sample_rate=debug_sample_rate,
+    )
+    min_level = min(
+        logger.level(candidate).no for candidate in (level, *module_levels.values())
+    )
+    if log_format == "json":
+        logger.add(
+            _json_sink(stream=stream),
+            level=min_level,
+            filter=record_filter,
+            enqueue=True,
+            catch=True,
+        )
+    else:
+        fmt = "{time:HH:mm:ss} <lvl>[{level}]</lvl> {message} <green>{name}:{function}:{line}</green>"
+        logger.add(stream, format=fmt, level=min_level, filter=record_filter)
     return logger
 
 
-logger = _configure_logger(logger=loguru.logger, level=os.environ["LOG_LEVEL"])
+logger = _configure_logger(
+    logger=loguru.logger,
+    level=os.environ["LOG_LEVEL"],
+    log_format=cast(LogFormats, os.environ.get("LOG_FORMAT", "text")),
+    module_levels=_parse_module_levels(os.environ.get("LOG_MODULE_LEVELS", "")),
+    debug_sample_rate=float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "1")),
+)
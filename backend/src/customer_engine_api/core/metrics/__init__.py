@@ -0,0 +1,354 @@
+"""
+Metrics module.
+
+Minimal in-process metrics rendered in the Prometheus text format. Resolve
+label values once with `labels()` and keep the child, recording is then a
+plain attribute update cheap enough to wrap every stage of a command.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Literal, TypeAlias
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from contextlib import AbstractContextManager
+
+MetricTypes: TypeAlias = Literal["counter", "gauge", "histogram"]
+Sample: TypeAlias = tuple[str, tuple[tuple[str, str], ...], float]
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if len(labels) == 0:
+        return ""
+    escaped = (
+        (name, value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metric(ABC):
+    """Named metric with a fixed set of label names."""
+
+    type_: MetricTypes
+
+    def __init__(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+
+    def _label_values(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            msg = f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(labels[name] for name in self.label_names)
+
+    def _label_pairs(self, values: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+        return tuple(zip(self.label_names, values, strict=True))
+
+    @abstractmethod
+    def samples(self) -> Iterator[Sample]:
+        """Yield current samples as name, labels and value."""
+        raise NotImplementedError
+
+
+class _CounterChild:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase counter."""
+        self.value += amount
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type_ = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(
+            name=name, documentation=documentation, label_names=label_names
+        )
+        self._children: dict[tuple[str, ...], _CounterChild] = {}
+
+    def labels(self, **labels: str) -> _CounterChild:
+        """Counter for label values."""
+        values = self._label_values(labels)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _CounterChild()
+        return child
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase counter without labels."""
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in self._children.items():
+            yield (self.name, self._label_pairs(values), child.value)
+
+
+class _GaugeChild:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set gauge."""
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase gauge."""
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease gauge."""
+        self.value -= amount
+
+    @contextlib.contextmanager
+    def track_in_progress(self) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.value += 1
+        try:
+            yield
+        finally:
+            self.value -= 1
+
+
+class Gauge(Metric):
+    """Value that goes up and down."""
+
+    type_ = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(
+            name=name, documentation=documentation, label_names=label_names
+        )
+        self._children: dict[tuple[str, ...], _GaugeChild] = {}
+
+    def labels(self, **labels: str) -> _GaugeChild:
+        """Gauge for label values."""
+        values = self._label_values(labels)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _GaugeChild()
+        return child
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in self._children.items():
+            yield (self.name, self._label_pairs(values), child.value)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        """Record how many seconds the block takes, also when it fails."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(Metric):
+    """Distribution of values over cumulative buckets."""
+
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(
+            name=name, documentation=documentation, label_names=label_names
+        )
+        self._buckets = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], _HistogramChild] = {}
+
+    def labels(self, **labels: str) -> _HistogramChild:
+        """Histogram for label values."""
+        values = self._label_values(labels)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _HistogramChild(buckets=self._buckets)
+        return child
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in self._children.items():
+            labels = self._label_pairs(values)
+            cumulative = 0
+            for bound, count in zip(
+                (*child.buckets, float("inf")), child.counts, strict=True
+            ):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    (*labels, ("le", _format_value(bound))),
+                    cumulative,
+                )
+            yield (f"{self.name}_count", labels, cumulative)
+            yield (f"{self.name}_sum", labels, child.sum)
+
+
+class CallbackMetric(Metric):
+    """Metric read from `callback` when collected, keyed by label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type_: Literal["counter", "gauge"],
+        callback: Callable[[], dict[tuple[str, ...], float]],
+        label_names: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(
+            name=name, documentation=documentation, label_names=label_names
+        )
+        self.type_ = type_
+        self._callback = callback
+
+    def samples(self) -> Iterator[Sample]:
+        for values, value in self._callback().items():
+            yield (self.name, self._label_pairs(values), value)
+
+
+class Registry:
+    """Collection of metrics exposed together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        """Add metric, names must be unique."""
+        if metric.name in self._metrics:
+            msg = f"Metric {metric.name} is already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+
+    def unregister(self, name: str) -> None:
+        """Remove metric if registered."""
+        self._metrics.pop(name, None)
+
+    def expose(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_}")
+            lines.extend(
+                f"{name}{_format_labels(labels)} {_format_value(float(value))}"
+                for name, labels, value in metric.samples()
+            )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_seconds = Histogram(
+    name="customer_engine_stage_seconds",
+    documentation="Seconds spent in each stage of a command.",
+    label_names=("command", "stage"),
+)
+dependency_seconds = Histogram(
+    name="customer_engine_dependency_seconds",
+    documentation="Seconds spent waiting on external dependencies.",
+    label_names=("dependency", "operation"),
+)
+prompts_total = Counter(
+    name="customer_engine_prompts_total",
+    documentation="Prompts searched, by whether they matched an example.",
+    label_names=("result",),
+)
+webhook_deliveries_total = Counter(
+    name="customer_engine_webhook_deliveries_total",
+    documentation="Webhook deliveries received, by whether they carry messages.",
+    label_names=("kind",),
+)
+webhook_replies_total = Counter(
+    name="customer_engine_webhook_replies_total",
+    documentation="Webhook messages processed, by whether replying failed.",
+    label_names=("result",),
+)
+http_requests_in_flight = Gauge(
+    name="customer_engine_http_requests_in_flight",
+    documentation="HTTP requests being served.",
+)
+http_request_seconds = Histogram(
+    name="customer_engine_http_request_seconds",
+    documentation="Seconds to serve HTTP requests.",
+    label_names=("method", "route"),
+)
+
+
+class StageTimer:
+    """Per stage latency timers of one command, resolved up front."""
+
+    def __init__(self, command: str, stages: tuple[str, ...]) -> None:
+        self._children = {
+            stage: stage_seconds.labels(command=command, stage=stage)
+            for stage in stages
+        }
+
+    def __call__(self, stage: str) -> AbstractContextManager[None]:
+        """Time block as `stage`."""
+        return self._children[stage].time()
+
+
+for _metric in (
+    stage_seconds,
+    dependency_seconds,
+    prompts_total,
+    webhook_deliveries_total,
+    webhook_replies_total,
+    http_requests_in_flight,
+    http_request_seconds,
+):
+    registry.register(_metric)
@@ -0,0 +1,38 @@
+"""Keyset pagination module."""
+
+from __future__ import annotations
+
+import base64
+
+import orjson
+from lego_workflows.components import DomainError
+
+
+class InvalidCursorError(DomainError):
+    """Raised when a page cursor can't be decoded."""
+
+    def __init__(self, cursor: str) -> None:
+        super().__init__(f"Invalid page cursor {cursor}")
+
+
+def encode_cursor(values: list[str]) -> str:
+    """Opaque cursor pointing after the row with `values` as sort key."""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Sort key values of a cursor, `size` is the number of values expected."""
+    try:
+        values = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except ValueError as e:
+        raise InvalidCursorError(cursor=cursor) from e
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise InvalidCursorError(cursor=cursor)
+    return values
@@ -0,0 +1,36 @@
+"""Text module."""
+
+from __future__ import annotations
+
+import hashlib
+import unicodedata
+
+
+def normalize(text: str) -> str:
+    """Normalize text so equivalent user inputs compare equal."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def fingerprint(text: str) -> str:
+    """Hex digest of normalized text, equal for texts that normalize equal."""
+    return hashlib.sha256(normalize(text).encode()).hexdigest()
+
+
+def fold(text: str) -> str:
+    """
+    Normalize text, also dropping accents and punctuation.
+
+    Looser than `normalize`, "¿Dónde están?" and "donde estan" fold equal.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(
+        " " if unicodedata.category(char).startswith("P") else char
+        for char in decomposed
+        if not unicodedata.combining(char)
+    )
+    return " ".join(unicodedata.normalize("NFKC", folded).split())
+
+
+def folded_fingerprint(text: str) -> str:
+    """Hex digest of folded text, equal for texts that fold equal."""
+    return hashlib.sha256(fold(text).encode()).hexdigest()
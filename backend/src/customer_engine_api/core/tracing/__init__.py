@@ -0,0 +1,302 @@
+"""
+Tracing module.
+
+Spans nest through a context variable, so a span opened while another is
+active becomes its child. Finished spans are buffered in memory and exported
+in the OTLP JSON encoding by a background task, never on the request path.
+While no exporter is configured `span()` yields `None` and records nothing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+
+import httpx
+import orjson
+
+from customer_engine_api.core.logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+
+    from customer_engine_api.core.typing import Json
+
+SpanKinds: TypeAlias = Literal["internal", "server", "client"]
+AttributeValue: TypeAlias = str | int | float | bool
+
+_OTLP_SPAN_KINDS: dict[SpanKinds, int] = {"internal": 1, "server": 2, "client": 3}
+_OTLP_STATUS_OK = 1
+_OTLP_STATUS_ERROR = 2
+
+
+def _otlp_value(value: AttributeValue) -> Json:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": value}
+
+
+def _otlp_attributes(attributes: dict[str, AttributeValue]) -> list[Json]:
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+@dataclass
+class Span:
+    """Timed operation, part of a trace."""
+
+    name: str
+    kind: SpanKinds
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_ns: int
+    end_time_ns: int = 0
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_otlp(self) -> Json:
+        """Span in the OTLP JSON encoding."""
+        otlp_span: Json = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_SPAN_KINDS[self.kind],
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": _OTLP_STATUS_OK}
+            if self.error is None
+            else {"code": _OTLP_STATUS_ERROR, "message": self.error},
+        }
+        if self.parent_span_id is not None:
+            otlp_span["parentSpanId"] = self.parent_span_id
+        return otlp_span
+
+
+def export_request(service_name: str, spans: list[Span]) -> Json:
+    """OTLP `ExportTraceServiceRequest` body for spans."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": service_name})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "customer_engine_api"},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """Destination for finished spans."""
+
+    @abstractmethod
+    async def export(self, service_name: str, spans: list[Span]) -> None:
+        """Send spans."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release exporter resources."""
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Append one OTLP JSON export request per line to a file.
+
+    The format is the one read by the collector `otlpjsonfile` receiver.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+
+    def _write(self, line: bytes) -> None:
+        with self._path.open("ab") as f:
+            f.write(line)
+
+    async def export(self, service_name: str, spans: list[Span]) -> None:
+        line = orjson.dumps(export_request(service_name=service_name, spans=spans))
+        await asyncio.to_thread(self._write, line + b"\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """Post OTLP JSON export requests to a collector."""
+
+    def __init__(
+        self, endpoint: str, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        self._endpoint = endpoint
+        self._client = httpx.AsyncClient(transport=transport, timeout=10)
+
+    async def export(self, service_name: str, spans: list[Span]) -> None:
+        response = await self._client.post(
+            url=self._endpoint,
+            content=orjson.dumps(
+                export_request(service_name=service_name, spans=spans)
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_disabled: contextlib.nullcontext[None] = contextlib.nullcontext()
+
+
+class Tracer:
+    """Record spans and export them in batches."""
+
+    def __init__(
+        self,
+        max_queued: int = 10_000,
+        max_batch_size: int = 512,
+        export_interval: float = 1.0,
+    ) -> None:
+        self._finished: deque[Span] = deque(maxlen=max_queued)
+        self._max_batch_size = max_batch_size
+        self._export_interval = export_interval
+        self._exporter: SpanExporter | None = None
+        self._service_name = "customer-engine-api"
+        self._task: asyncio.Task[None] | None = None
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being recorded."""
+        return self._exporter is not None
+
+    def span(
+        self,
+        name: str,
+        kind: SpanKinds = "internal",
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> AbstractContextManager[Span | None]:
+        """Record block as a span, child of the active one."""
+        if self._exporter is None:
+            return _disabled
+        return self._record(name=name, kind=kind, attributes=attributes or {})
+
+    @contextlib.contextmanager
+    def _record(
+        self, name: str, kind: SpanKinds, attributes: dict[str, AttributeValue]
+    ) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent.span_id if parent is not None else None,
+            start_time_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_time_ns = time.time_ns()
+            _current_span.reset(token)
+            if len(self._finished) == self._finished.maxlen:
+                self.dropped += 1
+            self._finished.append(span)
+
+    def start(self, exporter: SpanExporter, service_name: str) -> None:
+        """Start recording spans and exporting them in the background."""
+        self._exporter = exporter
+        self._service_name = service_name
+        self._task = asyncio.create_task(self._export_loop(), name="span-exporter")
+
+    async def stop(self) -> None:
+        """Stop recording, export what is left and close the exporter."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        if self._exporter is not None:
+            await self._exporter.aclose()
+            self._exporter = None
+
+    async def flush(self) -> None:
+        """Export every finished span."""
+        while self._exporter is not None and len(self._finished) > 0:
+            batch = [
+                self._finished.popleft()
+                for _ in range(min(self._max_batch_size, len(self._finished)))
+            ]
+            try:
+                await self._exporter.export(
+                    service_name=self._service_name, spans=batch
+                )
+            except Exception:
+                logger.exception("Unable to export {count} spans", count=len(batch))
+                return
+
+    async def _export_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._export_interval)
+            await self.flush()
+
+
+tracer = Tracer()
+
+
+def span(
+    name: str,
+    kind: SpanKinds = "internal",
+    attributes: dict[str, AttributeValue] | None = None,
+) -> AbstractContextManager[Span | None]:
+    """Record block as a span on the process tracer."""
+    return tracer.span(name=name, kind=kind, attributes=attributes)
+
+
+def instrument_commands() -> None:
+    """
+    Record a span for every command run through `lego_workflows`.
+
+    Handlers run nested commands with `lego_workflows.run_and_collect_events`
+    looked up on the module, so wrapping it there covers every hop.
+    """
+    import lego_workflows
+
+    run_and_collect_events = lego_workflows.run_and_collect_events
+    if getattr(run_and_collect_events, "__traced__", False):
+        return
+
+    @functools.wraps(run_and_collect_events)
+    async def traced(cmd: Any) -> Any:  # noqa: ANN401
+        module = type(cmd).__module__.removeprefix("customer_engine_api.handlers.")
+        attributes: dict[str, AttributeValue] = {"command": module}
+        if isinstance(org_code := getattr(cmd, "org_code", None), str):
+            attributes["org_code"] = org_code
+        with tracer.span(name=module, attributes=attributes):
+            return await run_and_collect_events(cmd)
+
+    traced.__traced__ = True  # type: ignore[attr-defined]
+    lego_workflows.run_and_collect_events = traced
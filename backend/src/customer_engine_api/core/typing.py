@@ -8,3 +8,11 @@ Environment: TypeAlias = Literal["staging", "development"]
 Json: TypeAlias = dict[str, Any]
 JsonResponse: TypeAlias = Json | list[Json]
 EmbeddingModels: TypeAlias = Literal["cohere:embed-multilingual-light-v3.0"]
+WebhookModes: TypeAlias = Literal["queue", "inline"]
+EmbeddingInputTypes: TypeAlias = Literal["search_document", "search_query"]
+ImportFormats: TypeAlias = Literal["csv", "jsonl"]
+LogFormats: TypeAlias = Literal["text", "json"]
+RetrievalModes: TypeAlias = Literal["hybrid", "vector", "lexical"]
+MediaTypes: TypeAlias = Literal["image", "audio", "video", "document", "sticker"]
+MessageStatuses: TypeAlias = Literal["sent", "delivered", "read", "failed"]
+InteractiveReplyTypes: TypeAlias = Literal["button_reply", "list_reply"]
@@ -1,60 +1,271 @@
+"""
+Whatsapp webhook payloads.
+
+Request bodies are parsed once with orjson and walked into small typed
+structs. Every step checks the shape it expects instead of indexing and
+catching, so unknown or malformed parts are counted as rejected and skipped
+without raising.
+"""
+
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, final
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TypeVar, final, get_args
+
+import orjson
 
-from lego_workflows.components import DomainError
+from customer_engine_api.core.typing import (
+    InteractiveReplyTypes,
+    MediaTypes,
+    MessageStatuses,
+)
 
 if TYPE_CHECKING:
     from customer_engine_api.core.typing import Json, JsonResponse
 
 
-class NotIdentifiedWhatsappPayloadError(DomainError):
-    def __init__(self) -> None:
-        super().__init__("An undentified whatsapp payloads has been received")
+_L = TypeVar("_L", bound=str)
 
 
 @final
-@dataclass(frozen=True)
-class _CommonInfo:
+@dataclass(frozen=True, slots=True)
+class TextMessage:
+    text: str
     phone_number_id: str
+    wa_id: str
 
 
 @final
-@dataclass(frozen=True)
-class TextMessage:
-    text: str
+@dataclass(frozen=True, slots=True)
+class MediaMessage:
+    media_type: MediaTypes
+    media_id: str
+    mime_type: str | None
+    caption: str | None
     phone_number_id: str
     wa_id: str
 
 
-def _process_common_and_get_specific_payload(
-    payload: Json,
-) -> tuple[_CommonInfo, JsonResponse]:
-    value: Json = payload["entry"][0]["changes"][0].pop("value")
-    value.pop("messaging_product")
-    metadata: Json = value.pop("metadata")
-    return (_CommonInfo(phone_number_id=metadata["phone_number_id"]), value)
+@final
+@dataclass(frozen=True, slots=True)
+class InteractiveReply:
+    reply_type: InteractiveReplyTypes
+    reply_id: str
+    title: str
+    phone_number_id: str
+    wa_id: str
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class StatusUpdate:
+    message_id: str
+    status: MessageStatuses
+    recipient_id: str
+    phone_number_id: str
+
+
+@final
+@dataclass(slots=True)
+class Delivery:
+    """
+    Messages and status updates sent in one webhook request.
+
+    `rejected` counts the messages, statuses and containers of an unknown or
+    malformed shape that were skipped.
+    """
+
+    messages: list[TextMessage] = field(default_factory=list)
+    media: list[MediaMessage] = field(default_factory=list)
+    interactive: list[InteractiveReply] = field(default_factory=list)
+    statuses: list[StatusUpdate] = field(default_factory=list)
+    rejected: int = 0
+
+    @property
+    def status_only(self) -> bool:
+        """Whether the delivery only reports sent, delivered or read statuses."""
+        return (
+            len(self.messages) == 0
+            and len(self.media) == 0
+            and len(self.interactive) == 0
+            and len(self.statuses) > 0
+        )
+
+
+_MEDIA_TYPES: dict[str, MediaTypes] = {t: t for t in get_args(MediaTypes)}
+_STATUSES: dict[str, MessageStatuses] = {s: s for s in get_args(MessageStatuses)}
+_INTERACTIVE_REPLY_TYPES: dict[str, InteractiveReplyTypes] = {
+    t: t for t in get_args(InteractiveReplyTypes)
+}
+
+
+def _optional_str(value: object) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def _lookup(known: dict[str, _L], value: object) -> _L | None:
+    return known.get(value) if isinstance(value, str) else None
+
 
+def _read_message(
+    delivery: Delivery, message: Json, phone_number_id: str, wa_id: object
+) -> None:
+    wa_id = message.get("from", wa_id)
+    message_type = message.get("type", "text")
+    content = message.get(message_type) if isinstance(message_type, str) else None
+    if not isinstance(wa_id, str) or not isinstance(content, dict):
+        delivery.rejected += 1
+    elif message_type == "text":
+        body = content.get("body")
+        if isinstance(body, str):
+            delivery.messages.append(
+                TextMessage(text=body, phone_number_id=phone_number_id, wa_id=wa_id)
+            )
+        else:
+            delivery.rejected += 1
+    elif message_type == "interactive":
+        _read_interactive_reply(
+            delivery=delivery,
+            content=content,
+            phone_number_id=phone_number_id,
+            wa_id=wa_id,
+        )
+    elif (media_type := _lookup(_MEDIA_TYPES, message_type)) is not None:
+        media_id = content.get("id")
+        if isinstance(media_id, str):
+            delivery.media.append(
+                MediaMessage(
+                    media_type=media_type,
+                    media_id=media_id,
+                    mime_type=_optional_str(content.get("mime_type")),
+                    caption=_optional_str(content.get("caption")),
+                    phone_number_id=phone_number_id,
+                    wa_id=wa_id,
+                )
+            )
+        else:
+            delivery.rejected += 1
+    else:
+        delivery.rejected += 1
 
-def identify_payload(
-    payload: JsonResponse,
-) -> TextMessage:
-    if isinstance(payload, list):
-        raise NotIdentifiedWhatsappPayloadError
 
-    common_info, specific_payload = _process_common_and_get_specific_payload(
-        payload=payload
+def _read_interactive_reply(
+    delivery: Delivery, content: Json, phone_number_id: str, wa_id: str
+) -> None:
+    reply_type = _lookup(_INTERACTIVE_REPLY_TYPES, content.get("type"))
+    reply = content.get(reply_type) if reply_type is not None else None
+    if reply_type is None or not isinstance(reply, dict):
+        delivery.rejected += 1
+        return
+    reply_id, title = reply.get("id"), reply.get("title")
+    if not isinstance(reply_id, str) or not isinstance(title, str):
+        delivery.rejected += 1
+        return
+    delivery.interactive.append(
+        InteractiveReply(
+            reply_type=reply_type,
+            reply_id=reply_id,
+            title=title,
+            phone_number_id=phone_number_id,
+            wa_id=wa_id,
+        )
     )
-    if isinstance(specific_payload, list):
-        raise NotIdentifiedWhatsappPayloadError
 
-    try:
-        return TextMessage(
-            text=specific_payload["messages"][0]["text"]["body"],
-            wa_id=specific_payload["contacts"][0]["wa_id"],
-            phone_number_id=common_info.phone_number_id,
+
+def _read_status(delivery: Delivery, status: Json, phone_number_id: str) -> None:
+    message_id, recipient_id = status.get("id"), status.get("recipient_id")
+    value = _lookup(_STATUSES, status.get("status"))
+    if (
+        value is None
+        or not isinstance(message_id, str)
+        or not isinstance(recipient_id, str)
+    ):
+        delivery.rejected += 1
+        return
+    delivery.statuses.append(
+        StatusUpdate(
+            message_id=message_id,
+            status=value,
+            recipient_id=recipient_id,
+            phone_number_id=phone_number_id,
         )
+    )
+
+
+def _read_change(delivery: Delivery, value: Json) -> None:
+    metadata = value.get("metadata")
+    phone_number_id = (
+        metadata.get("phone_number_id") if isinstance(metadata, dict) else None
+    )
+    messages = value.get("messages", [])
+    statuses = value.get("statuses", [])
+    if not isinstance(messages, list):
+        messages = []
+        delivery.rejected += 1
+    if not isinstance(statuses, list):
+        statuses = []
+        delivery.rejected += 1
+    if not isinstance(phone_number_id, str):
+        delivery.rejected += len(messages) + len(statuses)
+        return
+
+    contacts = value.get("contacts")
+    contact = contacts[0] if isinstance(contacts, list) and len(contacts) > 0 else None
+    wa_id = contact.get("wa_id") if isinstance(contact, dict) else None
+    for message in messages:
+        if isinstance(message, dict):
+            _read_message(
+                delivery=delivery,
+                message=message,
+                phone_number_id=phone_number_id,
+                wa_id=wa_id,
+            )
+        else:
+            delivery.rejected += 1
+    for status in statuses:
+        if isinstance(status, dict):
+            _read_status(
+                delivery=delivery, status=status, phone_number_id=phone_number_id
+            )
+        else:
+            delivery.rejected += 1
+
+
+def read_delivery(payload: object) -> Delivery:
+    """Every message and status of every entry and change, malformed parts skipped."""
+    delivery = Delivery()
+    entries = payload.get("entry") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        delivery.rejected += 1
+        entries = []
+
+    for entry in entries:
+        changes = entry.get("changes") if isinstance(entry, dict) else None
+        if not isinstance(changes, list):
+            delivery.rejected += 1
+            continue
+        for change in changes:
+            value = change.get("value") if isinstance(change, dict) else None
+            if isinstance(value, dict):
+                _read_change(delivery=delivery, value=value)
+            else:
+                delivery.rejected += 1
+
+    return delivery
+
+
+def loads(body: bytes) -> JsonResponse | None:
+    """Parse a raw request body, `None` when it is not a JSON object or array."""
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict | list) else None
+
 
-    except Exception as e:  # noqa: BLE001
-        raise NotIdentifiedWhatsappPayloadError from e
+def decode_delivery(body: bytes) -> Delivery | None:
+    """Delivery of a raw request body, `None` when it is not JSON."""
+    payload = loads(body=body)
+    if payload is None:
+        return None
+    return read_delivery(payload=payload)
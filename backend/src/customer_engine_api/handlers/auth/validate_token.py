@@ -13,6 +13,7 @@ from lego_workflows.components import (
 )
 
 from customer_engine_api.core import jwt
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 
 if TYPE_CHECKING:
@@ -28,6 +29,13 @@ class TokenExpiredError(DomainError):
         super().__init__("Token expired.")
 
 
+class InvalidTokenError(DomainError):
+    """Raised when token signature or claims can't be verified."""
+
+    def __init__(self) -> None:
+        super().__init__("Invalid token.")
+
+
 @dataclass(frozen=True)
 class TokenValidated(DomainEvent):
     org_code: str
@@ -46,10 +54,22 @@ class Command(CommandComponent[Response]):
     token: HTTPAuthorizationCredentials
     current_time: datetime.datetime
 
+    async def _decode(self) -> jwt.KindeToken:
+        encoded_token = self.token.credentials
+        if resources.jwks is None:
+            return jwt.KindeToken.from_enconded_token(encoded_token=encoded_token)
+
+        try:
+            return await resources.jwks.decode(encoded_token=encoded_token)
+        except jwt.TokenVerificationError as e:
+            raise InvalidTokenError from e
+
     async def run(self, events: list[DomainEvent]) -> Response:
-        decoded_token = jwt.KindeToken.from_enconded_token(
-            encoded_token=self.token.credentials
-        )
+        decoded_token = resources.caches.tokens.get(self.token.credentials)
+        if decoded_token is None:
+            decoded_token = await self._decode()
+            resources.caches.tokens.set(self.token.credentials, decoded_token)
+
         if decoded_token.is_expired(current_time=self.current_time):
             raise TokenExpiredError
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from customer_engine_api.handlers.automatic_responses import (
+    backfill_vector_index,
     create_auto_resp,
     create_example,
     delete_auto_res,
@@ -12,14 +13,18 @@ from customer_engine_api.handlers.automatic_responses import (
     get_auto_res_owns_example,
     get_bulk_examples,
     get_example,
+    import_rows,
     list_auto_res,
     list_examples,
+    list_keywords,
+    set_keywords,
     similar_examples_by_prompt,
     update_auto_res,
     update_example,
 )
 
 __all__ = [
+    "backfill_vector_index",
     "create_auto_resp",
     "create_example",
     "delete_auto_res",
@@ -29,8 +34,11 @@ __all__ = [
     "get_auto_res_owns_example",
     "get_bulk_examples",
     "get_example",
+    "import_rows",
     "list_auto_res",
     "list_examples",
+    "list_keywords",
+    "set_keywords",
     "similar_examples_by_prompt",
     "update_auto_res",
     "update_example",
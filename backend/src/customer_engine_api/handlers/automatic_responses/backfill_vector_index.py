@@ -0,0 +1,105 @@
+"""Backfill vector index with every example of an organization."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import lego_workflows
+import sqlalchemy
+from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.core import automatic_responses
+from customer_engine_api.core.config import resources
+from customer_engine_api.core.logging import logger
+from customer_engine_api.handlers.automatic_responses import create_qdrant_collection
+from customer_engine_api.handlers.org_settings import get_or_default
+
+if TYPE_CHECKING:
+    import cohere
+    from qdrant_client import AsyncQdrantClient
+
+    from customer_engine_api.core.db import AsyncConnection
+
+
+@dataclass(frozen=True)
+class VectorIndexBackfilled(DomainEvent):
+    org_code: str
+    examples: int
+
+    async def publish(self) -> None:
+        logger.info(
+            "Vector index of org {org_code} backfilled with {examples} examples",
+            org_code=self.org_code,
+            examples=self.examples,
+        )
+
+
+@dataclass(frozen=True)
+class Response(ResponseComponent):
+    examples: int
+
+
+@dataclass(frozen=True)
+class Command(CommandComponent[Response]):
+    """
+    Embed and upsert every stored example, e.g. after switching indexes.
+
+    Upserts are idempotent, so it can be rerun on organizations already
+    indexed.
+    """
+
+    org_code: str
+    qdrant_client: AsyncQdrantClient
+    cohere_client: cohere.AsyncClient
+    sql_conn: AsyncConnection
+    embedding_concurrency: int = 1
+
+    async def run(self, events: list[DomainEvent]) -> Response:
+        stmt = text(
+            """
+            SELECT
+                example_id,
+                example
+            FROM automatic_response_examples
+            WHERE org_code = :org_code
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
+        )
+        rows = (await self.sql_conn.execute(stmt)).all()
+
+        embedding_model_to_use = (
+            await lego_workflows.run_and_collect_events(
+                cmd=get_or_default.Command(
+                    org_code=self.org_code, sql_conn=self.sql_conn
+                )
+            )
+        )[0].settings.embeddings_model
+        (
+            _,
+            create_qdrant_collection_events,
+        ) = await lego_workflows.run_and_collect_events(
+            cmd=create_qdrant_collection.Command(
+                org_code=self.org_code,
+                qdrant_client=self.qdrant_client,
+                embedding_model=embedding_model_to_use,
+            )
+        )
+        events.extend(create_qdrant_collection_events)
+
+        await automatic_responses.embeddings.upsert_examples(
+            embedding_model=embedding_model_to_use,
+            vector_index=resources.get_vector_index(qdrant_client=self.qdrant_client),
+            cohere_client=self.cohere_client,
+            example_ids=[UUID(row.example_id) for row in rows],
+            examples=[row.example for row in rows],
+            org_code=self.org_code,
+            cache=resources.embedding_cache,
+            batcher=resources.embedding_batcher,
+            max_concurrency=self.embedding_concurrency,
+        )
+        events.append(VectorIndexBackfilled(org_code=self.org_code, examples=len(rows)))
+        return Response(examples=len(rows))
@@ -15,6 +15,7 @@ from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.automatic_responses import (
     create_example,
     get_auto_res,
+    set_keywords,
 )
 
 if TYPE_CHECKING:
@@ -22,7 +23,8 @@ if TYPE_CHECKING:
 
     import cohere
     from qdrant_client import AsyncQdrantClient
-    from sqlalchemy import Connection
+
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
@@ -57,7 +59,8 @@ class Command(CommandComponent[Response]):
     examples: list[str] | None
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
-    sql_conn: Connection
+    sql_conn: AsyncConnection
+    keywords: list[str] | None = None
 
     async def run(self, events: list[DomainEvent]) -> Response:
         """Command execution."""
@@ -98,7 +101,7 @@ class Command(CommandComponent[Response]):
             bindparam(key="response", value=self.response, type_=sqlalchemy.String()),
         )
 
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
 
         events.append(
             AutomaticResponseCreated(
@@ -121,4 +124,15 @@ class Command(CommandComponent[Response]):
             )
             events.extend(examples_created_events)
 
+        if self.keywords is not None:
+            _, keywords_set_events = await lego_workflows.run_and_collect_events(
+                set_keywords.Command(
+                    org_code=self.org_code,
+                    automatic_response_id=random_id,
+                    keywords=self.keywords,
+                    sql_conn=self.sql_conn,
+                )
+            )
+            events.extend(keywords_set_events)
+
         return Response(automatic_response_id=random_id)
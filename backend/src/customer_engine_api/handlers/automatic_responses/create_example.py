@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from uuid import uuid4
@@ -9,14 +10,14 @@ from uuid import uuid4
 import lego_workflows
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
-from customer_engine_api.core import automatic_responses
+from customer_engine_api.core import automatic_responses, event_bus, metrics
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.automatic_responses import (
     create_qdrant_collection,
     get_auto_res,
-    get_example,
 )
 from customer_engine_api.handlers.org_settings import get_or_default
 
@@ -26,9 +27,17 @@ if TYPE_CHECKING:
     import cohere
     from qdrant_client import AsyncQdrantClient
 
+    from customer_engine_api.core.db import AsyncConnection
+    from customer_engine_api.core.typing import EmbeddingModels
+
+_timer = metrics.StageTimer(
+    command="create_example",
+    stages=("insert", "org_settings", "ensure_collection", "embed_upsert"),
+)
+
 
 @dataclass(frozen=True)
-class ExampleCreated(DomainEvent):
+class ExampleCreated(DomainEvent, event_bus.BatchedEvent):
     org_code: str
     example_id: UUID
 
@@ -39,6 +48,14 @@ class ExampleCreated(DomainEvent):
             org_code=self.org_code,
         )
 
+    @classmethod
+    async def publish_batch(cls, events: list[ExampleCreated]) -> None:
+        logger.info(
+            "{count} new examples created on org {org_code}",
+            count=len(events),
+            org_code=events[0].org_code,
+        )
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
@@ -52,23 +69,10 @@ class Command(CommandComponent[Response]):
     automatic_response_id: UUID
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
-    sql_conn: Connection
-
-    async def _create_example(self, events: list[DomainEvent], example: str) -> UUID:
-        while True:
-            example_id = uuid4()
-            try:
-                await lego_workflows.run_and_collect_events(
-                    get_example.Command(
-                        org_code=self.org_code,
-                        example_id=example_id,
-                        sql_conn=self.sql_conn,
-                        automatic_response_id=self.automatic_response_id,
-                    )
-                )
-            except get_example.ExampleNotFoundError:
-                break
+    sql_conn: AsyncConnection
+    embedding_concurrency: int = 1
 
+    async def _insert_examples(self) -> list[UUID]:
         stmt = text(
             """
                 INSERT INTO automatic_response_examples (
@@ -84,26 +88,25 @@ class Command(CommandComponent[Response]):
                 )
                 """
         ).bindparams(
-            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
-            bindparam(
-                key="automatic_response_id",
-                value=self.automatic_response_id,
-                type_=sqlalchemy.UUID(),
-            ),
-            bindparam(key="example_id", value=example_id, type_=sqlalchemy.UUID()),
-            bindparam(key="example", value=example, type_=sqlalchemy.String()),
+            bindparam(key="org_code", type_=sqlalchemy.String()),
+            bindparam(key="automatic_response_id", type_=sqlalchemy.UUID()),
+            bindparam(key="example_id", type_=sqlalchemy.UUID()),
+            bindparam(key="example", type_=sqlalchemy.String()),
         )
-
-        self.sql_conn.execute(stmt)
-
-        events.append(
-            ExampleCreated(
-                org_code=self.org_code,
-                example_id=example_id,
-            )
+        example_ids = [uuid4() for _ in self.examples]
+        await self.sql_conn.execute(
+            stmt,
+            [
+                {
+                    "org_code": self.org_code,
+                    "automatic_response_id": self.automatic_response_id,
+                    "example_id": example_id,
+                    "example": example,
+                }
+                for example_id, example in zip(example_ids, self.examples, strict=True)
+            ],
         )
-
-        return example_id
+        return example_ids
 
     async def run(self, events: list[DomainEvent]) -> Response:
         await lego_workflows.run_and_collect_events(
@@ -113,10 +116,32 @@ class Command(CommandComponent[Response]):
                 sql_conn=self.sql_conn,
             )
         )
-        example_ids: list[UUID] = []
-        for example in self.examples:
-            example_id = await self._create_example(events=events, example=example)
-            example_ids.append(example_id)
+        if len(self.examples) == 0:
+            return Response(example_ids=[])
+
+        with _timer("insert"):
+            example_ids = await self._insert_examples()
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.exact_match.add,
+                org_code=self.org_code,
+                example_ids=example_ids,
+                examples=self.examples,
+                automatic_response_id=self.automatic_response_id,
+            )
+        )
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.lexical_index.add,
+                org_code=self.org_code,
+                example_ids=example_ids,
+                examples=self.examples,
+            )
+        )
+        events.extend(
+            ExampleCreated(org_code=self.org_code, example_id=example_id)
+            for example_id in example_ids
+        )
 
         await self._upsert_example(example_ids=example_ids, events=events)
         return Response(example_ids=example_ids)
@@ -124,17 +149,45 @@ class Command(CommandComponent[Response]):
     async def _upsert_example(
         self, example_ids: list[UUID], events: list[DomainEvent]
     ) -> None:
-        embedding_model_to_use = (
-            await lego_workflows.run_and_collect_events(
-                cmd=get_or_default.Command(
-                    org_code=self.org_code, sql_conn=self.sql_conn
+        with _timer("org_settings"):
+            embedding_model_to_use = (
+                await lego_workflows.run_and_collect_events(
+                    cmd=get_or_default.Command(
+                        org_code=self.org_code, sql_conn=self.sql_conn
+                    )
                 )
+            )[0].settings.embeddings_model
+
+        upsert_examples = functools.partial(
+            automatic_responses.embeddings.upsert_examples,
+            embedding_model=embedding_model_to_use,
+            vector_index=resources.get_vector_index(qdrant_client=self.qdrant_client),
+            cohere_client=self.cohere_client,
+            example_ids=example_ids,
+            examples=self.examples,
+            org_code=self.org_code,
+            cache=resources.embedding_cache,
+            batcher=resources.embedding_batcher,
+            max_concurrency=self.embedding_concurrency,
+        )
+        await self._ensure_collection(
+            embedding_model=embedding_model_to_use, events=events
+        )
+        try:
+            with _timer("embed_upsert"):
+                await upsert_examples()
+        except automatic_responses.vector_index.CollectionNotFoundError:
+            resources.collections.forget(org_code=self.org_code)
+            await self._ensure_collection(
+                embedding_model=embedding_model_to_use, events=events
             )
-        )[0].settings.embeddings_model
+            with _timer("embed_upsert"):
+                await upsert_examples()
 
-        if not (
-            await self.qdrant_client.collection_exists(collection_name=self.org_code)
-        ):
+    async def _ensure_collection(
+        self, embedding_model: EmbeddingModels, events: list[DomainEvent]
+    ) -> None:
+        with _timer("ensure_collection"):
             (
                 _,
                 create_qdrant_collection_events,
@@ -142,16 +195,7 @@ class Command(CommandComponent[Response]):
                 cmd=create_qdrant_collection.Command(
                     org_code=self.org_code,
                     qdrant_client=self.qdrant_client,
-                    embedding_model=embedding_model_to_use,
+                    embedding_model=embedding_model,
                 )
             )
-            events.extend(create_qdrant_collection_events)
-
-        return await automatic_responses.embeddings.upsert_examples(
-            embedding_model=embedding_model_to_use,
-            qdrant_client=self.qdrant_client,
-            cohere_client=self.cohere_client,
-            example_ids=example_ids,
-            examples=self.examples,
-            org_code=self.org_code,
-        )
+        events.extend(create_qdrant_collection_events)
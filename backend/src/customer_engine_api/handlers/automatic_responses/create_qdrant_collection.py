@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING
 
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
 
-from customer_engine_api.core import automatic_responses
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 
 if TYPE_CHECKING:
@@ -40,15 +40,14 @@ class Command(CommandComponent[Response]):
     embedding_model: EmbeddingModels
 
     async def run(self, events: list[DomainEvent]) -> Response:
-        await self.qdrant_client.create_collection(
-            collection_name=self.org_code,
-            vectors_config=automatic_responses.embeddings.qdrant_vector_params_per_model(
-                model=self.embedding_model
-            ),
-        )
-        events.append(
-            QdrantCollectionCreated(
-                org_code=self.org_code, embedding_model=self.embedding_model
+        if await resources.collections.ensure(
+            index=resources.get_vector_index(qdrant_client=self.qdrant_client),
+            org_code=self.org_code,
+            model=self.embedding_model,
+        ):
+            events.append(
+                QdrantCollectionCreated(
+                    org_code=self.org_code, embedding_model=self.embedding_model
+                )
             )
-        )
         return Response()
@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import datetime
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import lego_workflows
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.automatic_responses import (
     delete_bulk_examples,
@@ -22,6 +24,8 @@ if TYPE_CHECKING:
 
     import qdrant_client
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class AutomaticResponseDeleted(DomainEvent):
@@ -48,7 +52,7 @@ class Response(ResponseComponent): ...
 class Command(CommandComponent[Response]):
     org_code: str
     automatic_response_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
     qdrant_client: qdrant_client.AsyncQdrantClient
 
     async def run(self, events: list[DomainEvent]) -> Response:
@@ -67,7 +71,31 @@ class Command(CommandComponent[Response]):
             ),
         )
 
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+
+        keywords_stmt = text(
+            """
+            DELETE FROM automatic_response_keywords
+            WHERE org_code = :org_code
+                AND automatic_response_id = :automatic_response_id
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="automatic_response_id",
+                value=self.automatic_response_id,
+                type_=sqlalchemy.UUID(),
+            ),
+        )
+        await self.sql_conn.execute(keywords_stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.keyword_rules.set,
+                org_code=self.org_code,
+                automatic_response_id=self.automatic_response_id,
+                keywords=[],
+            )
+        )
 
         automatic_response_examples, _ = await lego_workflows.run_and_collect_events(
             list_examples.Command(
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -11,9 +12,10 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from qdrant_client.http.models import ExtendedPointId, PointIdsList
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import event_bus
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 
 if TYPE_CHECKING:
@@ -21,9 +23,11 @@ if TYPE_CHECKING:
 
     import qdrant_client
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
-class ExampleDeleted(DomainEvent):
+class ExampleDeleted(DomainEvent, event_bus.BatchedEvent):
     org_code: str
     example_id: UUID
 
@@ -34,6 +38,14 @@ class ExampleDeleted(DomainEvent):
             org_code=self.org_code,
         )
 
+    @classmethod
+    async def publish_batch(cls, events: list[ExampleDeleted]) -> None:
+        logger.info(
+            "{count} examples from org {org_code} deleted.",
+            count=len(events),
+            org_code=events[0].org_code,
+        )
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent): ...
@@ -43,13 +55,10 @@ class Response(ResponseComponent): ...
 class Command(CommandComponent[Response]):
     org_code: str
     example_ids: list[UUID]
-    sql_conn: Connection
+    sql_conn: AsyncConnection
     qdrant_client: qdrant_client.AsyncQdrantClient
 
     async def run(self, events: list[DomainEvent]) -> Response:
-        ids_to_delete: list[ExtendedPointId] = [
-            example_id.hex for example_id in self.example_ids
-        ]
         stmt = text(
             """
             DELETE FROM automatic_response_examples
@@ -60,19 +69,31 @@ class Command(CommandComponent[Response]):
             bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
             bindparam(
                 key="example_ids",
-                value=ids_to_delete,
+                value=[example_id.hex for example_id in self.example_ids],
                 type_=sqlalchemy.ARRAY(sqlalchemy.UUID()),
                 expanding=True,
             ),
         )
 
-        self.sql_conn.execute(stmt)
-
-        if len(ids_to_delete) > 0:
-            await self.qdrant_client.delete(
-                collection_name=self.org_code,
-                points_selector=PointIdsList(points=ids_to_delete),
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.exact_match.remove,
+                org_code=self.org_code,
+                example_ids=self.example_ids,
             )
+        )
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.lexical_index.remove,
+                org_code=self.org_code,
+                example_ids=self.example_ids,
+            )
+        )
+
+        await resources.get_vector_index(qdrant_client=self.qdrant_client).delete(
+            org_code=self.org_code, ids=self.example_ids
+        )
 
         events.extend(
             ExampleDeleted(
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -12,9 +13,9 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from qdrant_client.http.models import PointIdsList
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.automatic_responses import get_auto_res
 
@@ -23,6 +24,8 @@ if TYPE_CHECKING:
 
     from qdrant_client import AsyncQdrantClient
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class ExampleDeleted(DomainEvent):
@@ -46,7 +49,7 @@ class Command(CommandComponent[Response]):
     org_code: str
     automatic_response_id: UUID
     example_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
     qdrant_client: AsyncQdrantClient
 
     async def run(self, events: list[DomainEvent]) -> Response:
@@ -68,11 +71,24 @@ class Command(CommandComponent[Response]):
             bindparam(key="example_id", value=self.example_id, type_=sqlalchemy.UUID()),
         )
 
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.exact_match.remove,
+                org_code=self.org_code,
+                example_ids=[self.example_id],
+            )
+        )
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.lexical_index.remove,
+                org_code=self.org_code,
+                example_ids=[self.example_id],
+            )
+        )
 
-        await self.qdrant_client.delete(
-            collection_name=self.org_code,
-            points_selector=PointIdsList(points=[self.example_id.hex]),
+        await resources.get_vector_index(qdrant_client=self.qdrant_client).delete(
+            org_code=self.org_code, ids=[self.example_id]
         )
         events.append(
             ExampleDeleted(
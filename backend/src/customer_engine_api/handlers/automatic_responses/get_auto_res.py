@@ -12,13 +12,15 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.automatic_responses import AutomaticResponse
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 class AutomaticResponseNotFoundError(DomainError):
     """Raised when automatic response does not exists in database."""
@@ -40,7 +42,7 @@ class Response(ResponseComponent):
 class Command(CommandComponent[Response]):
     org_code: str
     automatic_response_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         stmt = text(
@@ -63,7 +65,7 @@ class Command(CommandComponent[Response]):
             ),
         )
 
-        automatic_response_row = self.sql_conn.execute(stmt).fetchone()
+        automatic_response_row = (await self.sql_conn.execute(stmt)).fetchone()
         if automatic_response_row is None:
             raise AutomaticResponseNotFoundError(
                 org_code=self.org_code, automatic_response_id=self.automatic_response_id
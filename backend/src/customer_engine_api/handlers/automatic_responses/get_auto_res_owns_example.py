@@ -1,18 +1,22 @@
 from __future__ import annotations  # noqa: D100
 
-from collections import Counter
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, assert_never
 from uuid import UUID
 
 import lego_workflows
+import sqlalchemy
 from lego_workflows.components import (
     CommandComponent,
     DomainError,
     DomainEvent,
     ResponseComponent,
 )
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import metrics
+from customer_engine_api.core.config import resources
 from customer_engine_api.handlers.automatic_responses import (
     get_auto_res,
     get_example,
@@ -24,9 +28,13 @@ if TYPE_CHECKING:
 
     import cohere
     from qdrant_client import AsyncQdrantClient
-    from sqlalchemy import Connection
 
+    from customer_engine_api.core import automatic_responses
     from customer_engine_api.core.automatic_responses import AutomaticResponse
+    from customer_engine_api.core.db import AsyncConnection
+
+_exact_matched = metrics.prompts_total.labels(result="exact_matched")
+_keyword_matched = metrics.prompts_total.labels(result="keyword_matched")
 
 
 class UnableToMatchPromptWithAutomaticResponseError(DomainError):
@@ -45,9 +53,85 @@ class Command(CommandComponent[Response]):
     example_id_or_prompt: UUID | str
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
-    sql_conn: Connection
+    sql_conn: AsyncConnection
     current_time: datetime.datetime
 
+    async def _load_examples(
+        self,
+    ) -> list[automatic_responses.exact_match.ExampleRow]:
+        stmt = text(
+            """
+            SELECT
+                example_id,
+                example,
+                automatic_response_id
+            FROM automatic_response_examples
+            WHERE org_code = :org_code
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
+        )
+        return [
+            (UUID(row.example_id), row.example, UUID(row.automatic_response_id))
+            for row in (await self.sql_conn.execute(stmt)).all()
+        ]
+
+    async def _load_keywords(self) -> list[automatic_responses.keywords.KeywordRow]:
+        stmt = text(
+            """
+            SELECT
+                automatic_response_id,
+                keyword
+            FROM automatic_response_keywords
+            WHERE org_code = :org_code
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
+        )
+        return [
+            (UUID(row.automatic_response_id), row.keyword)
+            for row in (await self.sql_conn.execute(stmt)).all()
+        ]
+
+    async def _get_auto_res(
+        self, automatic_response_id: UUID
+    ) -> AutomaticResponse | None:
+        try:
+            return (
+                await lego_workflows.run_and_collect_events(
+                    cmd=get_auto_res.Command(
+                        org_code=self.org_code,
+                        automatic_response_id=automatic_response_id,
+                        sql_conn=self.sql_conn,
+                    )
+                )
+            )[0].automatic_response
+        except get_auto_res.AutomaticResponseNotFoundError:
+            return None
+
+    async def _match_without_embeddings(self, prompt: str) -> AutomaticResponse | None:
+        """Match prompt with example text first, then with keyword rules."""
+        automatic_response_id = await resources.exact_match.lookup(
+            org_code=self.org_code, prompt=prompt, loader=self._load_examples
+        )
+        if automatic_response_id is not None:
+            automatic_response = await self._get_auto_res(automatic_response_id)
+            if automatic_response is not None:
+                _exact_matched.inc()
+                return automatic_response
+            resources.exact_match.forget(org_code=self.org_code)
+
+        automatic_response_id = await resources.keyword_rules.match(
+            org_code=self.org_code, prompt=prompt, loader=self._load_keywords
+        )
+        if automatic_response_id is not None:
+            automatic_response = await self._get_auto_res(automatic_response_id)
+            if automatic_response is not None:
+                _keyword_matched.inc()
+                return automatic_response
+            resources.keyword_rules.forget(org_code=self.org_code)
+        return None
+
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         automatic_response_id: UUID
         match self.example_id_or_prompt:
@@ -65,7 +149,13 @@ class Command(CommandComponent[Response]):
                 automatic_response_id = example.automatic_response_id
 
             case str():
-                examples = (
+                automatic_response = await self._match_without_embeddings(
+                    prompt=self.example_id_or_prompt
+                )
+                if automatic_response is not None:
+                    return Response(automatic_response=automatic_response)
+
+                similar_examples = (
                     await lego_workflows.run_and_collect_events(
                         similar_examples_by_prompt.Command(
                             org_code=self.org_code,
@@ -76,13 +166,16 @@ class Command(CommandComponent[Response]):
                             current_time=self.current_time,
                         )
                     )
-                )[0].examples
-                if len(examples) == 0:
+                )[0]
+                if len(similar_examples.examples) == 0:
                     raise UnableToMatchPromptWithAutomaticResponseError
 
-                automatic_response_id = Counter(
-                    example.automatic_response_id for example in examples
-                ).most_common()[0][0]
+                votes: defaultdict[UUID, float] = defaultdict(float)
+                for example in similar_examples.examples:
+                    votes[example.automatic_response_id] += similar_examples.scores[
+                        example.example_id
+                    ]
+                automatic_response_id = max(votes, key=votes.__getitem__)
 
             case _:
                 assert_never(self.example_id_or_prompt)
@@ -7,13 +7,15 @@ from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core import automatic_responses
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
@@ -24,7 +26,7 @@ class Response(ResponseComponent):
 class Command(CommandComponent[Response]):
     org_code: str
     examples_ids: list[UUID]
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         ids_to_get = (example_id.hex for example_id in self.examples_ids)
@@ -52,6 +54,6 @@ class Command(CommandComponent[Response]):
         return Response(
             examples=[
                 automatic_responses.Example.from_row(row=row)
-                for row in self.sql_conn.execute(stmt).fetchall()
+                for row in (await self.sql_conn.execute(stmt)).fetchall()
             ]
         )
@@ -13,7 +13,7 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.automatic_responses import Example
 from customer_engine_api.handlers.automatic_responses import get_auto_res
@@ -21,6 +21,8 @@ from customer_engine_api.handlers.automatic_responses import get_auto_res
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 class ExampleNotFoundError(DomainError):
     """Raised whan an example does not exists."""
@@ -45,7 +47,7 @@ class Command(CommandComponent[Response]):
     org_code: str
     automatic_response_id: UUID | None
     example_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         if self.automatic_response_id is not None:
@@ -72,7 +74,7 @@ class Command(CommandComponent[Response]):
             bindparam(key="example_id", value=self.example_id, type_=sqlalchemy.UUID()),
         )
 
-        row = self.sql_conn.execute(stmt).one_or_none()
+        row = (await self.sql_conn.execute(stmt)).one_or_none()
         if row is None:
             raise ExampleNotFoundError(
                 org_code=self.org_code,
@@ -0,0 +1,153 @@
+"""Import a batch of automatic responses and examples."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import lego_workflows
+import sqlalchemy
+from lego_workflows.components import (
+    CommandComponent,
+    DomainError,
+    DomainEvent,
+    ResponseComponent,
+)
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.core.automatic_responses import imports
+from customer_engine_api.core.config import resources
+from customer_engine_api.handlers.automatic_responses import (
+    create_auto_resp,
+    create_example,
+)
+
+if TYPE_CHECKING:
+    import cohere
+    from qdrant_client import AsyncQdrantClient
+
+    from customer_engine_api.core.db import AsyncConnection
+
+
+class MissingResponseError(DomainError):
+    """Raised when a new automatic response has no response text."""
+
+    def __init__(self, org_code: str, name: str) -> None:
+        super().__init__(
+            f"Automatic response {name} does not exist for {org_code} and no response was given to create it"
+        )
+
+
+@dataclass(frozen=True)
+class Response(ResponseComponent):
+    automatic_response_ids: list[UUID]
+    example_ids: list[UUID]
+
+
+@dataclass(frozen=True)
+class Command(CommandComponent[Response]):
+    """
+    Examples are attached to the automatic response with the same name.
+
+    Missing automatic responses are created with the first response found for
+    their name in the batch.
+    """
+
+    org_code: str
+    rows: list[imports.ImportRow]
+    qdrant_client: AsyncQdrantClient
+    cohere_client: cohere.AsyncClient
+    sql_conn: AsyncConnection
+    embedding_concurrency: int = 1
+
+    async def _existing_ids(self, names: list[str]) -> dict[str, UUID]:
+        stmt = text(
+            """
+            SELECT name, automatic_response_id
+            FROM automatic_responses
+            WHERE org_code = :org_code AND name IN :names
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="names", value=names, type_=sqlalchemy.String(), expanding=True
+            ),
+        )
+        ids_per_name: dict[str, UUID] = {}
+        for row in (await self.sql_conn.execute(stmt)).all():
+            ids_per_name.setdefault(row.name, UUID(row.automatic_response_id))
+        return ids_per_name
+
+    async def run(self, events: list[DomainEvent]) -> Response:
+        rows_per_name: dict[str, list[imports.ImportRow]] = {}
+        for row in self.rows:
+            rows_per_name.setdefault(row.name, []).append(row)
+        if len(rows_per_name) == 0:
+            return Response(automatic_response_ids=[], example_ids=[])
+
+        ids_per_name = await self._existing_ids(names=list(rows_per_name))
+        created_ids: list[UUID] = []
+        example_ids: list[UUID] = []
+        for name, rows in rows_per_name.items():
+            if name not in ids_per_name:
+                response = next(
+                    (row.response for row in rows if row.response is not None), None
+                )
+                if response is None:
+                    raise MissingResponseError(org_code=self.org_code, name=name)
+
+                created, create_events = await lego_workflows.run_and_collect_events(
+                    cmd=create_auto_resp.Command(
+                        org_code=self.org_code,
+                        name=name,
+                        response=response,
+                        examples=None,
+                        qdrant_client=self.qdrant_client,
+                        cohere_client=self.cohere_client,
+                        sql_conn=self.sql_conn,
+                    )
+                )
+                events.extend(create_events)
+                ids_per_name[name] = created.automatic_response_id
+                created_ids.append(created.automatic_response_id)
+
+            examples, example_events = await lego_workflows.run_and_collect_events(
+                cmd=create_example.Command(
+                    org_code=self.org_code,
+                    examples=[row.example for row in rows],
+                    automatic_response_id=ids_per_name[name],
+                    qdrant_client=self.qdrant_client,
+                    cohere_client=self.cohere_client,
+                    sql_conn=self.sql_conn,
+                    embedding_concurrency=self.embedding_concurrency,
+                )
+            )
+            events.extend(example_events)
+            example_ids.extend(examples.example_ids)
+
+        return Response(automatic_response_ids=created_ids, example_ids=example_ids)
+
+
+async def import_batch(
+    org_code: str, rows: list[imports.ImportRow], embedding_concurrency: int
+) -> imports.ImportProgress:
+    """Import rows in their own transaction."""
+    async with resources.db_engine.begin() as conn:
+        response, events = await lego_workflows.run_and_collect_events(
+            cmd=Command(
+                org_code=org_code,
+                rows=rows,
+                qdrant_client=resources.clients.qdrant,
+                cohere_client=resources.clients.cohere,
+                sql_conn=conn,
+                embedding_concurrency=embedding_concurrency,
+            )
+        )
+
+    resources.event_bus.publish(events=events)
+    return imports.ImportProgress(
+        rows_committed=len(rows),
+        automatic_responses_created=len(response.automatic_response_ids),
+        examples_created=len(response.example_ids),
+    )
@@ -3,42 +3,84 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import pagination
 from customer_engine_api.core.automatic_responses import AutomaticResponse
 
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
     automatic_responses: list[AutomaticResponse]
+    next_cursor: str | None = None
 
 
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
+    """Ordered by ID, all of them unless `limit` is given."""
+
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
+    limit: int | None = None
+    cursor: str | None = None
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        after_cursor = ""
+        params = [
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="limit",
+                value=self.limit + 1 if self.limit is not None else -1,
+                type_=sqlalchemy.Integer(),
+            ),
+        ]
+        if self.cursor is not None:
+            (automatic_response_id,) = pagination.decode_cursor(self.cursor, size=1)
+            try:
+                after = UUID(automatic_response_id)
+            except ValueError as e:
+                raise pagination.InvalidCursorError(cursor=self.cursor) from e
+
+            after_cursor = "AND automatic_response_id > :automatic_response_id"
+            params.append(
+                bindparam(
+                    key="automatic_response_id", value=after, type_=sqlalchemy.UUID()
+                )
+            )
+
         stmt = text(
-            """
+            f"""
             SELECT
                 org_code,
                 automatic_response_id,
                 name,
                 response
             FROM automatic_responses
-            WHERE org_code = :org_code
-            """
-        ).bindparams(
-            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
-        )
+            WHERE org_code = :org_code {after_cursor}
+            ORDER BY automatic_response_id
+            LIMIT :limit
+            """  # noqa: S608
+        ).bindparams(*params)
+
+        automatic_responses = [
+            AutomaticResponse.from_row(row)
+            for row in (await self.sql_conn.execute(statement=stmt)).fetchall()
+        ]
+        if self.limit is None or len(automatic_responses) <= self.limit:
+            return Response(automatic_responses=automatic_responses)
 
+        automatic_responses = automatic_responses[: self.limit]
         return Response(
-            automatic_responses=[
-                AutomaticResponse.from_row(row)
-                for row in self.sql_conn.execute(statement=stmt).fetchall()
-            ]
+            automatic_responses=automatic_responses,
+            next_cursor=pagination.encode_cursor(
+                [automatic_responses[-1].automatic_response_id.hex]
+            ),
         )
@@ -4,31 +4,64 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
+from uuid import UUID
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import pagination
 from customer_engine_api.core.automatic_responses import Example
 
 if TYPE_CHECKING:
-    from uuid import UUID
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
     examples: list[Example]
+    next_cursor: str | None = None
 
 
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
+    """Ordered by ID, all of them unless `limit` is given."""
+
     org_code: str
     automatic_response_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
+    limit: int | None = None
+    cursor: str | None = None
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        after_cursor = ""
+        params = [
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="automatic_response_id",
+                value=self.automatic_response_id,
+                type_=sqlalchemy.UUID(),
+            ),
+            bindparam(
+                key="limit",
+                value=self.limit + 1 if self.limit is not None else -1,
+                type_=sqlalchemy.Integer(),
+            ),
+        ]
+        if self.cursor is not None:
+            (example_id,) = pagination.decode_cursor(self.cursor, size=1)
+            try:
+                after = UUID(example_id)
+            except ValueError as e:
+                raise pagination.InvalidCursorError(cursor=self.cursor) from e
+
+            after_cursor = "AND example_id > :example_id"
+            params.append(
+                bindparam(key="example_id", value=after, type_=sqlalchemy.UUID())
+            )
+
         stmt = text(
-            """
+            f"""
             SELECT
                 org_code,
                 automatic_response_id,
@@ -36,19 +69,21 @@ class Command(CommandComponent[Response]):
                 example
             FROM automatic_response_examples
             WHERE org_code = :org_code
-                AND automatic_response_id = :automatic_response_id
-            """
-        ).bindparams(
-            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
-            bindparam(
-                key="automatic_response_id",
-                value=self.automatic_response_id,
-                type_=sqlalchemy.UUID(),
-            ),
-        )
+                AND automatic_response_id = :automatic_response_id {after_cursor}
+            ORDER BY example_id
+            LIMIT :limit
+            """  # noqa: S608
+        ).bindparams(*params)
+
+        examples = [
+            Example.from_row(row)
+            for row in (await self.sql_conn.execute(stmt)).fetchall()
+        ]
+        if self.limit is None or len(examples) <= self.limit:
+            return Response(examples=examples)
 
+        examples = examples[: self.limit]
         return Response(
-            examples=[
-                Example.from_row(row) for row in self.sql_conn.execute(stmt).fetchall()
-            ]
+            examples=examples,
+            next_cursor=pagination.encode_cursor([examples[-1].example_id.hex]),
         )
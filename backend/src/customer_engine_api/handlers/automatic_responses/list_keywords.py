@@ -0,0 +1,58 @@
+"""List automatic response keywords."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import lego_workflows
+import sqlalchemy
+from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.handlers.automatic_responses import get_auto_res
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from customer_engine_api.core.db import AsyncConnection
+
+
+@dataclass(frozen=True)
+class Response(ResponseComponent):
+    keywords: list[str]
+
+
+@dataclass(frozen=True)
+class Command(CommandComponent[Response]):
+    org_code: str
+    automatic_response_id: UUID
+    sql_conn: AsyncConnection
+
+    async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        await lego_workflows.run_and_collect_events(
+            cmd=get_auto_res.Command(
+                org_code=self.org_code,
+                automatic_response_id=self.automatic_response_id,
+                sql_conn=self.sql_conn,
+            )
+        )
+        stmt = text(
+            """
+            SELECT keyword
+            FROM automatic_response_keywords
+            WHERE org_code = :org_code
+                AND automatic_response_id = :automatic_response_id
+            ORDER BY keyword
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="automatic_response_id",
+                value=self.automatic_response_id,
+                type_=sqlalchemy.UUID(),
+            ),
+        )
+        return Response(
+            keywords=[row.keyword for row in (await self.sql_conn.execute(stmt)).all()]
+        )
@@ -0,0 +1,125 @@
+"""Set automatic response keywords."""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import lego_workflows
+import sqlalchemy
+from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.core import automatic_responses
+from customer_engine_api.core.config import resources
+from customer_engine_api.core.logging import logger
+from customer_engine_api.handlers.automatic_responses import get_auto_res
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from customer_engine_api.core.db import AsyncConnection
+
+
+@dataclass(frozen=True)
+class KeywordsSet(DomainEvent):
+    org_code: str
+    automatic_response_id: UUID
+    keywords: list[str]
+
+    async def publish(self) -> None:
+        logger.info(
+            "Automatic response {automatic_response_id} from org {org_code} now has {count} keywords",
+            automatic_response_id=self.automatic_response_id,
+            org_code=self.org_code,
+            count=len(self.keywords),
+        )
+
+
+@dataclass(frozen=True)
+class Response(ResponseComponent):
+    keywords: list[str]
+
+
+@dataclass(frozen=True)
+class Command(CommandComponent[Response]):
+    """Replace the keywords of an automatic response, folded as matched."""
+
+    org_code: str
+    automatic_response_id: UUID
+    keywords: list[str]
+    sql_conn: AsyncConnection
+
+    async def run(self, events: list[DomainEvent]) -> Response:
+        await lego_workflows.run_and_collect_events(
+            cmd=get_auto_res.Command(
+                org_code=self.org_code,
+                automatic_response_id=self.automatic_response_id,
+                sql_conn=self.sql_conn,
+            )
+        )
+        keywords = automatic_responses.keywords.normalize_keywords(self.keywords)
+
+        delete_stmt = text(
+            """
+            DELETE FROM automatic_response_keywords
+            WHERE org_code = :org_code
+                AND automatic_response_id = :automatic_response_id
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="automatic_response_id",
+                value=self.automatic_response_id,
+                type_=sqlalchemy.UUID(),
+            ),
+        )
+        await self.sql_conn.execute(delete_stmt)
+
+        if len(keywords) > 0:
+            insert_stmt = text(
+                """
+                INSERT INTO automatic_response_keywords (
+                    org_code,
+                    automatic_response_id,
+                    keyword
+                ) VALUES (
+                    :org_code,
+                    :automatic_response_id,
+                    :keyword
+                )
+                """
+            ).bindparams(
+                bindparam(key="org_code", type_=sqlalchemy.String()),
+                bindparam(key="automatic_response_id", type_=sqlalchemy.UUID()),
+                bindparam(key="keyword", type_=sqlalchemy.String()),
+            )
+            await self.sql_conn.execute(
+                insert_stmt,
+                [
+                    {
+                        "org_code": self.org_code,
+                        "automatic_response_id": self.automatic_response_id,
+                        "keyword": keyword,
+                    }
+                    for keyword in keywords
+                ],
+            )
+
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.keyword_rules.set,
+                org_code=self.org_code,
+                automatic_response_id=self.automatic_response_id,
+                keywords=keywords,
+            )
+        )
+        events.append(
+            KeywordsSet(
+                org_code=self.org_code,
+                automatic_response_id=self.automatic_response_id,
+                keywords=keywords,
+            )
+        )
+        return Response(keywords=keywords)
@@ -2,19 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from uuid import UUID
 
 import lego_workflows
+import sqlalchemy
 from lego_workflows.components import (
     CommandComponent,
     DomainEvent,
     ResponseComponent,
 )
-from qdrant_client.models import PointIdsList
+from sqlalchemy import bindparam, text
 
-from customer_engine_api.core import automatic_responses
+from customer_engine_api.core import automatic_responses, metrics
+from customer_engine_api.core.config import resources
+from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.automatic_responses import (
     create_qdrant_collection,
     get_bulk_examples,
@@ -27,14 +31,33 @@ if TYPE_CHECKING:
 
     import cohere
     from qdrant_client import AsyncQdrantClient
-    from sqlalchemy import Connection
 
     from customer_engine_api.core.automatic_responses import Example
+    from customer_engine_api.core.db import AsyncConnection
+    from customer_engine_api.core.typing import EmbeddingModels
+
+_timer = metrics.StageTimer(
+    command="similar_examples_by_prompt",
+    stages=(
+        "lexical_search",
+        "org_settings",
+        "embed",
+        "vector_search",
+        "get_examples",
+        "register_unmatched",
+    ),
+)
+_matched = metrics.prompts_total.labels(result="matched")
+_unmatched = metrics.prompts_total.labels(result="unmatched")
+_embedding_fallbacks = metrics.prompts_total.labels(result="embedding_fallback")
+
+_MAX_EXAMPLES = 10
 
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
     examples: list[Example]
+    scores: dict[UUID, float]
 
 
 @dataclass(frozen=True)
@@ -44,57 +67,58 @@ class Command(CommandComponent[Response]):
     current_time: datetime.datetime
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
-    sql_conn: Connection
-
-    async def _get_similar_points_from_qdrant(
-        self, promp_embeddings: list[float], up_to_n_points: int, score_threshold: float
-    ) -> list[UUID]:
-        similar_points: list[UUID] = []
-        offset = 0
-        points_per_query = up_to_n_points
-        while True:
-            if len(similar_points) >= up_to_n_points:
-                break
-
-            qdrant_similar_points = await self.qdrant_client.search(
-                collection_name=self.org_code,
-                query_vector=promp_embeddings,
-                offset=offset,
-                limit=points_per_query,
-                score_threshold=score_threshold,
-            )
-            if len(qdrant_similar_points) == 0:
-                break
-
-            for qdrant_point in qdrant_similar_points:
-                if isinstance(qdrant_point.id, int):
-                    msg = "Point ID type mismatch"
-                    raise TypeError(msg)
-
-                similar_points.append(UUID(qdrant_point.id))
-
-            offset += points_per_query
-
-        return similar_points[:up_to_n_points]
-
-    async def _register_unmatched_prompt(self, events: list[DomainEvent]) -> Response:
-        (
-            _,
-            register_unmatched_prompt_events,
-        ) = await lego_workflows.run_and_collect_events(
-            register_unmatched_prompt.Command(
-                org_code=self.org_code,
-                prompt=self.prompt,
-                current_time=self.current_time,
-                sql_conn=self.sql_conn,
+    sql_conn: AsyncConnection
+
+    async def _register_unmatched_prompt(
+        self,
+        events: list[DomainEvent],
+        embedding: list[float] | None = None,
+        embedding_model: EmbeddingModels | None = None,
+    ) -> Response:
+        _unmatched.inc()
+        with _timer("register_unmatched"):
+            (
+                _,
+                register_unmatched_prompt_events,
+            ) = await lego_workflows.run_and_collect_events(
+                register_unmatched_prompt.Command(
+                    org_code=self.org_code,
+                    prompt=self.prompt,
+                    current_time=self.current_time,
+                    sql_conn=self.sql_conn,
+                    embedding=embedding,
+                    embedding_model=embedding_model,
+                )
             )
-        )
         events.extend(register_unmatched_prompt_events)
-        return Response(examples=[])
+        return Response(examples=[], scores={})
 
-    async def run(self, events: list[DomainEvent]) -> Response:
+    async def _load_examples(self) -> list[automatic_responses.lexical.ExampleRow]:
+        stmt = text(
+            """
+            SELECT
+                example_id,
+                example
+            FROM automatic_response_examples
+            WHERE org_code = :org_code
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
+        )
+        return [
+            (UUID(row.example_id), row.example)
+            for row in (await self.sql_conn.execute(stmt)).all()
+        ]
+
+    async def _vector_search(
+        self, events: list[DomainEvent], tolerate_embedding_errors: bool
+    ) -> tuple[list[tuple[UUID, float]], list[float] | None, EmbeddingModels | None]:
+        """Scored examples, with the prompt embedding and model when available."""
+        vector_index = resources.get_vector_index(qdrant_client=self.qdrant_client)
         if not (
-            await self.qdrant_client.collection_exists(collection_name=self.org_code)
+            await resources.collections.exists(
+                index=vector_index, org_code=self.org_code
+            )
         ):
             embedding_model_to_use = (
                 await lego_workflows.run_and_collect_events(
@@ -112,57 +136,139 @@ class Command(CommandComponent[Response]):
                 )
             )
             events.extend(events_qdrant_collection)
-            return await self._register_unmatched_prompt(events=events)
+            return [], None, None
 
-        embedding_model_to_use = (
-            await lego_workflows.run_and_collect_events(
-                cmd=get_or_default.Command(
-                    org_code=self.org_code, sql_conn=self.sql_conn
+        with _timer("org_settings"):
+            embedding_model_to_use = (
+                await lego_workflows.run_and_collect_events(
+                    cmd=get_or_default.Command(
+                        org_code=self.org_code, sql_conn=self.sql_conn
+                    )
                 )
-            )
-        )[0].settings.embeddings_model
+            )[0].settings.embeddings_model
 
-        prompt_embeddings = (
-            await automatic_responses.embeddings.embed_prompt_or_examples(
-                client=self.cohere_client,
-                model=embedding_model_to_use,
-                prompt_or_examples=self.prompt,
-            )
+        embed = automatic_responses.embeddings.embed_prompt_or_examples(
+            client=self.cohere_client,
+            model=embedding_model_to_use,
+            prompt_or_examples=self.prompt,
+            cache=resources.embedding_cache,
+            batcher=resources.embedding_batcher,
         )
+        with _timer("embed"):
+            if not tolerate_embedding_errors:
+                prompt_embeddings = await embed
+            else:
+                try:
+                    async with asyncio.timeout(resources.retrieval.embed_timeout):
+                        prompt_embeddings = await embed
+                except Exception:
+                    logger.exception(
+                        "Unable to embed prompt on org {org_code}, "
+                        "searching examples lexically",
+                        org_code=self.org_code,
+                    )
+                    _embedding_fallbacks.inc()
+                    return [], None, None
 
-        similar_points = await self._get_similar_points_from_qdrant(
-            promp_embeddings=prompt_embeddings[0],
-            up_to_n_points=10,
-            score_threshold=0.80,
-        )
+        try:
+            with _timer("vector_search"):
+                scored_points = await vector_index.search(
+                    org_code=self.org_code,
+                    vector=prompt_embeddings[0],
+                    limit=_MAX_EXAMPLES,
+                    score_threshold=0.80,
+                )
+        except automatic_responses.vector_index.CollectionNotFoundError:
+            resources.collections.forget(org_code=self.org_code)
+            return [], prompt_embeddings[0], embedding_model_to_use
 
-        if len(similar_points) == 0:
-            return await self._register_unmatched_prompt(events=events)
+        return (
+            [(point.id, point.score) for point in scored_points],
+            prompt_embeddings[0],
+            embedding_model_to_use,
+        )
 
-        examples = (
-            await lego_workflows.run_and_collect_events(
-                get_bulk_examples.Command(
+    async def run(self, events: list[DomainEvent]) -> Response:
+        mode = resources.retrieval.mode
+        lexical_ranking: list[tuple[UUID, float]] = []
+        if mode != "vector":
+            with _timer("lexical_search"):
+                lexical_ranking = await resources.lexical_index.search(
                     org_code=self.org_code,
-                    examples_ids=similar_points,
-                    sql_conn=self.sql_conn,
+                    prompt=self.prompt,
+                    loader=self._load_examples,
+                    limit=_MAX_EXAMPLES,
+                    min_score=resources.retrieval.lexical_min_score,
                 )
+
+        vector_ranking: list[tuple[UUID, float]] = []
+        embedding: list[float] | None = None
+        embedding_model: EmbeddingModels | None = None
+        if mode != "lexical":
+            vector_ranking, embedding, embedding_model = await self._vector_search(
+                events=events, tolerate_embedding_errors=mode == "hybrid"
             )
-        )[0].examples
+
+        scores: dict[UUID, float]
+        if mode == "hybrid":
+            vector_ids = [example_id for example_id, _ in vector_ranking]
+            # Fusion only looks at ranks, lexical hits the vector search missed
+            # must cover most of the prompt on their own.
+            scores = automatic_responses.lexical.reciprocal_rank_fusion(
+                rankings=[
+                    vector_ids,
+                    [
+                        example_id
+                        for example_id, score in lexical_ranking
+                        if example_id in vector_ids
+                        or score >= resources.retrieval.lexical_only_min_score
+                    ],
+                ]
+            )
+        else:
+            scores = dict(vector_ranking or lexical_ranking)
+        similar_points = sorted(scores, key=scores.__getitem__, reverse=True)[
+            :_MAX_EXAMPLES
+        ]
+
+        if len(similar_points) == 0:
+            return await self._register_unmatched_prompt(
+                events=events, embedding=embedding, embedding_model=embedding_model
+            )
+
+        with _timer("get_examples"):
+            examples = (
+                await lego_workflows.run_and_collect_events(
+                    get_bulk_examples.Command(
+                        org_code=self.org_code,
+                        examples_ids=similar_points,
+                        sql_conn=self.sql_conn,
+                    )
+                )
+            )[0].examples
 
         if len(examples) != len(similar_points):
-            await self.qdrant_client.delete(
-                collection_name=self.org_code,
-                points_selector=PointIdsList(
-                    points=[
-                        point_id.hex
-                        for point_id in set(similar_points).difference(
-                            {example.example_id for example in examples}
-                        )
-                    ]
-                ),
+            missing = list(
+                set(similar_points).difference(
+                    {example.example_id for example in examples}
+                )
+            )
+            await resources.get_vector_index(qdrant_client=self.qdrant_client).delete(
+                org_code=self.org_code, ids=missing
             )
+            resources.lexical_index.remove(org_code=self.org_code, example_ids=missing)
 
         if len(examples) == 0:
-            return await self._register_unmatched_prompt(events=events)
+            return await self._register_unmatched_prompt(
+                events=events, embedding=embedding, embedding_model=embedding_model
+            )
 
-        return Response(examples=examples)
+        _matched.inc()
+        return Response(
+            examples=sorted(
+                examples, key=lambda example: scores[example.example_id], reverse=True
+            ),
+            scores={
+                example.example_id: scores[example.example_id] for example in examples
+            },
+        )
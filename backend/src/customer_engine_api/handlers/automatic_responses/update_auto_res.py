@@ -15,9 +15,8 @@ from customer_engine_api.handlers.automatic_responses import get_auto_res
 if TYPE_CHECKING:
     from uuid import UUID
 
-    from sqlalchemy import Connection
-
     from customer_engine_api.core import automatic_responses
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
@@ -31,7 +30,7 @@ class Command(CommandComponent[Response]):
     automatic_response_id: UUID
     new_name: str | None
     new_response: str | None
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         existing_automatic_response: get_auto_res.AutomaticResponse = (
@@ -80,7 +79,7 @@ class Command(CommandComponent[Response]):
                 type_=sqlalchemy.String(),
             ),
         )
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
 
         return Response(
             updated_automatic_response=existing_automatic_response,
@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import lego_workflows
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core import automatic_responses
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.automatic_responses import get_example
 from customer_engine_api.handlers.org_settings import get_or_default
@@ -22,6 +24,7 @@ if TYPE_CHECKING:
     from qdrant_client import AsyncQdrantClient
 
     from customer_engine_api.core.automatic_responses import Example
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
@@ -48,7 +51,7 @@ class Command(CommandComponent[Response]):
     automatic_response_id: UUID
     example_id: UUID
     example: str | None
-    sql_conn: Connection
+    sql_conn: AsyncConnection
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
 
@@ -90,7 +93,24 @@ class Command(CommandComponent[Response]):
             ),
         )
 
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.exact_match.add,
+                org_code=example.org_code,
+                example_ids=[example.example_id],
+                examples=[example.example],
+                automatic_response_id=example.automatic_response_id,
+            )
+        )
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.lexical_index.add,
+                org_code=example.org_code,
+                example_ids=[example.example_id],
+                examples=[example.example],
+            )
+        )
 
         embedding_model_to_use = (
             await lego_workflows.run_and_collect_events(
@@ -103,10 +123,12 @@ class Command(CommandComponent[Response]):
         await automatic_responses.embeddings.upsert_examples(
             embedding_model=embedding_model_to_use,
             cohere_client=self.cohere_client,
-            qdrant_client=self.qdrant_client,
+            vector_index=resources.get_vector_index(qdrant_client=self.qdrant_client),
             example_ids=[example.example_id],
             examples=[example.example],
             org_code=example.org_code,
+            cache=resources.embedding_cache,
+            batcher=resources.embedding_batcher,
         )
         events.append(
             ExampleUpdated(
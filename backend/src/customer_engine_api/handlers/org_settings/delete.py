@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import (
@@ -10,10 +12,14 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class OrgSettingsDeleted(DomainEvent):
@@ -33,7 +39,7 @@ class Response(ResponseComponent): ...
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
         stmt = text(
@@ -48,6 +54,9 @@ class Command(CommandComponent[Response]):
                 type_=sqlalchemy.String(),
             )
         )
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(resources.caches.org_settings.invalidate, self.org_code)
+        )
         events.append(OrgSettingsDeleted(org_code=self.org_code))
         return Response()
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import (
@@ -10,10 +12,14 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.org_settings import OrgSettings
 
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
@@ -24,9 +30,16 @@ class Response(ResponseComponent):
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        cached = resources.caches.org_settings.get(self.org_code)
+        if cached is not None:
+            settings, is_default = cached
+            return Response(settings=settings, is_default=is_default)
+
+        generation = resources.caches.org_settings.generation
+
         stmt = text(
             """
             SELECT
@@ -43,14 +56,25 @@ class Command(CommandComponent[Response]):
             )
         )
 
-        row = self.sql_conn.execute(stmt).fetchone()
+        row = (await self.sql_conn.execute(stmt)).fetchone()
+        response: Response
         if row is None:
-            return Response(
+            response = Response(
                 settings=OrgSettings(org_code=self.org_code),
                 is_default=True,
             )
+        else:
+            response = Response(
+                settings=OrgSettings.from_row(row=row),
+                is_default=False,
+            )
 
-        return Response(
-            settings=OrgSettings.from_row(row=row),
-            is_default=False,
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.caches.org_settings.set,
+                self.org_code,
+                (response.settings, response.is_default),
+                generation=generation,
+            )
         )
+        return response
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -12,14 +13,16 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.org_settings import (
     get_or_default,
 )
 
 if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
     from customer_engine_api.core.org_settings import OrgSettings
 
 
@@ -53,7 +56,7 @@ class Response(ResponseComponent):
 class Command(CommandComponent[Response]):
     org_code: str
     default_response: str | None
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
         get_response, _ = await lego_workflows.run_and_collect_events(
@@ -94,7 +97,7 @@ class Command(CommandComponent[Response]):
                     type_=sqlalchemy.String(),
                 ),
             )
-            self.sql_conn.execute(stmt)
+            await self.sql_conn.execute(stmt)
             events.append(OrgSettingsCreated(org_code=self.org_code))
         else:
             stmt = text("""
@@ -115,6 +118,9 @@ class Command(CommandComponent[Response]):
                     type_=sqlalchemy.String(),
                 ),
             )
-            self.sql_conn.execute(stmt)
+            await self.sql_conn.execute(stmt)
             events.append(OrgSettingUpdated(org_code=self.org_code))
+        self.sql_conn.after_commit(
+            functools.partial(resources.caches.org_settings.invalidate, self.org_code)
+        )
         return Response(settings=org_settings)
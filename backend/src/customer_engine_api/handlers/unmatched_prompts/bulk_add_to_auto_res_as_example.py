@@ -6,9 +6,14 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import lego_workflows
+import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import automatic_responses as core_automatic_responses
+from customer_engine_api.core.config import resources
 from customer_engine_api.handlers import automatic_responses
+from customer_engine_api.handlers.org_settings import get_or_default
 from customer_engine_api.handlers.unmatched_prompts import (
     bulk_delete_unmatched_prompts,
     get_subset_unmatched_prompts,
@@ -19,7 +24,9 @@ if TYPE_CHECKING:
 
     import cohere
     from qdrant_client import AsyncQdrantClient
-    from sqlalchemy import Connection
+
+    from customer_engine_api.core.db import AsyncConnection
+    from customer_engine_api.core.typing import EmbeddingModels
 
 
 @dataclass(frozen=True)
@@ -32,11 +39,65 @@ class Command(CommandComponent[Response]):
     org_code: str
     prompt_ids: list[UUID]
     automatic_response_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
 
+    async def _cache_stored_embeddings(self, embedding_model: EmbeddingModels) -> None:
+        """Seed embedding cache with vectors computed when prompts were matched."""
+        rows = (
+            await self.sql_conn.execute(
+                text(
+                    """
+                    SELECT prompt, embedding
+                    FROM unmatched_prompts
+                    WHERE org_code = :org_code
+                        AND prompt_id IN :prompt_ids
+                        AND embedding_model = :embedding_model
+                        AND embedding IS NOT NULL
+                    """
+                ).bindparams(
+                    bindparam(
+                        key="org_code", value=self.org_code, type_=sqlalchemy.String()
+                    ),
+                    bindparam(
+                        key="prompt_ids",
+                        value=[prompt_id.hex for prompt_id in self.prompt_ids],
+                        type_=sqlalchemy.String(),
+                        expanding=True,
+                    ),
+                    bindparam(
+                        key="embedding_model",
+                        value=embedding_model,
+                        type_=sqlalchemy.String(),
+                    ),
+                )
+            )
+        ).all()
+        if len(rows) == 0:
+            return
+
+        await resources.embedding_cache.set_many(
+            embedding_model,
+            "search_document",
+            [row.prompt for row in rows],
+            [
+                core_automatic_responses.embeddings.from_blob(row.embedding)
+                for row in rows
+            ],
+        )
+
     async def run(self, events: list[DomainEvent]) -> Response:
+        if len(self.prompt_ids) > 0:
+            embedding_model = (
+                await lego_workflows.run_and_collect_events(
+                    cmd=get_or_default.Command(
+                        org_code=self.org_code, sql_conn=self.sql_conn
+                    )
+                )
+            )[0].settings.embeddings_model
+            await self._cache_stored_embeddings(embedding_model=embedding_model)
+
         (
             response_get_subset,
             get_subset_events,
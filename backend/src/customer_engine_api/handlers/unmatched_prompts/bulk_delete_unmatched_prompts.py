@@ -7,16 +7,19 @@ from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import event_bus
 from customer_engine_api.core.logging import logger
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
-class UnmatchedPromptDeleted(DomainEvent):
+class UnmatchedPromptDeleted(DomainEvent, event_bus.BatchedEvent):
     org_code: str
     prompt_id: UUID
 
@@ -27,6 +30,14 @@ class UnmatchedPromptDeleted(DomainEvent):
             org_code=self.org_code,
         )
 
+    @classmethod
+    async def publish_batch(cls, events: list[UnmatchedPromptDeleted]) -> None:
+        logger.info(
+            "{count} unmatched prompts deleted from org {org_code}",
+            count=len(events),
+            org_code=events[0].org_code,
+        )
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent): ...
@@ -36,7 +47,7 @@ class Response(ResponseComponent): ...
 class Command(CommandComponent[Response]):
     org_code: str
     prompt_ids: list[UUID]
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
         prompt_deleted_events: list[UnmatchedPromptDeleted] = []
@@ -63,7 +74,7 @@ class Command(CommandComponent[Response]):
             ),
         )
 
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
 
         events.extend(prompt_deleted_events)
 
@@ -0,0 +1,182 @@
+"""Cluster near duplicate unmatched prompts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+from uuid import UUID
+
+import lego_workflows
+import sqlalchemy
+from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.core import automatic_responses
+from customer_engine_api.core.config import resources
+from customer_engine_api.core.logging import logger
+from customer_engine_api.handlers.org_settings import get_or_default
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import cohere
+    from sqlalchemy import Row
+
+    from customer_engine_api.core.db import AsyncConnection
+    from customer_engine_api.core.typing import EmbeddingModels
+
+
+@dataclass(frozen=True)
+class UnmatchedPromptsClustered(DomainEvent):
+    org_code: str
+    prompts: int
+    clusters: int
+
+    async def publish(self) -> None:
+        logger.info(
+            "{prompts} unmatched prompts grouped in {clusters} clusters for organization {org_code}",
+            prompts=self.prompts,
+            clusters=self.clusters,
+            org_code=self.org_code,
+        )
+
+
+@dataclass(frozen=True)
+class Response(ResponseComponent):
+    clusters: int
+
+
+@dataclass(frozen=True)
+class Command(CommandComponent[Response]):
+    """
+    Assign every unmatched prompt of the organization to a cluster.
+
+    Clusters are led by the most frequent prompt, prompts at least
+    `similarity_threshold` cosine similar to it join its cluster. Embeddings
+    stored with the prompts are reused, missing ones are computed and stored.
+    """
+
+    org_code: str
+    cohere_client: cohere.AsyncClient
+    sql_conn: AsyncConnection
+    similarity_threshold: float = 0.9
+
+    async def _embed_missing(
+        self,
+        rows: Sequence[Row[Any]],
+        embedding_model: EmbeddingModels,
+        prompt_embeddings: list[list[float] | None],
+    ) -> None:
+        """Embed prompts without a stored embedding and store it."""
+        missing = [
+            i for i, embedding in enumerate(prompt_embeddings) if embedding is None
+        ]
+        if len(missing) == 0:
+            return
+
+        new_embeddings = await automatic_responses.embeddings.embed_prompt_or_examples(
+            client=self.cohere_client,
+            model=embedding_model,
+            prompt_or_examples=[rows[i].prompt for i in missing],
+            cache=resources.embedding_cache,
+            batcher=resources.embedding_batcher,
+        )
+        await self.sql_conn.execute(
+            text(
+                """
+                UPDATE unmatched_prompts
+                SET embedding = :embedding, embedding_model = :embedding_model
+                WHERE org_code = :org_code AND prompt_id = :prompt_id
+                """
+            ).bindparams(
+                bindparam(key="org_code", type_=sqlalchemy.String()),
+                bindparam(key="prompt_id", type_=sqlalchemy.UUID()),
+                bindparam(key="embedding", type_=sqlalchemy.LargeBinary()),
+                bindparam(key="embedding_model", type_=sqlalchemy.String()),
+            ),
+            [
+                {
+                    "org_code": self.org_code,
+                    "prompt_id": UUID(rows[i].prompt_id),
+                    "embedding": automatic_responses.embeddings.to_blob(embedding),
+                    "embedding_model": embedding_model,
+                }
+                for i, embedding in zip(missing, new_embeddings, strict=True)
+            ],
+        )
+        for i, embedding in zip(missing, new_embeddings, strict=True):
+            prompt_embeddings[i] = embedding
+
+    async def run(self, events: list[DomainEvent]) -> Response:
+        rows = (
+            await self.sql_conn.execute(
+                text(
+                    """
+                    SELECT prompt_id, prompt, embedding, embedding_model
+                    FROM unmatched_prompts
+                    WHERE org_code = :org_code
+                    ORDER BY occurrences DESC, created_at
+                    """
+                ).bindparams(
+                    bindparam(
+                        key="org_code", value=self.org_code, type_=sqlalchemy.String()
+                    )
+                )
+            )
+        ).all()
+        if len(rows) == 0:
+            return Response(clusters=0)
+
+        embedding_model = (
+            await lego_workflows.run_and_collect_events(
+                cmd=get_or_default.Command(
+                    org_code=self.org_code, sql_conn=self.sql_conn
+                )
+            )
+        )[0].settings.embeddings_model
+        prompt_embeddings = [
+            automatic_responses.embeddings.from_blob(row.embedding)
+            if row.embedding is not None and row.embedding_model == embedding_model
+            else None
+            for row in rows
+        ]
+        await self._embed_missing(
+            rows=rows,
+            embedding_model=embedding_model,
+            prompt_embeddings=prompt_embeddings,
+        )
+
+        leaders = automatic_responses.clustering.cluster(
+            vectors=cast(list[list[float]], prompt_embeddings),
+            similarity_threshold=self.similarity_threshold,
+        )
+
+        await self.sql_conn.execute(
+            text(
+                """
+                UPDATE unmatched_prompts
+                SET cluster_id = :cluster_id
+                WHERE org_code = :org_code AND prompt_id = :prompt_id
+                """
+            ).bindparams(
+                bindparam(key="org_code", type_=sqlalchemy.String()),
+                bindparam(key="cluster_id", type_=sqlalchemy.UUID()),
+                bindparam(key="prompt_id", type_=sqlalchemy.UUID()),
+            ),
+            [
+                {
+                    "org_code": self.org_code,
+                    "cluster_id": UUID(rows[leader].prompt_id),
+                    "prompt_id": UUID(row.prompt_id),
+                }
+                for row, leader in zip(rows, leaders, strict=True)
+            ],
+        )
+
+        clusters = len(set(leaders.tolist()))
+        events.append(
+            UnmatchedPromptsClustered(
+                org_code=self.org_code, prompts=len(rows), clusters=clusters
+            )
+        )
+        return Response(clusters=clusters)
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.logging import logger
 
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class AllUnmatchedPromptsDeleted(DomainEvent):
@@ -29,10 +33,10 @@ class Response(ResponseComponent): ...
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
-        self.sql_conn.execute(
+        await self.sql_conn.execute(
             text(
                 """
                 DELETE FROM unmatched_prompts
@@ -7,13 +7,15 @@ from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.logging import logger
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class UnmatchedPromptDeleted(DomainEvent):
@@ -36,10 +38,10 @@ class Response(ResponseComponent): ...
 class Command(CommandComponent[Response]):
     org_code: str
     prompt_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
-        self.sql_conn.execute(
+        await self.sql_conn.execute(
             text("""
             DELETE FROM unmatched_prompts
             WHERE org_code = :org_code
@@ -7,13 +7,15 @@ from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.automatic_responses import UnmatchedPrompt
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
@@ -24,7 +26,7 @@ class Response(ResponseComponent):
 class Command(CommandComponent[Response]):
     org_code: str
     prompt_ids: list[UUID]
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         stmt = text(
@@ -33,7 +35,10 @@ class Command(CommandComponent[Response]):
                 org_code,
                 prompt_id,
                 prompt,
-                created_at
+                created_at,
+                occurrences,
+                last_seen_at,
+                cluster_id
             FROM unmatched_prompts
             WHERE org_code = :org_code
                 AND prompt_id in :prompt_ids
@@ -50,6 +55,6 @@ class Command(CommandComponent[Response]):
         return Response(
             unmatched_prompts=[
                 UnmatchedPrompt.from_row(row=row)
-                for row in self.sql_conn.execute(stmt).fetchall()
+                for row in (await self.sql_conn.execute(stmt)).fetchall()
             ]
         )
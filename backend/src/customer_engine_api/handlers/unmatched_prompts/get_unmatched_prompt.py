@@ -12,13 +12,15 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.automatic_responses import UnmatchedPrompt
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from customer_engine_api.core.db import AsyncConnection
+
 
 class UnmatchedPromptNotFoundError(DomainError):
     def __init__(self, org_code: str, prompt_id: UUID) -> None:
@@ -34,7 +36,7 @@ class Response(ResponseComponent):
 class Command(CommandComponent[Response]):
     org_code: str
     prompt_id: UUID
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
         stmt = text(
@@ -43,7 +45,10 @@ class Command(CommandComponent[Response]):
                 org_code,
                 prompt_id,
                 prompt,
-                created_at
+                created_at,
+                occurrences,
+                last_seen_at,
+                cluster_id
             FROM unmatched_prompts
             WHERE org_code = :org_code
                 AND prompt_id = :prompt_id
@@ -57,7 +62,7 @@ class Command(CommandComponent[Response]):
             bindparam(key="prompt_id", value=self.prompt_id, type_=sqlalchemy.UUID()),
         )
 
-        row = self.sql_conn.execute(statement=stmt).one_or_none()
+        row = (await self.sql_conn.execute(statement=stmt)).one_or_none()
         if row is None:
             raise UnmatchedPromptNotFoundError(
                 org_code=self.org_code,
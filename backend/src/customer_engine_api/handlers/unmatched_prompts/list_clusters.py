@@ -0,0 +1,111 @@
+"""List unmatched prompt clusters."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
+from sqlalchemy import bindparam, text
+
+from customer_engine_api.core.automatic_responses import UnmatchedPromptCluster
+
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
+
+@dataclass(frozen=True)
+class Response(ResponseComponent):
+    clusters: list[UnmatchedPromptCluster]
+
+
+@dataclass(frozen=True)
+class Command(CommandComponent[Response]):
+    """
+    Clusters with the most occurrences first.
+
+    Prompts not clustered yet are listed as clusters of their own. A cluster
+    whose leading prompt was removed is represented by another member.
+    """
+
+    org_code: str
+    sql_conn: AsyncConnection
+    limit: int = 50
+
+    async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        cluster_rows = (
+            await self.sql_conn.execute(
+                text(
+                    """
+                    SELECT
+                        clusters.cluster_id,
+                        COALESCE(leaders.prompt, clusters.prompt) AS prompt,
+                        clusters.prompts,
+                        clusters.occurrences,
+                        clusters.last_seen_at
+                    FROM (
+                        SELECT
+                            COALESCE(cluster_id, prompt_id) AS cluster_id,
+                            MIN(prompt) AS prompt,
+                            COUNT(*) AS prompts,
+                            SUM(occurrences) AS occurrences,
+                            MAX(COALESCE(last_seen_at, created_at)) AS last_seen_at
+                        FROM unmatched_prompts
+                        WHERE org_code = :org_code
+                        GROUP BY COALESCE(cluster_id, prompt_id)
+                        ORDER BY occurrences DESC
+                        LIMIT :limit
+                    ) AS clusters
+                    LEFT JOIN unmatched_prompts AS leaders
+                        ON leaders.org_code = :org_code
+                        AND leaders.prompt_id = clusters.cluster_id
+                    ORDER BY clusters.occurrences DESC
+                    """
+                ).bindparams(
+                    bindparam(
+                        key="org_code", value=self.org_code, type_=sqlalchemy.String()
+                    ),
+                    bindparam(
+                        key="limit", value=self.limit, type_=sqlalchemy.Integer()
+                    ),
+                )
+            )
+        ).all()
+        if len(cluster_rows) == 0:
+            return Response(clusters=[])
+
+        prompt_ids: defaultdict[str, list[str]] = defaultdict(list)
+        for row in (
+            await self.sql_conn.execute(
+                text(
+                    """
+                    SELECT COALESCE(cluster_id, prompt_id) AS cluster_id, prompt_id
+                    FROM unmatched_prompts
+                    WHERE org_code = :org_code
+                        AND COALESCE(cluster_id, prompt_id) IN :cluster_ids
+                    """
+                ).bindparams(
+                    bindparam(
+                        key="org_code", value=self.org_code, type_=sqlalchemy.String()
+                    ),
+                    bindparam(
+                        key="cluster_ids",
+                        value=[row.cluster_id for row in cluster_rows],
+                        type_=sqlalchemy.String(),
+                        expanding=True,
+                    ),
+                )
+            )
+        ).all():
+            prompt_ids[row.cluster_id].append(row.prompt_id)
+
+        return Response(
+            clusters=[
+                UnmatchedPromptCluster.from_dict(
+                    {**row._asdict(), "prompt_ids": prompt_ids[row.cluster_id]}
+                )
+                for row in cluster_rows
+            ]
+        )
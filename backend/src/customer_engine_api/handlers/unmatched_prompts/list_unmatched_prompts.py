@@ -2,43 +2,93 @@
 
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
 
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import pagination
 from customer_engine_api.core.automatic_responses import UnmatchedPrompt
 
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
 
 @dataclass(frozen=True)
 class Response(ResponseComponent):
     unmatched_prompts: list[UnmatchedPrompt]
+    next_cursor: str | None = None
 
 
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
+    """Newest prompts first, all of them unless `limit` is given."""
+
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
+    limit: int | None = None
+    cursor: str | None = None
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        after_cursor = ""
+        params = [
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(
+                key="limit",
+                value=self.limit + 1 if self.limit is not None else -1,
+                type_=sqlalchemy.Integer(),
+            ),
+        ]
+        if self.cursor is not None:
+            created_at, prompt_id = pagination.decode_cursor(self.cursor, size=2)
+            try:
+                after = (datetime.datetime.fromisoformat(created_at), UUID(prompt_id))
+            except ValueError as e:
+                raise pagination.InvalidCursorError(cursor=self.cursor) from e
+
+            after_cursor = "AND (created_at, prompt_id) < (:created_at, :prompt_id)"
+            params.extend(
+                [
+                    bindparam(
+                        key="created_at", value=after[0], type_=sqlalchemy.DateTime()
+                    ),
+                    bindparam(key="prompt_id", value=after[1], type_=sqlalchemy.UUID()),
+                ]
+            )
+
         stmt = text(
-            """
+            f"""
             SELECT
                 org_code,
                 prompt_id,
                 prompt,
-                created_at
+                created_at,
+                occurrences,
+                last_seen_at,
+                cluster_id
             FROM unmatched_prompts
-            WHERE org_code = :org_code
-            """
-        ).bindparams(
-            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
-        )
+            WHERE org_code = :org_code {after_cursor}
+            ORDER BY created_at DESC, prompt_id DESC
+            LIMIT :limit
+            """  # noqa: S608
+        ).bindparams(*params)
+
+        unmatched_prompts = [
+            UnmatchedPrompt.from_row(row=row)
+            for row in (await self.sql_conn.execute(stmt)).fetchall()
+        ]
+        if self.limit is None or len(unmatched_prompts) <= self.limit:
+            return Response(unmatched_prompts=unmatched_prompts)
 
+        unmatched_prompts = unmatched_prompts[: self.limit]
+        last = unmatched_prompts[-1]
         return Response(
-            unmatched_prompts=[
-                UnmatchedPrompt.from_row(row=row)
-                for row in self.sql_conn.execute(stmt).fetchall()
-            ]
+            unmatched_prompts=unmatched_prompts,
+            next_cursor=pagination.encode_cursor(
+                [last.created_at.isoformat(), last.prompt_id.hex]
+            ),
         )
@@ -4,19 +4,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
-from uuid import uuid4
+from uuid import UUID, uuid4
 
-import lego_workflows
 import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
+from customer_engine_api.core import automatic_responses
 from customer_engine_api.core.logging import logger
-from customer_engine_api.handlers.unmatched_prompts import get_unmatched_prompt
+from customer_engine_api.core.text import fingerprint
 
 if TYPE_CHECKING:
     import datetime
-    from uuid import UUID
+
+    from customer_engine_api.core.db import AsyncConnection
+    from customer_engine_api.core.typing import EmbeddingModels
 
 
 @dataclass(frozen=True)
@@ -42,53 +44,77 @@ class Command(CommandComponent[Response]):
     org_code: str
     prompt: str
     current_time: datetime.datetime
-    sql_conn: Connection
+    sql_conn: AsyncConnection
+    embedding: list[float] | None = None
+    embedding_model: EmbeddingModels | None = None
 
     async def run(self, events: list[DomainEvent]) -> Response:
-        while True:
-            random_id = uuid4()
-            try:
-                await lego_workflows.run_and_collect_events(
-                    cmd=get_unmatched_prompt.Command(
-                        org_code=self.org_code,
-                        prompt_id=random_id,
-                        sql_conn=self.sql_conn,
-                    )
-                )
-            except get_unmatched_prompt.UnmatchedPromptNotFoundError:
-                break
-
-        self.sql_conn.execute(
-            text(
-                """
+        """
+        Count the prompt again if an equivalent one is already registered.
+
+        `embedding` is kept so promoting the prompt doesn't embed it again.
+        """
+        stmt = text(
+            """
             INSERT INTO unmatched_prompts (
                 org_code,
                 prompt_id,
                 prompt,
-                created_at
+                prompt_hash,
+                occurrences,
+                created_at,
+                last_seen_at,
+                embedding,
+                embedding_model
             ) VALUES (
                 :org_code,
                 :prompt_id,
                 :prompt,
-                :created_at
-            )
-                """
-            ).bindparams(
-                bindparam(
-                    key="org_code", value=self.org_code, type_=sqlalchemy.String()
-                ),
-                bindparam(key="prompt_id", value=random_id, type_=sqlalchemy.UUID()),
-                bindparam(key="prompt", value=self.prompt, type_=sqlalchemy.String()),
-                bindparam(
-                    key="created_at",
-                    value=self.current_time,
-                    type_=sqlalchemy.DateTime(timezone=True),
-                ),
+                :prompt_hash,
+                1,
+                :current_time,
+                :current_time,
+                :embedding,
+                :embedding_model
             )
+            ON CONFLICT (org_code, prompt_hash) DO UPDATE SET
+                occurrences = occurrences + 1,
+                last_seen_at = excluded.last_seen_at,
+                embedding = COALESCE(excluded.embedding, embedding),
+                embedding_model = COALESCE(excluded.embedding_model, embedding_model)
+            RETURNING prompt_id
+            """
+        ).bindparams(
+            bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String()),
+            bindparam(key="prompt_id", value=uuid4(), type_=sqlalchemy.UUID()),
+            bindparam(key="prompt", value=self.prompt, type_=sqlalchemy.String()),
+            bindparam(
+                key="prompt_hash",
+                value=fingerprint(self.prompt),
+                type_=sqlalchemy.String(),
+            ),
+            bindparam(
+                key="current_time",
+                value=self.current_time,
+                type_=sqlalchemy.DateTime(timezone=True),
+            ),
+            bindparam(
+                key="embedding",
+                value=automatic_responses.embeddings.to_blob(self.embedding)
+                if self.embedding is not None
+                else None,
+                type_=sqlalchemy.LargeBinary(),
+            ),
+            bindparam(
+                key="embedding_model",
+                value=self.embedding_model,
+                type_=sqlalchemy.String(),
+            ),
         )
+        prompt_id = UUID((await self.sql_conn.execute(stmt)).scalar_one())
 
         events.append(
-            UnmatchedPromptRegistered(self.org_code, unmatched_prompt_id=random_id)
+            UnmatchedPromptRegistered(self.org_code, unmatched_prompt_id=prompt_id)
         )
 
-        return Response(umatched_prompt_id=random_id)
+        return Response(umatched_prompt_id=prompt_id)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -9,10 +10,11 @@ import sqlalchemy
 from lego_workflows.components import CommandComponent, DomainEvent, ResponseComponent
 from sqlalchemy import bindparam, text
 
+from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
 
 if TYPE_CHECKING:
-    from sqlalchemy import Connection
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
@@ -33,7 +35,7 @@ class Response(ResponseComponent): ...
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
         stmt = text(
@@ -48,6 +50,11 @@ class Command(CommandComponent[Response]):
                 type_=sqlalchemy.String(),
             )
         )
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.caches.whatsapp_tokens.invalidate, self.org_code
+            )
+        )
         events.append(WhatsappTokensDeleted(org_code=self.org_code))
         return Response()
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import sqlalchemy
 from lego_workflows.components import (
@@ -11,11 +13,14 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core import whatsapp
 from customer_engine_api.core.config import resources
 
+if TYPE_CHECKING:
+    from customer_engine_api.core.db import AsyncConnection
+
 
 class WhatsappTokenNotFoundError(DomainError):
     """Raised when whatsapp token data is not found."""
@@ -32,9 +37,15 @@ class Response(ResponseComponent):
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
     org_code: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:  # noqa: ARG002
+        cached_tokens = resources.caches.whatsapp_tokens.get(self.org_code)
+        if cached_tokens is not None:
+            return Response(whatsapp_token=cached_tokens)
+
+        generation = resources.caches.whatsapp_tokens.generation
+
         stmt = text(
             """
                 SELECT
@@ -47,7 +58,7 @@ class Command(CommandComponent[Response]):
         ).bindparams(
             bindparam(key="org_code", value=self.org_code, type_=sqlalchemy.String())
         )
-        whatsapp_token_row = self.sql_conn.execute(statement=stmt).one_or_none()
+        whatsapp_token_row = (await self.sql_conn.execute(statement=stmt)).one_or_none()
         if whatsapp_token_row is None:
             raise WhatsappTokenNotFoundError(org_code=self.org_code)
 
@@ -57,4 +68,12 @@ class Command(CommandComponent[Response]):
             fernet=resources.fernet,
         )
 
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.caches.whatsapp_tokens.set,
+                self.org_code,
+                whatsapp_tokens,
+                generation=generation,
+            )
+        )
         return Response(whatsapp_token=whatsapp_tokens)
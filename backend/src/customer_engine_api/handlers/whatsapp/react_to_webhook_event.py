@@ -12,8 +12,7 @@ from lego_workflows.components import (
     ResponseComponent,
 )
 
-from customer_engine_api.core import whatsapp
-from customer_engine_api.core.api_clients.whatsapp import AsyncWhatsappClient
+from customer_engine_api.core import metrics, whatsapp
 from customer_engine_api.handlers.automatic_responses import (
     get_auto_res_owns_example,
 )
@@ -25,9 +24,19 @@ if TYPE_CHECKING:
 
     import cohere
     from qdrant_client import AsyncQdrantClient
-    from sqlalchemy import Connection
 
-    from customer_engine_api.core.typing import JsonResponse
+    from customer_engine_api.core.api_clients.whatsapp import AsyncWhatsappClient
+    from customer_engine_api.core.db import AsyncConnection
+
+_timer = metrics.StageTimer(
+    command="react_to_webhook_event",
+    stages=(
+        "get_tokens",
+        "match",
+        "default_response",
+        "send_message",
+    ),
+)
 
 
 @dataclass(frozen=True)
@@ -36,65 +45,67 @@ class Response(ResponseComponent): ...
 
 @dataclass(frozen=True)
 class Command(CommandComponent[Response]):
-    payload: JsonResponse
+    """Reply to one message of a webhook delivery."""
+
+    message: whatsapp.payloads.TextMessage
     org_code: str
     qdrant_client: AsyncQdrantClient
     cohere_client: cohere.AsyncClient
-    sql_conn: Connection
+    whatsapp_client: AsyncWhatsappClient
+    sql_conn: AsyncConnection
     current_time: datetime.datetime
 
     async def run(self, events: list[DomainEvent]) -> Response:
-        identified_payload = whatsapp.payloads.identify_payload(payload=self.payload)
-
-        (
-            get_tokens_response,
-            get_tokens_events,
-        ) = await lego_workflows.run_and_collect_events(
-            get_tokens.Command(org_code=self.org_code, sql_conn=self.sql_conn)
-        )
+        with _timer("get_tokens"):
+            (
+                get_tokens_response,
+                get_tokens_events,
+            ) = await lego_workflows.run_and_collect_events(
+                get_tokens.Command(org_code=self.org_code, sql_conn=self.sql_conn)
+            )
 
         events.extend(get_tokens_events)
 
-        whatsapp_client = AsyncWhatsappClient(
-            bearer_token=get_tokens_response.whatsapp_token.access_token,
-            phone_number_id=identified_payload.phone_number_id,
-        )
-
         msg_to_send: str
         try:
-            (
-                auto_res_response,
-                auto_res_events,
-            ) = await lego_workflows.run_and_collect_events(
-                cmd=get_auto_res_owns_example.Command(
-                    org_code=self.org_code,
-                    example_id_or_prompt=identified_payload.text,
-                    qdrant_client=self.qdrant_client,
-                    cohere_client=self.cohere_client,
-                    sql_conn=self.sql_conn,
-                    current_time=self.current_time,
+            with _timer("match"):
+                (
+                    auto_res_response,
+                    auto_res_events,
+                ) = await lego_workflows.run_and_collect_events(
+                    cmd=get_auto_res_owns_example.Command(
+                        org_code=self.org_code,
+                        example_id_or_prompt=self.message.text,
+                        qdrant_client=self.qdrant_client,
+                        cohere_client=self.cohere_client,
+                        sql_conn=self.sql_conn,
+                        current_time=self.current_time,
+                    )
                 )
-            )
 
             events.extend(auto_res_events)
 
             msg_to_send = auto_res_response.automatic_response.response
 
         except get_auto_res_owns_example.UnableToMatchPromptWithAutomaticResponseError:
-            (
-                org_settings,
-                get_or_default_events,
-            ) = await lego_workflows.run_and_collect_events(
-                cmd=get_or_default.Command(
-                    org_code=self.org_code, sql_conn=self.sql_conn
+            with _timer("default_response"):
+                (
+                    org_settings,
+                    get_or_default_events,
+                ) = await lego_workflows.run_and_collect_events(
+                    cmd=get_or_default.Command(
+                        org_code=self.org_code, sql_conn=self.sql_conn
+                    )
                 )
-            )
             events.extend(get_or_default_events)
             msg_to_send = org_settings.settings.default_response
 
-        await whatsapp_client.send_text_msg(
-            text=msg_to_send,
-            to_wa_id=identified_payload.wa_id,
-        )
+        with _timer("send_message"):
+            await self.whatsapp_client.send_text_msg(
+                bearer_token=get_tokens_response.whatsapp_token.access_token,
+                phone_number_id=self.message.phone_number_id,
+                text=msg_to_send,
+                to_wa_id=self.message.wa_id,
+            )
 
         return Response()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -21,7 +22,7 @@ from customer_engine_api.core.logging import logger
 from customer_engine_api.handlers.whatsapp import get_tokens
 
 if TYPE_CHECKING:
-    from sqlalchemy import Connection
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
@@ -47,9 +48,9 @@ class Command(CommandComponent[Response]):
     org_code: str
     access_token: str
     user_token: str
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
-    def _register_new(self, events: list[DomainEvent]) -> Response:
+    async def _register_new(self, events: list[DomainEvent]) -> Response:
         whatsapp_token = whatsapp.WhatsappTokens(
             org_code=self.org_code,
             access_token=resources.fernet.encrypt(
@@ -88,7 +89,12 @@ class Command(CommandComponent[Response]):
                 type_=sqlalchemy.String(),
             ),
         )
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.caches.whatsapp_tokens.invalidate, self.org_code
+            )
+        )
         events.append(
             WhatsappTokenRegistered(
                 org_code=self.org_code,
@@ -102,5 +108,5 @@ class Command(CommandComponent[Response]):
                 cmd=get_tokens.Command(org_code=self.org_code, sql_conn=self.sql_conn)
             )
         except get_tokens.WhatsappTokenNotFoundError:
-            return self._register_new(events=events)
+            return await self._register_new(events=events)
         raise WhatsappTokenAlreadyExistsError(org_code=self.org_code)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -12,7 +13,7 @@ from lego_workflows.components import (
     DomainEvent,
     ResponseComponent,
 )
-from sqlalchemy import Connection, bindparam, text
+from sqlalchemy import bindparam, text
 
 from customer_engine_api.core.config import resources
 from customer_engine_api.core.logging import logger
@@ -20,6 +21,7 @@ from customer_engine_api.handlers.whatsapp import get_tokens
 
 if TYPE_CHECKING:
     from customer_engine_api.core import whatsapp
+    from customer_engine_api.core.db import AsyncConnection
 
 
 @dataclass(frozen=True)
@@ -43,7 +45,7 @@ class Command(CommandComponent[Response]):
     org_code: str
     new_access_token: str | None
     new_user_token: str | None
-    sql_conn: Connection
+    sql_conn: AsyncConnection
 
     async def run(self, events: list[DomainEvent]) -> Response:
         existing_whatsapp_token: whatsapp.WhatsappTokens = (
@@ -84,6 +86,11 @@ class Command(CommandComponent[Response]):
                 type_=sqlalchemy.String(),
             ),
         )
-        self.sql_conn.execute(stmt)
+        await self.sql_conn.execute(stmt)
+        self.sql_conn.after_commit(
+            functools.partial(
+                resources.caches.whatsapp_tokens.invalidate, self.org_code
+            )
+        )
         events.append(WhatsappTokenUpdated(org_code=self.org_code))
         return Response(token=existing_whatsapp_token)
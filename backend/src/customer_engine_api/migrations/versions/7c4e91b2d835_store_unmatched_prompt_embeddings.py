@@ -0,0 +1,42 @@
+"""
+Store unmatched prompt embeddings.
+
+Revision ID: 7c4e91b2d835
+Revises: e52b7d0c9a16
+Create Date: 2026-10-18 17:05:52.630219
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e91b2d835"
+down_revision: str | None = "e52b7d0c9a16"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE_NAME = "unmatched_prompts"
+
+
+def upgrade() -> None:
+    op.add_column(
+        table_name=TABLE_NAME,
+        column=sa.Column("embedding", sa.LargeBinary(), nullable=True),
+    )
+    op.add_column(
+        table_name=TABLE_NAME,
+        column=sa.Column("embedding_model", sa.String(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column(table_name=TABLE_NAME, column_name="embedding_model")
+    op.drop_column(table_name=TABLE_NAME, column_name="embedding")
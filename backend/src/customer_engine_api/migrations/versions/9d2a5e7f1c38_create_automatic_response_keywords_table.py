@@ -0,0 +1,39 @@
+"""
+Create automatic response keywords table.
+
+Revision ID: 9d2a5e7f1c38
+Revises: f3b8d61a4c27
+Create Date: 2026-10-18 21:04:12.532917
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2a5e7f1c38"
+down_revision: str | None = "f3b8d61a4c27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE_NAME = "automatic_response_keywords"
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE_NAME,
+        sa.Column("org_code", sa.String(), primary_key=True),
+        sa.Column("automatic_response_id", sa.UUID(), primary_key=True),
+        sa.Column("keyword", sa.String(), primary_key=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,49 @@
+"""
+Add pagination indexes.
+
+Revision ID: a3f1c9d27e48
+Revises: dbc66ca36c5a
+Create Date: 2026-10-18 15:42:11.208316
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1c9d27e48"
+down_revision: str | None = "dbc66ca36c5a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UNMATCHED_PROMPTS_TABLE = "unmatched_prompts"
+UNMATCHED_PROMPTS_INDEX = "ix_unmatched_prompts_org_code_created_at_prompt_id"
+
+EXAMPLES_TABLE = "automatic_response_examples"
+EXAMPLES_INDEX = "ix_automatic_response_examples_org_code_auto_res_id_example_id"
+
+
+def upgrade() -> None:
+    op.create_index(
+        index_name=UNMATCHED_PROMPTS_INDEX,
+        table_name=UNMATCHED_PROMPTS_TABLE,
+        columns=["org_code", "created_at", "prompt_id"],
+    )
+    op.create_index(
+        index_name=EXAMPLES_INDEX,
+        table_name=EXAMPLES_TABLE,
+        columns=["org_code", "automatic_response_id", "example_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(index_name=EXAMPLES_INDEX, table_name=EXAMPLES_TABLE)
+    op.drop_index(
+        index_name=UNMATCHED_PROMPTS_INDEX, table_name=UNMATCHED_PROMPTS_TABLE
+    )
@@ -0,0 +1,161 @@
+"""
+Deduplicate unmatched prompts.
+
+Revision ID: e52b7d0c9a16
+Revises: a3f1c9d27e48
+Create Date: 2026-10-18 16:20:37.914402
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import unicodedata
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "e52b7d0c9a16"
+down_revision: str | None = "a3f1c9d27e48"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE_NAME = "unmatched_prompts"
+PROMPT_HASH_INDEX = "ix_unmatched_prompts_org_code_prompt_hash"
+CLUSTER_INDEX = "ix_unmatched_prompts_org_code_cluster_id"
+BATCH_SIZE = 1000
+
+
+def _fingerprint(prompt: str) -> str:
+    """Frozen copy of `core.text.fingerprint` as of this revision."""
+    normalized = " ".join(unicodedata.normalize("NFKC", prompt).casefold().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _fill_prompt_hashes() -> None:
+    """Hash prompts in batches of `BATCH_SIZE` rows."""
+    conn = op.get_bind()
+    select_batch = sa.text(
+        f"""
+        SELECT org_code, prompt_id, prompt
+        FROM {TABLE_NAME}
+        WHERE (org_code, prompt_id) > (:org_code, :prompt_id)
+        ORDER BY org_code, prompt_id
+        LIMIT :limit
+        """  # noqa: S608
+    )
+    update_hash = sa.text(
+        f"""
+        UPDATE {TABLE_NAME}
+        SET prompt_hash = :prompt_hash
+        WHERE org_code = :org_code AND prompt_id = :prompt_id
+        """  # noqa: S608
+    )
+    after = {"org_code": "", "prompt_id": ""}
+    while rows := conn.execute(select_batch, {**after, "limit": BATCH_SIZE}).all():
+        conn.execute(
+            update_hash,
+            [
+                {
+                    "org_code": row.org_code,
+                    "prompt_id": row.prompt_id,
+                    "prompt_hash": _fingerprint(row.prompt),
+                }
+                for row in rows
+            ],
+        )
+        after = {"org_code": rows[-1].org_code, "prompt_id": rows[-1].prompt_id}
+
+
+def _merge_duplicates() -> None:
+    """Keep the oldest row per normalized prompt, counting the others."""
+    conn = op.get_bind()
+    conn.execute(
+        sa.text(
+            f"""
+            UPDATE {TABLE_NAME}
+            SET occurrences = grouped.occurrences,
+                last_seen_at = grouped.last_seen_at
+            FROM (
+                SELECT
+                    org_code,
+                    prompt_hash,
+                    COUNT(*) AS occurrences,
+                    MAX(created_at) AS last_seen_at
+                FROM {TABLE_NAME}
+                GROUP BY org_code, prompt_hash
+            ) AS grouped
+            WHERE {TABLE_NAME}.org_code = grouped.org_code
+                AND {TABLE_NAME}.prompt_hash = grouped.prompt_hash
+            """  # noqa: S608
+        )
+    )
+    conn.execute(
+        sa.text(
+            f"""
+            DELETE FROM {TABLE_NAME}
+            WHERE (org_code, prompt_id) IN (
+                SELECT org_code, prompt_id
+                FROM (
+                    SELECT
+                        org_code,
+                        prompt_id,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY org_code, prompt_hash
+                            ORDER BY created_at, prompt_id
+                        ) AS position
+                    FROM {TABLE_NAME}
+                )
+                WHERE position > 1
+            )
+            """  # noqa: S608
+        )
+    )
+
+
+def upgrade() -> None:
+    op.add_column(
+        table_name=TABLE_NAME,
+        column=sa.Column("prompt_hash", sa.String(length=64), nullable=True),
+    )
+    op.add_column(
+        table_name=TABLE_NAME,
+        column=sa.Column(
+            "occurrences", sa.Integer(), nullable=False, server_default="1"
+        ),
+    )
+    op.add_column(
+        table_name=TABLE_NAME,
+        column=sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        table_name=TABLE_NAME,
+        column=sa.Column("cluster_id", sa.UUID(), nullable=True),
+    )
+    _fill_prompt_hashes()
+    _merge_duplicates()
+    op.create_index(
+        index_name=PROMPT_HASH_INDEX,
+        table_name=TABLE_NAME,
+        columns=["org_code", "prompt_hash"],
+        unique=True,
+    )
+    op.create_index(
+        index_name=CLUSTER_INDEX,
+        table_name=TABLE_NAME,
+        columns=["org_code", "cluster_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(index_name=CLUSTER_INDEX, table_name=TABLE_NAME)
+    op.drop_index(index_name=PROMPT_HASH_INDEX, table_name=TABLE_NAME)
+    op.drop_column(table_name=TABLE_NAME, column_name="cluster_id")
+    op.drop_column(table_name=TABLE_NAME, column_name="last_seen_at")
+    op.drop_column(table_name=TABLE_NAME, column_name="occurrences")
+    op.drop_column(table_name=TABLE_NAME, column_name="prompt_hash")
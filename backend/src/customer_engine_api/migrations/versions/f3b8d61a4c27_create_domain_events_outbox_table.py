@@ -0,0 +1,48 @@
+"""
+Create domain events outbox table.
+
+Revision ID: f3b8d61a4c27
+Revises: 7c4e91b2d835
+Create Date: 2026-10-18 18:12:40.118305
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d61a4c27"
+down_revision: str | None = "7c4e91b2d835"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE_NAME = "domain_events_outbox"
+INDEX_NAME = "ix_domain_events_outbox_created_at"
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE_NAME,
+        sa.Column("event_id", sa.UUID(), primary_key=True),
+        sa.Column("org_code", sa.String(), nullable=True),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        index_name=INDEX_NAME,
+        table_name=TABLE_NAME,
+        columns=["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(index_name=INDEX_NAME, table_name=TABLE_NAME)
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import clustering
+from customer_engine_api.core.text import fingerprint
+
+
+@pytest.mark.unit()
+def test_cluster_groups_around_first_unassigned_vector() -> None:
+    leaders = clustering.cluster(
+        vectors=[[1, 0], [0, 1], [0.99, 0.1], [0.1, 0.99], [-1, 0], [0, 0]],
+        similarity_threshold=0.95,
+    )
+    assert leaders.tolist() == [0, 1, 0, 1, 4, 5]
+    assert clustering.cluster(vectors=[], similarity_threshold=0.9).tolist() == []
+
+
+@pytest.mark.unit()
+def test_fingerprint_ignores_case_and_spacing() -> None:
+    assert fingerprint("  Cuál es el  PRECIO?") == fingerprint("cuál es el precio?")
+    assert fingerprint("precio") != fingerprint("precios")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from customer_engine_api.core import db
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.unit()
+async def test_begin_commits_and_rolls_back(tmp_path: Path) -> None:
+    engine = db.AsyncEngine(
+        sync_engine=create_engine(f"sqlite:///{tmp_path / 'test.db'}"),
+        max_workers=2,
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (name TEXT)"))
+        await conn.execute(
+            text("INSERT INTO items (name) VALUES (:name)"),
+            [{"name": "a"}, {"name": "b"}],
+        )
+
+    with pytest.raises(RuntimeError):
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT name FROM items"))
+            await conn.execute(
+                text("INSERT INTO items (name) VALUES (:name)"),
+                [{"name": "c"}, {"name": "d"}],
+            )
+            raise RuntimeError
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text("SELECT name FROM items"))).fetchall()
+
+    assert sorted(row.name for row in rows) == ["a", "b"]
+    await engine.dispose()
+
+
+@pytest.mark.unit()
+async def test_after_commit_callbacks_only_run_on_commit(tmp_path: Path) -> None:
+    engine = db.AsyncEngine(
+        sync_engine=create_engine(f"sqlite:///{tmp_path / 'test.db'}"),
+        max_workers=2,
+    )
+    ran: list[str] = []
+
+    def fail() -> None:
+        raise RuntimeError
+
+    async with engine.begin() as conn:
+        conn.after_commit(fail)
+        conn.after_commit(lambda: ran.append("committed"))
+        assert ran == []
+
+    with pytest.raises(RuntimeError):
+        async with engine.begin() as conn:
+            conn.after_commit(lambda: ran.append("rolled back"))
+            raise RuntimeError
+
+    async with engine.connect() as conn:
+        conn.after_commit(lambda: ran.append("not committed"))
+
+    assert ran == ["committed"]
+    await engine.dispose()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import embedding_cache, embeddings
+from customer_engine_api.core.cache import TTLCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import cohere
+
+MODEL = "cohere:embed-multilingual-light-v3.0"
+
+
+@dataclass
+class _EmbedResponse:
+    embeddings: list[list[float]]
+
+
+@dataclass
+class _FakeCohere:
+    calls: list[list[str]] = field(default_factory=list)
+
+    async def embed(self, **kwargs: Any) -> _EmbedResponse:  # noqa: ANN401
+        texts: list[str] = kwargs["texts"]
+        self.calls.append(texts)
+        return _EmbedResponse(embeddings=[[float(len(t)), 0.5] for t in texts])
+
+
+@pytest.mark.unit()
+def test_ttl_cache_evicts_lru_and_expired() -> None:
+    now = 0.0
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=10, clock=lambda: now)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+    now = 11.0
+    assert cache.get("a") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit()
+def test_ttl_cache_skips_values_loaded_before_an_invalidation() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=10)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", 1, generation=generation)
+    assert cache.get("a") is None
+    cache.set("a", 2, generation=cache.generation)
+    assert cache.get("a") == 2  # noqa: PLR2004
+
+
+@pytest.mark.unit()
+async def test_disk_tier_survives_restart_and_promotes(tmp_path: Path) -> None:
+    path = str(tmp_path / "embeddings.db")
+    disk = embedding_cache.SqliteEmbeddingCache(path=path)
+    await disk.set_many(MODEL, "search_document", ["Hola"], [[0.25, 0.5]])
+    disk.close()
+
+    memory = embedding_cache.MemoryEmbeddingCache(max_size=10, ttl=60)
+    tiered = embedding_cache.TieredEmbeddingCache(
+        tiers=[memory, embedding_cache.SqliteEmbeddingCache(path=path)]
+    )
+    assert await tiered.get_many(MODEL, "search_document", ["  hola ", "adios"]) == [
+        [0.25, 0.5],
+        None,
+    ]
+    assert await memory.get_many(MODEL, "search_document", ["HOLA"]) == [[0.25, 0.5]]
+    assert await memory.get_many(MODEL, "search_query", ["hola"]) == [None]
+    assert tiered.stats.hits == 1
+    assert tiered.stats.misses == 1
+
+
+@pytest.mark.unit()
+async def test_disk_tier_drops_expired_and_oldest_rows(tmp_path: Path) -> None:
+    path = str(tmp_path / "embeddings.db")
+    now = 0.0
+    disk = embedding_cache.SqliteEmbeddingCache(
+        path=path, ttl=100, max_rows=2, clock=lambda: now
+    )
+    for n, t in enumerate(["a", "b", "c"]):
+        now = float(n)
+        await disk.set_many(MODEL, "search_document", [t], [[float(n)]])
+    now = 50.0
+    assert await disk.get_many(MODEL, "search_document", ["a", "b", "c"]) == [
+        [0.0],
+        [1.0],
+        [2.0],
+    ]
+    disk.close()
+
+    disk = embedding_cache.SqliteEmbeddingCache(
+        path=path, ttl=100, max_rows=2, clock=lambda: now
+    )
+    assert await disk.get_many(MODEL, "search_document", ["a", "b", "c"]) == [
+        None,
+        [1.0],
+        [2.0],
+    ]
+    now = 101.5
+    assert await disk.get_many(MODEL, "search_document", ["b", "c"]) == [None, [2.0]]
+    disk.close()
+
+
+@pytest.mark.unit()
+async def test_embed_skips_cohere_on_cached_prompts() -> None:
+    client = _FakeCohere()
+    cache = embedding_cache.MemoryEmbeddingCache(max_size=10, ttl=60)
+
+    first = await embeddings.embed_prompt_or_examples(
+        client=cast("cohere.AsyncClient", client),
+        model=MODEL,
+        prompt_or_examples=["hola", "precio"],
+        cache=cache,
+    )
+    second = await embeddings.embed_prompt_or_examples(
+        client=cast("cohere.AsyncClient", client),
+        model=MODEL,
+        prompt_or_examples=["Hola", "horario?", "precio"],
+        cache=cache,
+    )
+
+    assert client.calls == [["hola", "precio"], ["horario?"]]
+    assert second == [first[0], [8.0, 0.5], first[1]]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import embeddings
+
+if TYPE_CHECKING:
+    import cohere
+
+MODEL = "cohere:embed-multilingual-light-v3.0"
+
+
+@dataclass
+class _EmbedResponse:
+    embeddings: list[list[float]]
+
+
+@dataclass
+class _FakeCohere:
+    calls: list[list[str]] = field(default_factory=list)
+
+    async def embed(self, **kwargs: Any) -> _EmbedResponse:  # noqa: ANN401
+        texts: list[str] = kwargs["texts"]
+        self.calls.append(texts)
+        await asyncio.sleep(0)
+        return _EmbedResponse(embeddings=[[float(len(t))] for t in texts])
+
+
+@pytest.mark.unit()
+async def test_batcher_coalesces_concurrent_requests() -> None:
+    client = _FakeCohere()
+    batcher = embeddings.EmbeddingBatcher(max_batch_size=96, max_wait=0.01)
+
+    results = await asyncio.gather(
+        *(
+            embeddings.embed_prompt_or_examples(
+                client=cast("cohere.AsyncClient", client),
+                model=MODEL,
+                prompt_or_examples=prompt,
+                batcher=batcher,
+            )
+            for prompt in ["hola", "precio", "hola", "horario?"]
+        )
+    )
+
+    assert client.calls == [["hola", "precio", "horario?"]]
+    assert results == [[[4.0]], [[6.0]], [[4.0]], [[8.0]]]
+
+
+@pytest.mark.unit()
+async def test_batcher_flushes_when_full() -> None:
+    client = _FakeCohere()
+    batcher = embeddings.EmbeddingBatcher(max_batch_size=2, max_wait=60)
+
+    results = await asyncio.gather(
+        batcher.embed(
+            client=cast("cohere.AsyncClient", client),
+            model=MODEL,
+            input_type="search_document",
+            texts=["a", "bb", "ccc"],
+        ),
+        batcher.embed(
+            client=cast("cohere.AsyncClient", client),
+            model=MODEL,
+            input_type="search_document",
+            texts=["dddd", "eeeee"],
+        ),
+    )
+
+    assert sorted(client.calls) == [["a", "bb"], ["ccc"], ["dddd", "eeeee"]]
+    assert results == [[[1.0], [2.0], [3.0]], [[4.0], [5.0]]]
+
+
+@pytest.mark.unit()
+def test_blob_round_trip_keeps_float32_values() -> None:
+    blob = embeddings.to_blob([0.5, -1.25, 3.0])
+    assert len(blob) == 3 * 4
+    assert embeddings.from_blob(blob) == [0.5, -1.25, 3.0]
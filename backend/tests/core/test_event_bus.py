@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import orjson
+import pytest
+from sqlalchemy import create_engine, text
+
+from customer_engine_api.core import db, event_bus
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+published: list[str] = []
+
+
+@dataclass(frozen=True)
+class Deleted(event_bus.BatchedEvent):
+    org_code: str
+    example_id: int
+
+    async def publish(self) -> None:
+        published.append(f"deleted {self.example_id}")
+
+    @classmethod
+    async def publish_batch(cls, events: list[Deleted]) -> None:
+        published.append(f"{len(events)} deleted from {events[0].org_code}")
+
+
+@dataclass(frozen=True)
+class Updated:
+    org_code: str
+
+    async def publish(self) -> None:
+        published.append(f"updated {self.org_code}")
+
+
+@pytest.mark.unit()
+def test_coalesce_groups_batched_events_per_org() -> None:
+    events: list[Any] = [
+        Deleted(org_code="a", example_id=1),
+        Updated(org_code="a"),
+        Deleted(org_code="b", example_id=2),
+        Deleted(org_code="a", example_id=3),
+    ]
+    groups = event_bus.coalesce(events)
+    assert [(g.org_code, len(g.events)) for g in groups] == [
+        ("a", 2),
+        ("a", 1),
+        ("b", 1),
+    ]
+    assert groups[0].event_type == f"{Deleted.__module__}.Deleted"
+    assert event_bus.event_type(Deleted(org_code="a", example_id=1)) == (
+        f"{Deleted.__module__}.Deleted"
+    )
+
+
+@pytest.mark.unit()
+async def test_bus_publishes_to_sinks_and_drops_over_capacity(tmp_path: Path) -> None:
+    published.clear()
+    engine = db.AsyncEngine(
+        sync_engine=create_engine(f"sqlite:///{tmp_path / 'events.db'}"),
+        max_workers=1,
+    )
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE domain_events_outbox (event_id CHAR(32) PRIMARY KEY, "
+                "org_code VARCHAR, event_type VARCHAR, payload VARCHAR, "
+                "created_at DATETIME)"
+            )
+        )
+
+    bus = event_bus.EventBus(
+        sinks=[
+            event_bus.LogSink(),
+            event_bus.TableSink(
+                engine=engine, clock=lambda: datetime.datetime(2024, 1, 1)
+            ),
+        ],
+        max_queued=3,
+    )
+    bus.start()
+    bus.publish(events=[Deleted(org_code="a", example_id=i) for i in range(5)])
+    bus.publish(events=[Updated(org_code="a")])
+    await bus.stop(timeout=5)
+
+    assert published == ["3 deleted from a"]
+    assert bus.metrics.published == 3
+    assert bus.metrics.dropped == 3
+    async with engine.connect() as conn:
+        rows = (
+            await conn.execute(
+                text("SELECT event_type, payload FROM domain_events_outbox")
+            )
+        ).fetchall()
+    await engine.dispose()
+    assert [(row[0], orjson.loads(row[1])) for row in rows] == [
+        (
+            f"{Deleted.__module__}.Deleted",
+            [{"org_code": "a", "example_id": i} for i in range(3)],
+        )
+    ]
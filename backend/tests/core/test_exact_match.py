@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+
+from customer_engine_api.core import text
+from customer_engine_api.core.automatic_responses import exact_match
+
+
+@pytest.mark.unit()
+def test_fold_drops_case_accents_and_punctuation() -> None:
+    assert text.fold("  ¿Dónde están mis PEDIDOS?! ") == "donde estan mis pedidos"
+    assert text.folded_fingerprint("Hola, qué tal") == text.folded_fingerprint(
+        "hola que tal"
+    )
+    assert text.fold("ｈｏｌａ") == "hola"
+
+
+@pytest.mark.unit()
+async def test_lookup_loads_organization_once_and_syncs_writes() -> None:
+    now = 0.0
+    index = exact_match.ExactMatchIndex(max_size=10, ttl=60, clock=lambda: now)
+    shipping, greeting = uuid4(), uuid4()
+    first, second = uuid4(), uuid4()
+    loads = 0
+
+    async def loader() -> list[exact_match.ExampleRow]:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0)
+        return [(first, "Where is my order?", shipping)]
+
+    results = await asyncio.gather(
+        *(
+            index.lookup(org_code="org", prompt="where is my order", loader=loader)
+            for _ in range(5)
+        )
+    )
+    assert results == [shipping] * 5
+    assert loads == 1
+    assert await index.lookup(org_code="org", prompt="hello", loader=loader) is None
+
+    index.add(
+        org_code="org",
+        example_ids=[second],
+        examples=["Hello!"],
+        automatic_response_id=greeting,
+    )
+    assert await index.lookup(org_code="org", prompt="hello", loader=loader) == greeting
+
+    index.remove(org_code="org", example_ids=[second])
+    assert await index.lookup(org_code="org", prompt="hello", loader=loader) is None
+    assert index.stats.hits == 6
+    assert index.stats.misses == 2
+
+    now = 61.0
+    await index.lookup(org_code="org", prompt="hello", loader=loader)
+    assert loads == 2
+
+
+@pytest.mark.unit()
+async def test_ambiguous_text_and_unloaded_organizations_never_match() -> None:
+    index = exact_match.ExactMatchIndex(max_size=10, ttl=60)
+    rows: list[exact_match.ExampleRow] = [
+        (uuid4(), "help", uuid4()),
+        (uuid4(), "Help.", uuid4()),
+    ]
+
+    async def loader() -> list[exact_match.ExampleRow]:
+        return rows
+
+    index.add(
+        org_code="org",
+        example_ids=[uuid4()],
+        examples=["ignored"],
+        automatic_response_id=uuid4(),
+    )
+    assert await index.lookup(org_code="org", prompt="help", loader=loader) is None
+    assert await index.lookup(org_code="org", prompt="ignored", loader=loader) is None
+
+    index.remove(org_code="org", example_ids=[rows[1][0]])
+    expected: UUID = rows[0][2]
+    assert await index.lookup(org_code="org", prompt="HELP", loader=loader) == expected
+
+
+@pytest.mark.unit()
+async def test_writes_during_a_load_discard_the_loaded_organization() -> None:
+    index = exact_match.ExactMatchIndex(max_size=10, ttl=60)
+    shipping = uuid4()
+    release = asyncio.Event()
+    loads = 0
+
+    async def loader() -> list[exact_match.ExampleRow]:
+        nonlocal loads
+        loads += 1
+        await release.wait()
+        return [(uuid4(), "Where is my order?", shipping)]
+
+    lookup = asyncio.create_task(
+        index.lookup(org_code="org", prompt="where is my order", loader=loader)
+    )
+    await asyncio.sleep(0)
+    index.remove(org_code="org", example_ids=[uuid4()])
+    release.set()
+    assert await lookup == shipping
+    assert len(index) == 0
+
+    await index.lookup(org_code="org", prompt="hello", loader=loader)
+    assert loads == 2
+    assert len(index) == 1
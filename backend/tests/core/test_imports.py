@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import imports
+
+
+@pytest.mark.unit()
+def test_read_rows_from_csv_and_jsonl() -> None:
+    csv_rows = list(
+        imports.read_rows(
+            stream=io.StringIO(
+                'name,response,example\nPrices,"See ""menu""",how much?\n'
+                'Prices,,"price\nlist"\n'
+            ),
+            file_format="csv",
+        )
+    )
+    assert csv_rows == [
+        imports.ImportRow(name="Prices", response='See "menu"', example="how much?"),
+        imports.ImportRow(name="Prices", response=None, example="price\nlist"),
+    ]
+
+    jsonl_rows = list(
+        imports.read_rows(
+            stream=io.StringIO(
+                '{"name": "Hours", "response": "9 to 5", "example": "open?"}\n'
+                "\n"
+                '{"name": "Hours", "example": "closing time"}\n'
+            ),
+            file_format="jsonl",
+        )
+    )
+    assert jsonl_rows == [
+        imports.ImportRow(name="Hours", response="9 to 5", example="open?"),
+        imports.ImportRow(name="Hours", response=None, example="closing time"),
+    ]
+
+    with pytest.raises(imports.InvalidImportRowError, match="line 2"):
+        list(
+            imports.read_rows(
+                stream=io.StringIO('{"name": "Hours", "example": "a"}\n{"name": 1}\n'),
+                file_format="jsonl",
+            )
+        )
+
+
+@pytest.mark.unit()
+async def test_run_import_commits_batches_and_resumes() -> None:
+    rows = [
+        imports.ImportRow(name="n", response="r", example=str(i)) for i in range(7)
+    ]
+    batches: list[list[str]] = []
+
+    async def process_batch(
+        batch: list[imports.ImportRow],
+    ) -> imports.ImportProgress:
+        if batch[0].example == "4":
+            msg = "provider down"
+            raise RuntimeError(msg)
+        batches.append([row.example for row in batch])
+        return imports.ImportProgress(rows_committed=len(batch), examples_created=1)
+
+    with pytest.raises(imports.ImportInterruptedError) as exc_info:
+        await imports.run_import(
+            rows=iter(rows), process_batch=process_batch, batch_size=2, skip_rows=0
+        )
+    assert exc_info.value.progress.rows_committed == 4
+    assert batches == [["0", "1"], ["2", "3"]]
+
+    batches.clear()
+    progress = await imports.run_import(
+        rows=iter(rows[:4] + rows[5:]),
+        process_batch=process_batch,
+        batch_size=2,
+        skip_rows=4,
+    )
+    assert batches == [["5", "6"]]
+    assert progress == imports.ImportProgress(rows_committed=6, examples_created=1)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from customer_engine_api.core import jobs
+from customer_engine_api.core.time import now
+
+
+@pytest.mark.unit()
+async def test_worker_pool_limits_concurrency_per_org() -> None:
+    running: dict[str, int] = {"org_a": 0, "org_b": 0}
+    peak: dict[str, int] = {"org_a": 0, "org_b": 0}
+
+    async def handler(job: jobs.Job) -> None:
+        running[job.org_code] += 1
+        peak[job.org_code] = max(peak[job.org_code], running[job.org_code])
+        await asyncio.sleep(0.01)
+        running[job.org_code] -= 1
+
+    pool = jobs.WorkerPool(
+        backend=jobs.InMemoryJobBackend(max_size=100),
+        handler=handler,
+        workers=6,
+        max_in_flight_per_org=2,
+        max_parked=100,
+    )
+    pool.start()
+    for i in range(20):
+        assert await pool.enqueue(
+            jobs.Job(
+                org_code="org_a" if i % 2 == 0 else "org_b",
+                messages=[],
+                received_at=now(),
+            )
+        )
+    await pool.stop(timeout=5)
+
+    assert pool.metrics.processed == 20  # noqa: PLR2004
+    assert peak == {"org_a": 2, "org_b": 2}
+
+
+@pytest.mark.unit()
+async def test_worker_pool_rejects_when_full() -> None:
+    async def handler(job: jobs.Job) -> None:
+        _ = job
+        raise RuntimeError
+
+    pool = jobs.WorkerPool(
+        backend=jobs.InMemoryJobBackend(max_size=1),
+        handler=handler,
+        workers=1,
+        max_in_flight_per_org=1,
+        max_parked=1,
+    )
+    job = jobs.Job(org_code="org", messages=[], received_at=now())
+    assert await pool.enqueue(job)
+    assert not await pool.enqueue(job)
+    assert pool.metrics.rejected == 1
+
+    pool.start()
+    await pool.stop(timeout=5)
+    assert pool.metrics.failed == 1
+
+
+@pytest.mark.unit()
+async def test_worker_pool_parks_jobs_of_busy_orgs_without_taking_workers() -> None:
+    release = asyncio.Event()
+    quiet_done = asyncio.Event()
+    done: list[str] = []
+
+    async def handler(job: jobs.Job) -> None:
+        if job.org_code == "noisy":
+            await release.wait()
+        done.append(job.org_code)
+        if job.org_code == "quiet":
+            quiet_done.set()
+
+    pool = jobs.WorkerPool(
+        backend=jobs.InMemoryJobBackend(max_size=100),
+        handler=handler,
+        workers=2,
+        max_in_flight_per_org=1,
+        max_parked=100,
+    )
+    pool.start()
+    for org_code in ["noisy"] * 5 + ["quiet"]:
+        assert await pool.enqueue(
+            jobs.Job(org_code=org_code, messages=[], received_at=now())
+        )
+
+    async with asyncio.timeout(5):
+        await quiet_done.wait()
+    assert done == ["quiet"]
+    assert pool.metrics.waiting_for_org_slot == 4  # noqa: PLR2004
+
+    release.set()
+    await pool.stop(timeout=5)
+    assert done == ["quiet"] + ["noisy"] * 5
+    assert pool.metrics.processed == 6  # noqa: PLR2004
+    assert pool._in_flight_per_org == {}  # noqa: SLF001
+
+
+@pytest.mark.unit()
+async def test_worker_pool_counts_jobs_in_flight_before_they_run() -> None:
+    done: list[str] = []
+
+    async def handler(job: jobs.Job) -> None:
+        done.append(job.org_code)
+
+    backend = jobs.InMemoryJobBackend(max_size=100)
+    pool = jobs.WorkerPool(
+        backend=backend,
+        handler=handler,
+        workers=2,
+        max_in_flight_per_org=1,
+        max_parked=100,
+    )
+    assert await pool.enqueue(jobs.Job(org_code="a", messages=[], received_at=now()))
+    # What the dispatcher does once it takes a job from the backend.
+    job = await backend.get()
+    pool._in_flight_per_org["a"] = 1  # noqa: SLF001
+    pool._start(job=job)  # noqa: SLF001
+    assert pool.metrics.in_flight == 1
+    assert not pool._drained.is_set()  # noqa: SLF001
+
+    await pool.stop(timeout=5)
+    assert done == ["a"]
+    assert pool.metrics.in_flight == 0
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import dataclasses
+import time
+
+import httpx
+import jwt as pyjwt
+import orjson
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
 
 from customer_engine_api.core import jwt
 
@@ -16,3 +23,62 @@ def test_decode_token() -> None:
         org_code="org_ca3fa6106b9",
         expiration_time=1710450062,
     )
+
+
+def _signed_token(private_key: rsa.RSAPrivateKey, key_id: str, exp: float) -> str:
+    return pyjwt.encode(
+        {
+            "jti": "token",
+            "scp": ["openid"],
+            "sub": "user",
+            "org_code": "org",
+            "exp": int(exp),
+        },
+        key=private_key,
+        algorithm="RS256",
+        headers={"kid": key_id},
+    )
+
+
+@pytest.mark.unit()
+async def test_jwks_verifies_signature_and_refreshes_unknown_keys() -> None:
+    signing_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = orjson.loads(pyjwt.algorithms.RSAAlgorithm.to_jwk(signing_key.public_key()))
+    requests: list[httpx.Request] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"keys": [{**jwk, "kid": "k1", "use": "sig"}]})
+
+    jwks = jwt.JwksCache(
+        url="https://kinde.test/.well-known/jwks",
+        transport=httpx.MockTransport(_handler),
+    )
+    exp = time.time() + 60
+    token = await jwks.decode(_signed_token(signing_key, key_id="k1", exp=exp))
+    assert (token.org_code, token.expiration_time) == ("org", int(exp))
+
+    with pytest.raises(jwt.TokenVerificationError):
+        await jwks.decode(_signed_token(other_key, key_id="k1", exp=exp))
+    with pytest.raises(jwt.UnknownSigningKeyError):
+        await jwks.decode(_signed_token(signing_key, key_id="k2", exp=exp))
+    assert len(requests) == 1
+    await jwks.stop()
+
+
+@pytest.mark.unit()
+def test_token_cache_keeps_tokens_until_expiration() -> None:
+    cache = jwt.TokenCache(max_size=10)
+    valid = jwt.KindeToken(
+        token_id="a",
+        scopes=[],
+        subject="user",
+        org_code="org",
+        expiration_time=int(time.time()) + 60,
+    )
+    cache.set("valid", valid)
+    cache.set("expired", dataclasses.replace(valid, expiration_time=1))
+    assert cache.get("valid") == valid
+    assert cache.get("expired") is None
+    assert len(cache) == 1
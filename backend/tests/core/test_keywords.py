@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import keywords
+
+
+@pytest.mark.unit()
+def test_automaton_finds_overlapping_patterns() -> None:
+    automaton = keywords.Automaton({"he": 1, "she": 2, "his": 3, "hers": 4})
+    assert sorted(automaton.search("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+    assert list(keywords.Automaton({}).search("anything")) == []
+
+
+@pytest.mark.unit()
+def test_normalize_keywords_folds_and_deduplicates() -> None:
+    assert keywords.normalize_keywords(["Factura", "factura!", " ", "Horário"]) == [
+        "factura",
+        "horario",
+    ]
+
+
+@pytest.mark.unit()
+async def test_rules_match_whole_words_and_prefer_longest() -> None:
+    now = 0.0
+    rules = keywords.KeywordRules(max_size=10, ttl=60, clock=lambda: now)
+    invoices, refunds, schedule = uuid4(), uuid4(), uuid4()
+    loads = 0
+
+    async def loader() -> list[keywords.KeywordRow]:
+        nonlocal loads
+        loads += 1
+        return [
+            (invoices, "factura"),
+            (refunds, "reembolso"),
+            (refunds, "reembolso de factura"),
+            (schedule, "Horario"),
+        ]
+
+    async def match(prompt: str) -> object:
+        return await rules.match(org_code="org", prompt=prompt, loader=loader)
+
+    assert await match("Necesito mi FACTURA, por favor") == invoices
+    assert await match("¿Cuál es el horario?") == schedule
+    assert await match("quiero un reembolso de factura") == refunds
+    assert await match("facturas pendientes") is None
+    assert await match("factura y horario") is None
+    assert loads == 1
+
+    rules.set(org_code="org", automatic_response_id=schedule, keywords=[])
+    assert await match("factura y horario") == invoices
+    rules.set(org_code="other", automatic_response_id=schedule, keywords=["x"])
+    assert len(rules) == 1
+
+    now = 61.0
+    assert await match("factura y horario") is None
+    assert loads == 2
+
+
+@pytest.mark.unit()
+async def test_set_on_an_unloaded_organization_discards_a_load_in_progress() -> None:
+    rules = keywords.KeywordRules(max_size=10, ttl=60)
+    invoices = uuid4()
+    release = asyncio.Event()
+
+    async def loader() -> list[keywords.KeywordRow]:
+        await release.wait()
+        return [(invoices, "factura")]
+
+    match = asyncio.create_task(
+        rules.match(org_code="org", prompt="factura", loader=loader)
+    )
+    await asyncio.sleep(0)
+    rules.set(org_code="org", automatic_response_id=invoices, keywords=[])
+    release.set()
+    assert await match == invoices
+    assert len(rules) == 0
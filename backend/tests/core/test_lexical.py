@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from uuid import UUID, uuid4
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import lexical
+from customer_engine_api.core.cache import LoadingCache
+
+
+@pytest.mark.unit()
+async def test_loading_cache_shares_concurrent_loads_and_expires() -> None:
+    now = 0.0
+    cache: LoadingCache[str, int] = LoadingCache(max_size=2, ttl=10, clock=lambda: now)
+    loads = 0
+
+    async def loader() -> int:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0)
+        return loads
+
+    assert await asyncio.gather(*(cache.get("a", loader) for _ in range(3))) == [
+        1,
+        1,
+        1,
+    ]
+    assert cache.peek("a") == 1
+    now = 10.0
+    assert cache.peek("a") is None
+    assert await cache.get("a", loader) == 2
+    cache.invalidate("a")
+    assert len(cache) == 0
+    assert cache._loads == {}  # noqa: SLF001
+
+
+@pytest.mark.unit()
+async def test_loading_cache_evicts_least_recently_used() -> None:
+    cache: LoadingCache[str, str] = LoadingCache(max_size=2, ttl=10)
+
+    async def loader(key: str) -> str:
+        return key
+
+    for key in ["a", "b", "a", "c"]:
+        await cache.get(key, functools.partial(loader, key))
+    assert cache.peek("a") == "a"
+    assert cache.peek("b") is None
+    assert cache.peek("c") == "c"
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.unit()
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    a, b, c = uuid4(), uuid4(), uuid4()
+    scores = lexical.reciprocal_rank_fusion(rankings=[[a, b], [b, c]], k=60)
+    assert max(scores, key=scores.__getitem__) == b
+    assert scores[a] == pytest.approx(1 / 61)
+    assert scores[c] == pytest.approx(1 / 62)
+
+
+@pytest.mark.unit()
+async def test_search_ranks_covering_examples_and_syncs_writes() -> None:
+    index = lexical.LexicalIndex(max_size=10, ttl=60)
+    examples = {
+        uuid4(): "¿Cuál es el precio del SKU-1234?",
+        uuid4(): "Horario de atención",
+        uuid4(): "Quiero mi factura",
+        uuid4(): "El producto SKU 9981 está agotado",
+        uuid4(): "Hola, buenos días",
+    }
+    ids = list(examples)
+
+    async def loader() -> list[lexical.ExampleRow]:
+        return list(examples.items())
+
+    async def search(prompt: str) -> list[UUID]:
+        return [
+            example_id
+            for example_id, _ in await index.search(
+                org_code="org",
+                prompt=prompt,
+                loader=loader,
+                limit=3,
+                min_score=0.5,
+            )
+        ]
+
+    assert await search("sku 1234") == [ids[0]]
+    assert await search("FACTURA") == [ids[2]]
+    assert await search("horario de atencion") == [ids[1]]
+    assert await search("zzz") == []
+
+    new = uuid4()
+    index.add(org_code="org", example_ids=[new], examples=["reembolso factura"])
+    assert await search("reembolso") == [new]
+    index.remove(org_code="org", example_ids=[ids[2]])
+    assert await search("factura") == [new]
+    assert index.stats.hits == 5
+    assert index.stats.misses == 1
+
+
+@pytest.mark.unit()
+async def test_compaction_keeps_live_examples() -> None:
+    index = lexical.LexicalIndex(max_size=10, ttl=60)
+    removed = [uuid4() for _ in range(100)]
+    kept = uuid4()
+
+    async def loader() -> list[lexical.ExampleRow]:
+        return [*((example_id, "envio") for example_id in removed), (kept, "envio")]
+
+    await index.search(
+        org_code="org", prompt="envio", loader=loader, limit=1, min_score=0
+    )
+    index.remove(org_code="org", example_ids=removed)
+    assert await index.search(
+        org_code="org", prompt="envio", loader=loader, limit=5, min_score=0
+    ) == [(kept, pytest.approx(1.0))]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import io
+
+import loguru
+import orjson
+import pytest
+
+from customer_engine_api.core import logging
+
+
+@pytest.mark.unit()
+def test_json_logging_with_module_levels() -> None:
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    logger = logging._configure_logger(  # noqa: SLF001
+        logger=loguru.logger,
+        level="ERROR",
+        log_format="json",
+        module_levels=logging._parse_module_levels(  # noqa: SLF001
+            f"test=CRITICAL, {__name__}=DEBUG"
+        ),
+        debug_sample_rate=0,
+        stream=stream,
+    )
+    try:
+        logger.debug("sampled out")
+        logger.info("Example {example_id} deleted", example_id=1)
+        logger.complete()
+        lines = [orjson.loads(line) for line in stream.buffer.getvalue().splitlines()]  # type: ignore[attr-defined]
+    finally:
+        logging._configure_logger(logger=loguru.logger, level="INFO")  # noqa: SLF001
+
+    assert len(lines) == 1
+    assert lines[0]["message"] == "Example 1 deleted"
+    assert lines[0]["level"] == "INFO"
+    assert lines[0]["logger"] == __name__
+    assert lines[0]["example_id"] == 1
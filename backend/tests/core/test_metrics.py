@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from customer_engine_api.core import metrics
+
+
+@pytest.mark.unit()
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = metrics.Histogram(
+        name="latency_seconds",
+        documentation="Latency.",
+        label_names=("stage",),
+        buckets=(0.1, 1.0),
+    )
+    child = histogram.labels(stage="embed")
+    for value in (0.05, 0.1, 0.5, 2.0):
+        child.observe(value)
+
+    assert list(histogram.samples()) == [
+        ("latency_seconds_bucket", (("stage", "embed"), ("le", "0.1")), 2),
+        ("latency_seconds_bucket", (("stage", "embed"), ("le", "1")), 3),
+        ("latency_seconds_bucket", (("stage", "embed"), ("le", "+Inf")), 4),
+        ("latency_seconds_count", (("stage", "embed"),), 4),
+        ("latency_seconds_sum", (("stage", "embed"),), pytest.approx(2.65)),
+    ]
+    with pytest.raises(ValueError, match="expects labels"):
+        histogram.labels(command="x")
+
+
+@pytest.mark.unit()
+def test_registry_exposes_text_format() -> None:
+    registry = metrics.Registry()
+    counter = metrics.Counter(
+        name="prompts_total", documentation="Prompts.", label_names=("result",)
+    )
+    gauge = metrics.Gauge(name="in_flight", documentation="In flight.")
+    registry.register(counter)
+    registry.register(gauge)
+    registry.register(
+        metrics.CallbackMetric(
+            name="cache_size",
+            documentation="Cache size.",
+            type_="gauge",
+            callback=lambda: {('say "hi"',): 3},
+            label_names=("cache",),
+        )
+    )
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(gauge)
+
+    counter.labels(result="matched").inc()
+    counter.labels(result="matched").inc(2)
+    with gauge.labels().track_in_progress():
+        assert gauge.labels().value == 1
+
+    assert registry.expose() == (
+        "# HELP prompts_total Prompts.\n"
+        "# TYPE prompts_total counter\n"
+        'prompts_total{result="matched"} 3\n'
+        "# HELP in_flight In flight.\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 0\n"
+        "# HELP cache_size Cache size.\n"
+        "# TYPE cache_size gauge\n"
+        'cache_size{cache="say \\"hi\\""} 3\n'
+    )
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import pytest
+
+from customer_engine_api.core import pagination
+
+
+@pytest.mark.unit()
+def test_cursor_round_trip() -> None:
+    cursor = pagination.encode_cursor(["2024-04-12T17:20:55", "a" * 32])
+    assert pagination.decode_cursor(cursor, size=2) == ["2024-04-12T17:20:55", "a" * 32]
+
+    for invalid_cursor in ("not a cursor", "", pagination.encode_cursor(["a"])):
+        with pytest.raises(pagination.InvalidCursorError):
+            pagination.decode_cursor(invalid_cursor, size=2)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import orjson
+import pytest
+
+from customer_engine_api.core import tracing
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.unit()
+async def test_nested_spans_are_exported_as_otlp_json(tmp_path: Path) -> None:
+    tracer = tracing.Tracer()
+    with tracer.span(name="disabled") as span:
+        assert span is None
+
+    path = tmp_path / "traces.jsonl"
+    tracer.start(exporter=tracing.FileSpanExporter(path=str(path)), service_name="test")
+    with tracer.span(name="parent", attributes={"org_code": "org"}) as parent:
+        with tracer.span(name="child", kind="client") as child:
+            assert child is not None
+            child.attributes["texts"] = 2
+        with pytest.raises(ValueError, match="boom"), tracer.span(name="failing"):
+            raise ValueError("boom")  # noqa: EM101
+    await tracer.stop()
+
+    assert parent is not None
+    (request,) = (orjson.loads(line) for line in path.read_text().splitlines())
+    (resource_spans,) = request["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "test"}}
+    ]
+    spans = {span["name"]: span for span in resource_spans["scopeSpans"][0]["spans"]}
+    assert list(spans) == ["child", "failing", "parent"]
+    assert "parentSpanId" not in spans["parent"]
+    assert spans["parent"]["attributes"] == [
+        {"key": "org_code", "value": {"stringValue": "org"}}
+    ]
+    assert spans["child"]["traceId"] == parent.trace_id
+    assert spans["child"]["parentSpanId"] == parent.span_id
+    assert spans["child"]["kind"] == 3
+    assert spans["child"]["attributes"] == [
+        {"key": "texts", "value": {"intValue": "2"}}
+    ]
+    assert spans["failing"]["status"] == {"code": 2, "message": "ValueError: boom"}
+    assert int(spans["parent"]["endTimeUnixNano"]) >= int(
+        spans["child"]["endTimeUnixNano"]
+    )
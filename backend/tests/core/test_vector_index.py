@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+import pytest
+
+from customer_engine_api.core.automatic_responses import vector_index
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MODEL = "cohere:embed-multilingual-light-v3.0"
+
+
+def _vector(*head: float) -> list[float]:
+    return [*head] + [0.0] * (384 - len(head))
+
+
+@pytest.mark.unit()
+async def test_local_index_search_upsert_and_delete(tmp_path: Path) -> None:
+    index = vector_index.LocalVectorIndex(directory=str(tmp_path))
+    assert not await index.collection_exists(org_code="org")
+    await index.create_collection(org_code="org", model=MODEL)
+    assert await index.collection_exists(org_code="org")
+    assert (
+        await index.search(
+            org_code="org", vector=_vector(1), limit=10, score_threshold=0.8
+        )
+        == []
+    )
+
+    close, far, other = uuid4(), uuid4(), uuid4()
+    await index.upsert(
+        org_code="org",
+        ids=[close, far, other],
+        vectors=[_vector(2, 0.1), _vector(0, 1), _vector(1, 0.5)],
+    )
+    points = await index.search(
+        org_code="org", vector=_vector(1), limit=10, score_threshold=0.8
+    )
+    assert [point.id for point in points] == [close, other]
+    assert points[0].score == pytest.approx(0.9988, abs=1e-4)
+
+    await index.upsert(org_code="org", ids=[far], vectors=[_vector(3)])
+    await index.delete(org_code="org", ids=[close])
+
+    reloaded = vector_index.LocalVectorIndex(directory=str(tmp_path))
+    points = await reloaded.search(
+        org_code="org", vector=_vector(1), limit=1, score_threshold=0.8
+    )
+    assert [(point.id, point.score) for point in points] == [(far, pytest.approx(1.0))]
+    assert index._locks == {}  # noqa: SLF001
+
+
+@pytest.mark.unit()
+async def test_local_index_replays_journal_and_compacts(tmp_path: Path) -> None:
+    index = vector_index.LocalVectorIndex(directory=str(tmp_path), compact_min_rows=4)
+    await index.create_collection(org_code="org", model=MODEL)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    await index.upsert(
+        org_code="org", ids=[first, second], vectors=[_vector(1), _vector(0, 1)]
+    )
+    await index.delete(org_code="org", ids=[first])
+    journal = tmp_path / "org.journal"
+    with journal.open("ab") as f:
+        f.write(b"U\x01\x00")
+
+    reloaded = vector_index.LocalVectorIndex(
+        directory=str(tmp_path), compact_min_rows=4
+    )
+    points = await reloaded.search(
+        org_code="org", vector=_vector(1, 1), limit=10, score_threshold=0
+    )
+    assert [point.id for point in points] == [second]
+
+    await reloaded.upsert(
+        org_code="org", ids=[third, first], vectors=[_vector(1, 1), _vector(1)]
+    )
+    assert not journal.exists()
+    assert await vector_index.LocalVectorIndex(directory=str(tmp_path)).search(
+        org_code="org", vector=_vector(2, 1), limit=2, score_threshold=0
+    ) == [
+        vector_index.ScoredPoint(id=third, score=pytest.approx(0.9487, abs=1e-4)),
+        vector_index.ScoredPoint(id=first, score=pytest.approx(0.8944, abs=1e-4)),
+    ]
+    assert await reloaded.list_collections() == ["org"]
+
+
+@pytest.mark.unit()
+async def test_registry_creates_collection_once(tmp_path: Path) -> None:
+    index = vector_index.LocalVectorIndex(directory=str(tmp_path))
+    registry = vector_index.CollectionRegistry()
+
+    created = await asyncio.gather(
+        *(registry.ensure(index=index, org_code="org", model=MODEL) for _ in range(5))
+    )
+    assert created.count(True) == 1
+    assert await registry.exists(index=index, org_code="org")
+
+    reloaded = vector_index.CollectionRegistry()
+    await reloaded.load(index=index)
+    assert len(reloaded) == 1
+
+    await index.upsert(org_code="org", ids=[uuid4()], vectors=[_vector(1)])
+    with pytest.raises(vector_index.CollectionNotFoundError):
+        await index.search(
+            org_code="missing", vector=_vector(1), limit=1, score_threshold=0
+        )
+
+
+@pytest.mark.unit()
+def test_local_index_directory_is_held_by_one_process(tmp_path: Path) -> None:
+    lock_file = vector_index.lock_directory(directory=str(tmp_path))
+    with pytest.raises(vector_index.DirectoryInUseError):
+        vector_index.lock_directory(directory=str(tmp_path))
+    lock_file.close()
+    vector_index.lock_directory(directory=str(tmp_path)).close()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 from typing import TYPE_CHECKING
 
+import orjson
 import pytest
 
 from customer_engine_api.core import whatsapp
@@ -64,7 +65,165 @@ def test_check_hash() -> None:
         )
     ],
 )
-def test_identify_payload(
+def test_read_delivery_identifies_text_message(
     payload: JsonResponse, expected: whatsapp.payloads.TextMessage
 ) -> None:
-    assert whatsapp.payloads.identify_payload(payload=payload) == expected
+    assert whatsapp.payloads.read_delivery(payload=payload).messages == [expected]
+
+
+def _change(
+    phone_number_id: str,
+    messages: list[dict[str, object]] | None = None,
+    statuses: list[dict[str, object]] | None = None,
+) -> dict[str, object]:
+    value: dict[str, object] = {
+        "messaging_product": "whatsapp",
+        "metadata": {"phone_number_id": phone_number_id},
+    }
+    if messages is not None:
+        value["contacts"] = [{"wa_id": "CONTACT"}]
+        value["messages"] = messages
+    if statuses is not None:
+        value["statuses"] = statuses
+    return {"field": "messages", "value": value}
+
+
+def _status(status: str) -> dict[str, object]:
+    return {"id": f"wamid.{status}", "status": status, "recipient_id": "A"}
+
+
+@pytest.mark.unit()
+def test_read_delivery_expands_every_message() -> None:
+    payload: JsonResponse = {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "changes": [
+                    _change(
+                        "1",
+                        messages=[
+                            {"from": "A", "type": "text", "text": {"body": "hola"}},
+                            {"from": "B", "type": "image", "image": {"id": "X"}},
+                            {"type": "text", "text": {"body": "sin remitente"}},
+                        ],
+                    ),
+                    _change("1", statuses=[_status("read")]),
+                ]
+            },
+            {"changes": [_change("2", messages=[{"text": {"body": "factura"}}])]},
+            {"changes": [{"value": "malformed"}]},
+        ],
+    }
+    delivery = whatsapp.payloads.read_delivery(payload=payload)
+    assert delivery.messages == [
+        whatsapp.payloads.TextMessage(text="hola", phone_number_id="1", wa_id="A"),
+        whatsapp.payloads.TextMessage(
+            text="sin remitente", phone_number_id="1", wa_id="CONTACT"
+        ),
+        whatsapp.payloads.TextMessage(
+            text="factura", phone_number_id="2", wa_id="CONTACT"
+        ),
+    ]
+    assert delivery.statuses == [
+        whatsapp.payloads.StatusUpdate(
+            message_id="wamid.read",
+            status="read",
+            recipient_id="A",
+            phone_number_id="1",
+        )
+    ]
+    assert [media.media_id for media in delivery.media] == ["X"]
+    assert delivery.rejected == 1
+    assert not delivery.status_only
+
+
+@pytest.mark.unit()
+def test_read_delivery_classifies_status_only_and_unknown_payloads() -> None:
+    statuses: JsonResponse = {
+        "entry": [
+            {"changes": [_change("1", statuses=[_status("sent"), _status("read")])]}
+        ]
+    }
+    assert whatsapp.payloads.read_delivery(payload=statuses).status_only
+
+    for unknown in ([], {}, {"entry": "x"}, {"entry": [{"changes": [{}]}]}):
+        delivery = whatsapp.payloads.read_delivery(payload=unknown)
+        assert delivery.messages == []
+        assert not delivery.status_only
+
+
+@pytest.mark.unit()
+def test_decode_delivery_types_media_and_interactive_replies() -> None:
+    body = orjson.dumps(
+        {
+            "entry": [
+                {
+                    "changes": [
+                        _change(
+                            "1",
+                            messages=[
+                                {
+                                    "from": "A",
+                                    "type": "image",
+                                    "image": {
+                                        "id": "MEDIA",
+                                        "mime_type": "image/jpeg",
+                                        "caption": "mi factura",
+                                    },
+                                },
+                                {
+                                    "from": "A",
+                                    "type": "interactive",
+                                    "interactive": {
+                                        "type": "button_reply",
+                                        "button_reply": {"id": "YES", "title": "Sí"},
+                                    },
+                                },
+                                {
+                                    "type": "interactive",
+                                    "interactive": {"type": "nfm_reply"},
+                                },
+                                {"type": "location", "location": {}},
+                                {"type": ["text"], "text": {"body": "x"}},
+                            ],
+                            statuses=[
+                                {
+                                    "id": "wamid.1",
+                                    "status": "typing",
+                                    "recipient_id": "A",
+                                }
+                            ],
+                        )
+                    ]
+                }
+            ]
+        }
+    )
+    delivery = whatsapp.payloads.decode_delivery(body=body)
+    assert delivery is not None
+    assert delivery.messages == []
+    assert delivery.media == [
+        whatsapp.payloads.MediaMessage(
+            media_type="image",
+            media_id="MEDIA",
+            mime_type="image/jpeg",
+            caption="mi factura",
+            phone_number_id="1",
+            wa_id="A",
+        )
+    ]
+    assert delivery.interactive == [
+        whatsapp.payloads.InteractiveReply(
+            reply_type="button_reply",
+            reply_id="YES",
+            title="Sí",
+            phone_number_id="1",
+            wa_id="A",
+        )
+    ]
+    assert delivery.statuses == []
+    assert delivery.rejected == 4
+    assert not delivery.status_only
+
+    assert whatsapp.payloads.decode_delivery(body=b"{not json") is None
+    assert whatsapp.payloads.decode_delivery(body=b'"text"') is None
@@ -1,37 +1,87 @@
 from __future__ import annotations
 
+import dataclasses
 from uuid import UUID, uuid4
 
 import lego_workflows
 import pytest
 
 from customer_engine_api import handlers
-from customer_engine_api.core.automatic_responses import Example
+from customer_engine_api.core.automatic_responses import Example, imports
 from customer_engine_api.core.config import resources
 from customer_engine_api.core.time import now
 
 
 @pytest.mark.e2e()
 async def test_get_not_existing_example() -> None:
-    with (
-        resources.db_engine.begin() as conn,
-        pytest.raises(handlers.automatic_responses.get_example.ExampleNotFoundError),
-    ):
-        await lego_workflows.run_and_collect_events(
-            cmd=handlers.automatic_responses.get_example.Command(
+    async with resources.db_engine.begin() as conn:
+        with pytest.raises(
+            handlers.automatic_responses.get_example.ExampleNotFoundError
+        ):
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.automatic_responses.get_example.Command(
+                    org_code="test",
+                    example_id=uuid4(),
+                    sql_conn=conn,
+                    automatic_response_id=None,
+                )
+            )
+
+
+@pytest.mark.e2e()
+async def test_inserted_examples_roll_back_with_the_transaction() -> None:
+    async with resources.db_engine.begin() as conn:
+        response_create_automatic, _ = await lego_workflows.run_and_collect_events(
+            handlers.automatic_responses.create_auto_resp.Command(
                 org_code="test",
-                example_id=uuid4(),
+                name="Rollback",
+                response="Response",
                 sql_conn=conn,
-                automatic_response_id=None,
+                examples=None,
+                qdrant_client=resources.clients.qdrant,
+                cohere_client=resources.clients.cohere,
             )
         )
 
+    example_ids: list[UUID] = []
+    with pytest.raises(RuntimeError):
+        async with resources.db_engine.begin() as conn:
+            cmd = handlers.automatic_responses.create_example.Command(
+                org_code="test",
+                automatic_response_id=response_create_automatic.automatic_response_id,
+                examples=["Example 1", "Example 2"],
+                sql_conn=conn,
+                qdrant_client=resources.clients.qdrant,
+                cohere_client=resources.clients.cohere,
+            )
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.automatic_responses.get_auto_res.Command(
+                    org_code="test",
+                    automatic_response_id=response_create_automatic.automatic_response_id,
+                    sql_conn=conn,
+                )
+            )
+            example_ids.extend(await cmd._insert_examples())  # noqa: SLF001
+            raise RuntimeError
+
+    async with resources.db_engine.begin() as conn:
+        for example_id in example_ids:
+            with pytest.raises(
+                handlers.automatic_responses.get_example.ExampleNotFoundError
+            ):
+                await lego_workflows.run_and_collect_events(
+                    cmd=handlers.automatic_responses.get_example.Command(
+                        org_code="test",
+                        example_id=example_id,
+                        sql_conn=conn,
+                        automatic_response_id=None,
+                    )
+                )
+
 
 @pytest.mark.e2e()
 async def test_list_examples() -> None:
-    with (
-        resources.db_engine.begin() as conn,
-    ):
+    async with resources.db_engine.begin() as conn:
         test_org = "test"
         response_create_automatic, _ = await lego_workflows.run_and_collect_events(
             handlers.automatic_responses.create_auto_resp.Command(
@@ -116,9 +166,7 @@ async def test_list_examples() -> None:
 
 @pytest.mark.e2e()
 async def test_update_example() -> None:
-    with (
-        resources.db_engine.begin() as conn,
-    ):
+    async with resources.db_engine.begin() as conn:
         test_org = "test"
         response_create_automatic, _ = await lego_workflows.run_and_collect_events(
             handlers.automatic_responses.create_auto_resp.Command(
@@ -197,9 +245,7 @@ async def test_update_example() -> None:
 
 @pytest.mark.e2e()
 async def test_get_existing_example() -> None:
-    with (
-        resources.db_engine.begin() as conn,
-    ):
+    async with resources.db_engine.begin() as conn:
         test_org = "test"
         response_create_automatic, _ = await lego_workflows.run_and_collect_events(
             handlers.automatic_responses.create_auto_resp.Command(
@@ -262,6 +308,13 @@ async def test_get_existing_example() -> None:
         assert get_example_response.example.example_id in {
             example.example_id for example in similar_to_prompt_response.examples
         }
+        assert set(similar_to_prompt_response.scores) == {
+            example.example_id for example in similar_to_prompt_response.examples
+        }
+        assert all(
+            score >= 0.8  # noqa: PLR2004
+            for score in similar_to_prompt_response.scores.values()
+        )
 
         response_owner_auto_res, _ = await lego_workflows.run_and_collect_events(
             handlers.automatic_responses.get_auto_res_owns_example.Command(
@@ -311,22 +364,20 @@ async def test_get_existing_example() -> None:
 
 @pytest.mark.e2e()
 async def test_get_not_existing_automatic_response() -> None:
-    with (
-        resources.db_engine.connect() as conn,
-        pytest.raises(
+    async with resources.db_engine.connect() as conn:
+        with pytest.raises(
             handlers.automatic_responses.get_auto_res.AutomaticResponseNotFoundError
-        ),
-    ):
-        await lego_workflows.run_and_collect_events(
-            cmd=handlers.automatic_responses.get_auto_res.Command(
-                org_code="test", automatic_response_id=uuid4(), sql_conn=conn
+        ):
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.automatic_responses.get_auto_res.Command(
+                    org_code="test", automatic_response_id=uuid4(), sql_conn=conn
+                )
             )
-        )
 
 
 @pytest.mark.e2e()
 async def test_list_org_automated_responses() -> None:
-    with resources.db_engine.connect() as conn:
+    async with resources.db_engine.connect() as conn:
         created_automated_responses: set[UUID] = set()
         for i in range(2):
             name_to_use = f"Automatic response {i}"
@@ -369,7 +420,7 @@ async def test_list_org_automated_responses() -> None:
 
 @pytest.mark.e2e()
 async def test_update_automatic_response() -> None:
-    with resources.db_engine.connect() as conn:
+    async with resources.db_engine.connect() as conn:
         test_org_code = "test"
         create_response, _ = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.create_auto_resp.Command(
@@ -429,7 +480,7 @@ async def test_update_automatic_response() -> None:
 
 @pytest.mark.e2e()
 async def test_get_existing_automatic_response() -> None:
-    with resources.db_engine.connect() as conn:
+    async with resources.db_engine.connect() as conn:
         test_org_code = "test"
         create_response, _ = await lego_workflows.run_and_collect_events(
             cmd=handlers.automatic_responses.create_auto_resp.Command(
@@ -473,3 +524,130 @@ async def test_get_existing_automatic_response() -> None:
                     sql_conn=conn,
                 )
             )
+
+
+@pytest.mark.e2e()
+async def test_import_rows_attach_to_existing_automatic_response() -> None:
+    test_org_code = "test"
+    batches = [
+        [
+            imports.ImportRow(name="Import", response="Response", example="Example 1"),
+            imports.ImportRow(name="Import", response=None, example="Example 2"),
+        ],
+        [imports.ImportRow(name="Import", response="Ignored", example="Example 3")],
+        [imports.ImportRow(name="Import", response=None, example="Example 4")],
+    ]
+    automatic_response_ids: list[UUID] = []
+    example_ids: list[UUID] = []
+    for rows in batches:
+        async with resources.db_engine.begin() as conn:
+            import_response, _ = await lego_workflows.run_and_collect_events(
+                cmd=handlers.automatic_responses.import_rows.Command(
+                    org_code=test_org_code,
+                    rows=rows,
+                    qdrant_client=resources.clients.qdrant,
+                    cohere_client=resources.clients.cohere,
+                    sql_conn=conn,
+                )
+            )
+        automatic_response_ids.extend(import_response.automatic_response_ids)
+        example_ids.extend(import_response.example_ids)
+
+    assert len(automatic_response_ids) == 1
+    assert len(example_ids) == 4  # noqa: PLR2004
+
+    async with resources.db_engine.begin() as conn:
+        list_examples_response, _ = await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.list_examples.Command(
+                org_code=test_org_code,
+                automatic_response_id=automatic_response_ids[0],
+                sql_conn=conn,
+            )
+        )
+        assert sorted(
+            example.example_id for example in list_examples_response.examples
+        ) == sorted(example_ids)
+
+        await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.delete_auto_res.Command(
+                org_code=test_org_code,
+                automatic_response_id=automatic_response_ids[0],
+                sql_conn=conn,
+                qdrant_client=resources.clients.qdrant,
+            )
+        )
+
+
+@pytest.mark.e2e()
+async def test_hybrid_search_ignores_partial_lexical_only_matches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _vector_search_without_hits(
+        *args: object,  # noqa: ARG001
+        **kwargs: object,  # noqa: ARG001
+    ) -> tuple[list[tuple[UUID, float]], None, None]:
+        return [], None, None
+
+    monkeypatch.setattr(
+        resources,
+        "retrieval",
+        dataclasses.replace(resources.retrieval, mode="hybrid"),
+    )
+    monkeypatch.setattr(
+        handlers.automatic_responses.similar_examples_by_prompt.Command,
+        "_vector_search",
+        _vector_search_without_hits,
+    )
+    test_org_code = "test-hybrid"
+    async with resources.db_engine.begin() as conn:
+        create_response, _ = await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.create_auto_resp.Command(
+                org_code=test_org_code,
+                name="Pizza",
+                response="On its way",
+                examples=["pepperoni pizza with extra cheese delivered tonight"],
+                sql_conn=conn,
+                qdrant_client=resources.clients.qdrant,
+                cohere_client=resources.clients.cohere,
+            )
+        )
+
+        partial_response, _ = await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.similar_examples_by_prompt.Command(
+                org_code=test_org_code,
+                prompt="pepperoni pizza with extra cheese refund",
+                qdrant_client=resources.clients.qdrant,
+                cohere_client=resources.clients.cohere,
+                sql_conn=conn,
+                current_time=now(),
+            )
+        )
+        assert partial_response.examples == []
+
+        full_response, _ = await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.similar_examples_by_prompt.Command(
+                org_code=test_org_code,
+                prompt="pepperoni pizza with extra cheese",
+                qdrant_client=resources.clients.qdrant,
+                cohere_client=resources.clients.cohere,
+                sql_conn=conn,
+                current_time=now(),
+            )
+        )
+        assert {
+            example.automatic_response_id for example in full_response.examples
+        } == {create_response.automatic_response_id}
+
+        await lego_workflows.run_and_collect_events(
+            cmd=handlers.unmatched_prompts.delete_all.Command(
+                org_code=test_org_code, sql_conn=conn
+            )
+        )
+        await lego_workflows.run_and_collect_events(
+            cmd=handlers.automatic_responses.delete_auto_res.Command(
+                org_code=test_org_code,
+                automatic_response_id=create_response.automatic_response_id,
+                sql_conn=conn,
+                qdrant_client=resources.clients.qdrant,
+            )
+        )
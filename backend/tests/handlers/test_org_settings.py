@@ -10,7 +10,7 @@ from customer_engine_api.core.org_settings import OrgSettings
 
 @pytest.mark.e2e()
 async def test_get_not_existing() -> None:
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         org_settings, _ = await lego_workflows.run_and_collect_events(
             cmd=handlers.org_settings.get_or_default.Command(
                 org_code="test", sql_conn=conn
@@ -24,7 +24,7 @@ async def test_get_not_existing() -> None:
 
 
 async def test_update_existing() -> None:
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         created_settings = (
             await lego_workflows.run_and_collect_events(
                 cmd=handlers.org_settings.upsert.Command(
@@ -67,6 +67,13 @@ async def test_update_existing() -> None:
             default_response="Another response v1",
         )
 
+        get_response, _ = await lego_workflows.run_and_collect_events(
+            cmd=handlers.org_settings.get_or_default.Command(
+                org_code="test", sql_conn=conn
+            )
+        )
+        assert get_response.settings == updated_settings
+
         await lego_workflows.run_and_collect_events(
             cmd=handlers.org_settings.delete.Command(org_code="test", sql_conn=conn)
         )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime
 from uuid import UUID, uuid4
 
 import lego_workflows
@@ -13,7 +14,7 @@ from customer_engine_api.core.time import now
 @pytest.mark.e2e()
 async def test_delete_all() -> None:
     org_code = "test"
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         response_create, _ = await lego_workflows.run_and_collect_events(
             handlers.unmatched_prompts.register_unmatched_prompt.Command(
                 org_code=org_code,
@@ -57,7 +58,7 @@ async def test_delete_all() -> None:
 async def test_bulk_delete_unmatched_prompts() -> None:
     org_code = "test"
     current_time = now()
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         registered_prompts: list[UUID] = []
         for prompt in ["prompt 1", "prompt 2"]:
             register_response, _ = await lego_workflows.run_and_collect_events(
@@ -99,9 +100,7 @@ async def test_bulk_delete_unmatched_prompts() -> None:
 async def test_retrieve_unmatched_prompt() -> None:
     org_code = "test"
     current_time = now()
-    with (
-        resources.db_engine.begin() as conn,
-    ):
+    async with resources.db_engine.begin() as conn:
         response_register, _ = await lego_workflows.run_and_collect_events(
             handlers.unmatched_prompts.register_unmatched_prompt.Command(
                 org_code=org_code,
@@ -156,14 +155,104 @@ async def test_retrieve_unmatched_prompt() -> None:
 
 @pytest.mark.e2e()
 async def test_not_existing_unmatched_prompt() -> None:
-    with (
-        resources.db_engine.begin() as conn,
-        pytest.raises(
+    async with resources.db_engine.begin() as conn:
+        with pytest.raises(
             handlers.unmatched_prompts.get_unmatched_prompt.UnmatchedPromptNotFoundError
-        ),
-    ):
-        await lego_workflows.run_and_collect_events(
+        ):
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.unmatched_prompts.get_unmatched_prompt.Command(
+                    org_code="test", prompt_id=uuid4(), sql_conn=conn
+                )
+            )
+
+
+@pytest.mark.e2e()
+async def test_list_unmatched_prompts_by_page() -> None:
+    org_code = "test-pagination"
+    current_time = now()
+    async with resources.db_engine.begin() as conn:
+        registered_ids: list[UUID] = []
+        for i in range(5):
+            response_register, _ = await lego_workflows.run_and_collect_events(
+                handlers.unmatched_prompts.register_unmatched_prompt.Command(
+                    org_code=org_code,
+                    prompt=f"Unmatched prompt {i}",
+                    current_time=current_time + datetime.timedelta(seconds=i),
+                    sql_conn=conn,
+                )
+            )
+            registered_ids.append(response_register.umatched_prompt_id)
+
+        listed_ids: list[UUID] = []
+        cursor: str | None = None
+        pages = 0
+        while True:
+            response_list, _ = await lego_workflows.run_and_collect_events(
+                handlers.unmatched_prompts.list_unmatched_prompts.Command(
+                    org_code=org_code, sql_conn=conn, limit=2, cursor=cursor
+                )
+            )
+            pages += 1
+            listed_ids.extend(
+                unmatched_prompt.prompt_id
+                for unmatched_prompt in response_list.unmatched_prompts
+            )
+            if response_list.next_cursor is None:
+                break
+            cursor = response_list.next_cursor
+
+        assert pages == 3
+        assert listed_ids == registered_ids[::-1]
+
+        for prompt_id in registered_ids:
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.unmatched_prompts.delete_unmatched_prompt.Command(
+                    org_code=org_code, prompt_id=prompt_id, sql_conn=conn
+                )
+            )
+
+
+@pytest.mark.e2e()
+async def test_register_same_prompt_counts_occurrences() -> None:
+    org_code = "test-dedup"
+    current_time = now()
+    async with resources.db_engine.begin() as conn:
+        prompt_ids: list[UUID] = []
+        for i, prompt in enumerate(["Opening hours?", "  opening HOURS? "]):
+            response_register, _ = await lego_workflows.run_and_collect_events(
+                handlers.unmatched_prompts.register_unmatched_prompt.Command(
+                    org_code=org_code,
+                    prompt=prompt,
+                    current_time=current_time + datetime.timedelta(seconds=i),
+                    sql_conn=conn,
+                )
+            )
+            prompt_ids.append(response_register.umatched_prompt_id)
+
+        assert prompt_ids[0] == prompt_ids[1]
+        response_get, _ = await lego_workflows.run_and_collect_events(
             cmd=handlers.unmatched_prompts.get_unmatched_prompt.Command(
-                org_code="test", prompt_id=uuid4(), sql_conn=conn
+                org_code=org_code, prompt_id=prompt_ids[0], sql_conn=conn
+            )
+        )
+        assert response_get.unmatched_prompt.prompt == "Opening hours?"
+        assert response_get.unmatched_prompt.occurrences == 2  # noqa: PLR2004
+        assert response_get.unmatched_prompt.last_seen_at == (
+            current_time + datetime.timedelta(seconds=1)
+        ).replace(tzinfo=None)
+
+        response_clusters, _ = await lego_workflows.run_and_collect_events(
+            cmd=handlers.unmatched_prompts.list_clusters.Command(
+                org_code=org_code, sql_conn=conn
+            )
+        )
+        assert [
+            (cluster.cluster_id, cluster.occurrences, cluster.prompt_ids)
+            for cluster in response_clusters.clusters
+        ] == [(prompt_ids[0], 2, [prompt_ids[0]])]
+
+        await lego_workflows.run_and_collect_events(
+            cmd=handlers.unmatched_prompts.delete_unmatched_prompt.Command(
+                org_code=org_code, prompt_id=prompt_ids[0], sql_conn=conn
             )
         )
@@ -10,20 +10,20 @@ from customer_engine_api.core.config import resources
 
 @pytest.mark.e2e()
 async def test_get_not_existing() -> None:
-    with (
-        resources.db_engine.begin() as conn,
-        pytest.raises(handlers.whatsapp.get_tokens.WhatsappTokenNotFoundError),
-    ):
-        await lego_workflows.run_and_collect_events(
-            cmd=handlers.whatsapp.get_tokens.Command(org_code="test", sql_conn=conn)
-        )
+    async with resources.db_engine.begin() as conn:
+        with pytest.raises(handlers.whatsapp.get_tokens.WhatsappTokenNotFoundError):
+            await lego_workflows.run_and_collect_events(
+                cmd=handlers.whatsapp.get_tokens.Command(
+                    org_code="test", sql_conn=conn
+                )
+            )
 
 
 @pytest.mark.e2e()
 async def test_get_existing() -> None:
     org_code = "test"
     test_access_token = "EAAGu6e1JCZBkBOZB5PImmNsaabkZA3KiNVIBmwBixZA2YEui08ZBZAGEdeuJZBoU9s6D09yjjpociKauvfMWG2SZBTtMgvTGXG5ZAtsKza9SEzgo1RIefrpxAgFCUOjB5XGsmHlUeZBkTILECiiuX9dZAuiV9qZCQovPwlfvjrRGndbhr11MiCkFAjtzWEESVRJkuEFq7BSZCzGPW7qTuiG9hS5RqpBjXp53vU2Uw8IsEkyt8t5IZD"  # noqa: S105
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         await lego_workflows.run_and_collect_events(
             handlers.whatsapp.register_tokens.Command(
                 org_code=org_code,
@@ -62,7 +62,7 @@ async def test_get_existing() -> None:
 
 async def test_update() -> None:
     org_code = "test"
-    with resources.db_engine.begin() as conn:
+    async with resources.db_engine.begin() as conn:
         await lego_workflows.run_and_collect_events(
             handlers.whatsapp.register_tokens.Command(
                 org_code=org_code,
@@ -2,6 +2,7 @@ import {useEffect, useState} from 'react'
 import {BASE_URL} from '@/constants/url'
 import {useKindeBrowserClient} from '@kinde-oss/kinde-auth-nextjs'
 import {Example} from '@/types/Examples'
+import {fetchAllPages} from '@/utils/fetchAllPages'
 
 export type ExampleResponse = {
     examples: Example[]
@@ -20,15 +21,13 @@ const useGetExamples = (formId?: string) => {
         setIsLoading(true)
 
         try {
-            const res = await fetch(
+            const examples = await fetchAllPages<Example>(
                 `${BASE_URL}/automatic-responses/${formId}/example`,
-                {
-                    headers: headers,
-                }
+                'examples',
+                headers
             )
-            const resJson = await res.json()
 
-            setData(resJson)
+            setData({examples})
         } catch (error) {
             console.log(error)
         } finally {
@@ -2,6 +2,7 @@ import {useEffect, useState} from 'react'
 import {Form} from '@/types/Forms'
 import {BASE_URL} from '@/constants/url'
 import {useKindeBrowserClient} from '@kinde-oss/kinde-auth-nextjs'
+import {fetchAllPages} from '@/utils/fetchAllPages'
 
 type FormListResponse = {
     automatic_response: Form[]
@@ -28,15 +29,18 @@ const useGetForms = (id?: string) => {
         setIsLoading(true)
 
         try {
-            const res = await fetch(url, {
-                headers: headers,
-            })
-            const resJson = await res.json()
-
             if (id) {
-                setData(resJson as FormResponse)
+                const res = await fetch(url, {
+                    headers: headers,
+                })
+                setData((await res.json()) as FormResponse)
             } else {
-                setData(resJson as FormListResponse)
+                const forms = await fetchAllPages<Form>(
+                    url,
+                    'automatic_response',
+                    headers
+                )
+                setData({automatic_response: forms})
             }
         } catch (error) {
             console.log(error)
@@ -1,6 +1,8 @@
 import {useEffect, useState} from 'react'
 import {BASE_URL} from '@/constants/url'
 import {useKindeBrowserClient} from '@kinde-oss/kinde-auth-nextjs'
+import {UnmatchedPrompt} from '@/types/UnmatchedPrompts'
+import {fetchAllPages} from '@/utils/fetchAllPages'
 
 const useGetUnmatchedPrompts = (id?: string) => {
     const [data, setData] = useState<any>()
@@ -17,12 +19,17 @@ const useGetUnmatchedPrompts = (id?: string) => {
         setIsLoading(true)
 
         try {
-            const res = await fetch(url, {
-                headers: headers,
-            })
-            const resJson = await res.json()
-
-            setData(resJson)
+            const unmatchedPrompts = await fetchAllPages<UnmatchedPrompt>(
+                url,
+                'unmatched_prompts',
+                headers
+            )
+            // Pages come in id order, show prompts in the order they arrived.
+            unmatchedPrompts.sort((a, b) =>
+                a.created_at.localeCompare(b.created_at)
+            )
+
+            setData({unmatched_prompts: unmatchedPrompts})
         } catch (error) {
             console.log(error)
         } finally {
@@ -0,0 +1,22 @@
+const PAGE_SIZE = 500
+
+type Page = {next_cursor: string | null; [key: string]: unknown}
+
+export const fetchAllPages = async <T>(
+    url: string,
+    key: string,
+    headers: HeadersInit
+): Promise<T[]> => {
+    const items: T[] = []
+    let cursor: string | null = null
+    do {
+        const params = new URLSearchParams({limit: String(PAGE_SIZE)})
+        if (cursor) params.set('cursor', cursor)
+        const res = await fetch(`${url}?${params}`, {headers: headers})
+        if (!res.ok) throw new Error(`${url} responded ${res.status}`)
+        const page: Page = await res.json()
+        items.push(...(page[key] as T[]))
+        cursor = page.next_cursor
+    } while (cursor)
+    return items
+}